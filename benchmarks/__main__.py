@@ -0,0 +1,13 @@
+"""
+Run the benchmarks with plain Python from the root of the repository:
+
+    python -m benchmarks --output results.json --baseline benchmarks/baseline.json
+
+The exit code is 1 when a benchmark is slower than the baseline by more
+than --tolerance. Use --scale to make the workloads smaller or bigger.
+"""
+import sys
+
+from benchmarks.runner import main
+
+sys.exit(main())
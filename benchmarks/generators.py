@@ -0,0 +1,92 @@
+"""
+Synthetic workloads for the benchmarks. Every generator gives the XML
+document and an XSD that accepts it, sizes are given by the arguments.
+"""
+from typing import NamedTuple
+
+XSD_HEADER = '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+XSD_FOOTER = "</xs:schema>"
+
+
+class Workload(NamedTuple):
+    name: str
+    xml: str
+    xsd: str
+
+
+def leaf_element(name: str) -> str:
+    return f'<xs:element name="{name}" type="xs:string"/>'
+
+
+def complex_element(name: str, children: list[str]) -> str:
+    return (
+        f'<xs:element name="{name}"><xs:complexType><xs:sequence>'
+        + "".join(children)
+        + "</xs:sequence></xs:complexType></xs:element>"
+    )
+
+
+def wide(count: int = 20000) -> Workload:
+    """
+    One root with many leaf siblings.
+    """
+    xml = "<root>\n" + "".join(f"  <item>value {index}</item>\n" for index in range(count)) + "</root>"
+    xsd = XSD_HEADER + complex_element("root", [leaf_element("item")] * count) + XSD_FOOTER
+    return Workload("wide", xml, xsd)
+
+
+def deep(depth: int = 2000) -> Workload:
+    """
+    One chain of nested elements.
+    """
+    xml = "<level>" * depth + "bottom" + "</level>" * depth
+    xsd = leaf_element("level")
+    for _ in range(depth - 1):
+        xsd = complex_element("level", [xsd])
+    return Workload("deep", xml, XSD_HEADER + xsd + XSD_FOOTER)
+
+
+def text_heavy(count: int = 500, words: int = 400) -> Workload:
+    """
+    Few elements with long text.
+    """
+    text = " ".join(f"word{index}" for index in range(words))
+    xml = "<root>\n" + "".join(f"  <p>\n    {text}\n  </p>\n" for _ in range(count)) + "</root>"
+    xsd = XSD_HEADER + complex_element("root", [leaf_element("p")] * count) + XSD_FOOTER
+    return Workload("text_heavy", xml, xsd)
+
+
+def mixed_content(count: int = 5000) -> Workload:
+    """
+    Elements with text around their children, like <body> in the examples.
+    """
+    body = "<body>Don't forget <b>me</b> this <i>weekend</i>! Haha</body>"
+    xml = "<root>\n" + "".join(f"  {body}\n" for _ in range(count)) + "</root>"
+    body_xsd = complex_element("body", [leaf_element("b"), leaf_element("i")])
+    xsd = XSD_HEADER + complex_element("root", [body_xsd] * count) + XSD_FOOTER
+    return Workload("mixed_content", xml, xsd)
+
+
+def schema_heavy(fields: int = 300, records: int = 50) -> Workload:
+    """
+    Records with many different fields, so the schema is large too.
+    """
+    names = [f"field{index}" for index in range(fields)]
+    record = "<record>" + "".join(f"<{name}>{index}</{name}>" for index, name in enumerate(names)) + "</record>"
+    xml = "<root>\n" + "".join(f"  {record}\n" for _ in range(records)) + "</root>"
+    record_xsd = complex_element("record", [leaf_element(name) for name in names])
+    xsd = XSD_HEADER + complex_element("root", [record_xsd] * records) + XSD_FOOTER
+    return Workload("schema_heavy", xml, xsd)
+
+
+def all_workloads(scale: float = 1.0) -> list[Workload]:
+    def size(value: int) -> int:
+        return max(1, int(value * scale))
+
+    return [
+        wide(size(20000)),
+        deep(size(2000)),
+        text_heavy(size(500)),
+        mixed_content(size(5000)),
+        schema_heavy(fields=size(300), records=size(50)),
+    ]
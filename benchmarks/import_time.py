@@ -0,0 +1,102 @@
+"""
+Import time of the core modules, measured with python -X importtime in a
+new interpreter for every run:
+
+    python -m benchmarks.import_time --baseline benchmarks/import_baseline.json
+
+The exit code is 1 when a core module imports pydantic, or when the
+imports are slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from benchmarks.runner import DEFAULT_TOLERANCE
+
+CORE_MODULES = [
+    "xml_parser_comp.xml_tokenizer",
+    "xml_parser_comp.xml_base_validator",
+    "xml_parser_comp.xsd_validator",
+    "xml_parser_comp.xml_with_xsd_validator",
+    "xml_parser_comp.streaming_validator",
+    "xml_parser_comp.batch",
+    "xml_parser_comp.cli",
+]
+# packages the core modules must not import
+FORBIDDEN = ["pydantic", "pydantic_core"]
+
+
+def import_once(modules: list[str]) -> tuple[float, set[str]]:
+    """
+    Microseconds to import the modules, and every module imported.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    imported = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imported.add(name.strip())
+        # the modules asked for are not indented, their imports are
+        if name.strip() in modules and not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total, imported
+
+
+def measure_imports(modules: list[str] = CORE_MODULES, repeat: int = 5) -> dict:
+    totals = []
+    imported: set[str] = set()
+    for _ in range(repeat):
+        total, imported = import_once(modules)
+        totals.append(total)
+    return {
+        "python": sys.version.split()[0],
+        "modules": modules,
+        "median_us": statistics.median(totals),
+        "forbidden": sorted({name.split(".")[0] for name in imported} & set(FORBIDDEN)),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.import_time", description="Measure the import time of xml_parser_comp"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="interpreters started")
+    parser.add_argument("--output", help="write the result to this JSON file")
+    parser.add_argument("--baseline", help="compare the result with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    result = measure_imports(CORE_MODULES, args.repeat)
+    print(f"import of {len(result['modules'])} core modules: {result['median_us'] / 1000:.1f} ms")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=2)
+
+    failed = False
+    if result["forbidden"]:
+        print(f"REGRESSION core modules import {', '.join(result['forbidden'])}", file=sys.stderr)
+        failed = True
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if result["median_us"] > baseline["median_us"] * (1 + args.tolerance):
+            print(
+                f"REGRESSION import time {result['median_us'] / 1000:.1f} ms, "
+                f"baseline {baseline['median_us'] / 1000:.1f} ms",
+                file=sys.stderr,
+            )
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+
+from benchmarks.generators import Workload, all_workloads
+from xml_parser_comp.tree_format import dump_tree, load_xml
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+DEFAULT_TOLERANCE = 0.25
+
+
+class Case(NamedTuple):
+    name: str
+    # setup(workload) -> (run, bytes processed, tokens processed)
+    setup: Callable[[Workload], tuple[Callable[[], object], int, int]]
+
+
+def xml_size(workload: Workload) -> tuple[int, int]:
+    return len(workload.xml.encode("utf-8")), sum(1 for _ in XMLBaseValidator(workload.xml).iter_tokens())
+
+
+def xsd_size(workload: Workload) -> tuple[int, int]:
+    return len(workload.xsd.encode("utf-8")), len(XSDValidator(workload.xsd).xsd_tokens)
+
+
+def setup_xml_validate(workload):
+    def run():
+        XMLBaseValidator(workload.xml).validate()
+
+    return (run, *xml_size(workload))
+
+
+def setup_generate_xml_tree(workload):
+    xml_validator = XMLBaseValidator(workload.xml)
+    xml_validator.validate()
+    return (xml_validator.generate_xml_tree, *xml_size(workload))
+
+
+def setup_xsd_validate(workload):
+    def run():
+        XSDValidator(workload.xsd).validate()
+
+    return (run, *xsd_size(workload))
+
+
+def setup_generate_xsd_tree(workload):
+    xsd_validator = XSDValidator(workload.xsd)
+    xsd_validator.validate()
+    return (xsd_validator.generate_xsd_tree, *xsd_size(workload))
+
+
+def setup_xml_with_xsd_validate(workload):
+    xml_validator = XMLBaseValidator(workload.xml)
+    xml_validator.validate()
+    xml_tree = xml_validator.generate_xml_tree()
+    xsd_tree = XSDValidator(workload.xsd).generate_xsd_tree()
+    return (XMLWithXSDValidator(xml_tree, xsd_tree).validate, *xml_size(workload))
+
+
+def setup_generated_validate(workload):
+    xml_validator = XMLBaseValidator(workload.xml)
+    xml_validator.validate()
+    xml_tree = xml_validator.generate_xml_tree()
+    validator = XSDValidator(workload.xsd).generate_validator()
+
+    def run():
+        validator.validate(xml_tree)
+
+    return (run, *xml_size(workload))
+
+
+def setup_load_xml(workload):
+    data = dump_tree(XMLBaseValidator(workload.xml).parse())
+
+    def run():
+        load_xml(data)
+
+    return (run, *xml_size(workload))
+
+
+def setup_load_xml_tree(workload):
+    data = dump_tree(XMLBaseValidator(workload.xml).parse())
+
+    def run():
+        load_xml(data).to_xml_tree()
+
+    return (run, *xml_size(workload))
+
+
+def setup_parse_paths(workload):
+    # the last leaf of the first child of the root, e.g. //i or //field299
+    node = XMLBaseValidator(workload.xml).parse()
+    if node.children:
+        node = node.children[0]
+    while node.children:
+        node = node.children[-1]
+    paths = [f"//{node.tag}"]
+
+    def run():
+        XMLBaseValidator(workload.xml).parse_paths(paths)
+
+    return (run, *xml_size(workload))
+
+
+CASES = [
+    Case("XMLBaseValidator.validate", setup_xml_validate),
+    Case("XMLBaseValidator.generate_xml_tree", setup_generate_xml_tree),
+    Case("XSDValidator.validate", setup_xsd_validate),
+    Case("XSDValidator.generate_xsd_tree", setup_generate_xsd_tree),
+    Case("XMLWithXSDValidator.validate", setup_xml_with_xsd_validate),
+    Case("XSDValidator.generate_validator.validate", setup_generated_validate),
+    Case("tree_format.load_xml", setup_load_xml),
+    Case("tree_format.load_xml.to_xml_tree", setup_load_xml_tree),
+    Case("XMLBaseValidator.parse_paths", setup_parse_paths),
+]
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * percent / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+def peak_memory(run: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(case: Case, workload: Workload, repeat: int, memory: bool) -> dict:
+    try:
+        run, size, tokens = case.setup(workload)
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            latencies.append(time.perf_counter() - start)
+        peak = peak_memory(run) if memory else None
+    except Exception as error:  # e.g. RecursionError on the deep workload
+        return {"error": f"{type(error).__name__}: {error}"}
+
+    median = statistics.median(latencies)
+    return {
+        "bytes": size,
+        "tokens": tokens,
+        "median_s": median,
+        "p50_s": percentile(latencies, 50),
+        "p90_s": percentile(latencies, 90),
+        # a p99 needs far more runs than --repeat gives, so the slowest run
+        "max_s": max(latencies),
+        "mb_per_s": size / median / 1e6 if median else None,
+        "tokens_per_s": tokens / median if median else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmarks(scale: float = 1.0, repeat: int = 5, memory: bool = True, only: str | None = None) -> dict:
+    results = {}
+    for workload in all_workloads(scale):
+        if only is not None and only not in workload.name:
+            continue
+        for case in CASES:
+            results[f"{workload.name}/{case.name}"] = measure(case, workload, repeat, memory)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """
+    Names of the benchmarks whose median is slower than the baseline by
+    more than tolerance, or that fail now and did not fail before. Raises
+    ValueError when the baseline was run with another scale or repeat.
+    """
+    for setting in ("scale", "repeat"):
+        if baseline.get(setting) != results[setting]:
+            raise ValueError(
+                f"The baseline was run with {setting} {baseline.get(setting)}, not {results[setting]}"
+            )
+    regressions = []
+    for name, result in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or "error" in base:
+            continue
+        if "error" in result:
+            regressions.append(f"{name}: {result['error']}")
+        elif result["median_s"] > base["median_s"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {result['median_s'] * 1000:.2f} ms, baseline {base['median_s'] * 1000:.2f} ms"
+            )
+    return regressions
+
+
+def print_results(results: dict):
+    print(f"{'benchmark':<60} {'p50 ms':>10} {'max ms':>10} {'MB/s':>8} {'tokens/s':>12} {'peak KiB':>10}")
+    for name, result in results["results"].items():
+        if "error" in result:
+            print(f"{name:<60} {result['error']}")
+            continue
+        peak = result["peak_memory_bytes"]
+        print(
+            f"{name:<60} {result['p50_s'] * 1000:>10.2f} {result['max_s'] * 1000:>10.2f} "
+            f"{result['mb_per_s']:>8.2f} {result['tokens_per_s']:>12.0f} "
+            f"{peak / 1024 if peak is not None else float('nan'):>10.0f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the xml_parser_comp benchmarks")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the size of every workload")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of every benchmark")
+    parser.add_argument("--only", help="run only the workloads with this in the name")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure peak memory")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scale, args.repeat, not args.no_memory, args.only)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        try:
+            regressions = compare(results, baseline, args.tolerance)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 2
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
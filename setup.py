@@ -9,6 +9,11 @@ setup(
     description='A simple XML parser component',
     author='Exebixel',
     author_email='ezequielnat7@gmail.com',
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "benchmarks*"]),
     install_requires=requirements,
+    entry_points={
+        'console_scripts': [
+            'xml-parser-comp=xml_parser_comp.cli:main',
+        ],
+    },
 )
\ No newline at end of file
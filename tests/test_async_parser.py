@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from xml_parser_comp.async_parser import AsyncXMLParser, aparse, atokenize
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XML_STRING = """
+<note>
+    <to>Tové</to>
+    <from>Jani</from>
+    <body>Don't forget me this weekend!
+        <magia>hola</magia>
+        Haha
+    </body>
+</note>
+"""
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+async def byte_chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def stream_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class TestAsyncParser(unittest.TestCase):
+
+    def test_atokenize(self):
+        async def collect():
+            # chunks of 3 bytes also split the 2 bytes of 'é'
+            return [token async for token in atokenize(byte_chunks(XML_STRING.encode("utf-8"), 3))]
+
+        self.assertEqual(asyncio.run(collect()), list(XMLBaseValidator(XML_STRING).iter_tokens()))
+
+    def test_aparse_events(self):
+        async def collect():
+            reader = stream_reader(b"<note><to>Tove</to></note>")
+            return [event async for event in aparse(reader, chunk_size=4)]
+
+        self.assertEqual(
+            asyncio.run(collect()),
+            [("start", "note"), ("start", "to"), ("text", "Tove"), ("end", "to"), ("end", "note")],
+        )
+
+    def test_feed_async(self):
+        async def parse():
+            with ThreadPoolExecutor(1) as executor:
+                parser = AsyncXMLParser(chunk_size=8, executor=executor)
+                return await parser.feed_async(stream_reader(XML_STRING.encode("utf-8")))
+
+        self.assertEqual(asyncio.run(parse()), XMLBaseValidator(XML_STRING).parse())
+
+    def test_offload_to_processes(self):
+        data = ("<root>" + "<item><price>12</price></item>" * 200 + "</root>").encode("utf-8")
+
+        async def parse():
+            with ProcessPoolExecutor(1) as executor:
+                parser = AsyncXMLParser(chunk_size=61, executor=executor, offload_size=32)
+                return await parser.feed_async(byte_chunks(data, 61))
+
+        self.assertEqual(asyncio.run(parse()), XMLBaseValidator(data.decode("utf-8")).parse())
+
+    def test_feed_async_with_errors(self):
+        schema = XSDValidator(XSD_STRING).compile_schema()
+
+        async def parse(data: bytes, schema=None):
+            return await AsyncXMLParser(schema, chunk_size=4).feed_async(byte_chunks(data, 4))
+
+        with self.assertRaises(XMLParseError):
+            asyncio.run(parse(b"<note><to></note>"))
+        with self.assertRaises(XMLParseError) as context:
+            asyncio.run(parse(b"<note><from></from></note>", schema))
+        self.assertEqual(str(context.exception), "Tag from is not allowed in this context")
+
+    def test_other_tasks_run_between_chunks(self):
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            data = ("<root>" + "<item>value</item>" * 2000 + "</root>").encode("utf-8")
+            await AsyncXMLParser(chunk_size=64).feed_async(byte_chunks(data, 64))
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(main()), 100)
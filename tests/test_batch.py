@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from xml_parser_comp.batch import ValidationResult, validate_files, validate_many
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+VALID = "<note><to>Tove</to><from>Jani</from></note>"
+INVALID = "<note><to>Tove</to></note>"
+BROKEN = "<note><to>Tove</from></note>"
+
+
+class TestValidateMany(unittest.TestCase):
+
+    def setUp(self):
+        self.documents = [VALID, INVALID, BROKEN, VALID.encode("utf-8")] * 25
+
+    def expected(self):
+        return [
+            ValidationResult(0, True),
+            ValidationResult(1, False, "XML has not this tags: from in note"),
+            ValidationResult(2, False, "to is not closed"),
+            ValidationResult(3, True),
+        ]
+
+    def test_validate_many_inline(self):
+        results = list(validate_many(self.documents, XSD_STRING, workers=1))
+        self.assertEqual(len(results), 100)
+        self.assertEqual(results[:4], self.expected())
+
+    def test_validate_many_in_order(self):
+        results = list(validate_many(iter(self.documents), XSD_STRING, workers=2, batch_size=7))
+        self.assertEqual([result.index for result in results], list(range(100)))
+        self.assertEqual(results, list(validate_many(self.documents, XSD_STRING, workers=1)))
+
+    def test_validate_many_as_completed(self):
+        results = list(
+            validate_many(self.documents, XSD_STRING, workers=2, batch_size=7, ordered=False)
+        )
+        self.assertEqual(
+            sorted(results), list(validate_many(self.documents, XSD_STRING, workers=1))
+        )
+
+    def test_validate_many_typed_values(self):
+        xsd_string = XSD_STRING.replace('name="from" type="xs:string"', 'name="from" type="xs:integer"')
+        results = list(validate_many(["<note><to>a</to><from>abc</from></note>", VALID.replace("Jani", "7")], xsd_string, workers=1))
+        self.assertEqual(
+            results,
+            [ValidationResult(0, False, "Value 'abc' is not a valid xs:integer in from"), ValidationResult(1, True)],
+        )
+
+    def test_validate_many_without_schema(self):
+        results = list(validate_many([VALID, INVALID, BROKEN], workers=1))
+        self.assertEqual([result.valid for result in results], [True, True, False])
+
+
+class TestValidateFiles(unittest.TestCase):
+
+    def test_validate_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for index, document in enumerate([VALID, INVALID, BROKEN]):
+                path = os.path.join(directory, f"{index}.xml")
+                with open(path, "w") as file:
+                    file.write(document)
+                paths.append(path)
+            paths.append(os.path.join(directory, "missing.xml"))
+
+            for workers in (1, 2):
+                results = list(validate_files(paths, XSD_STRING, workers=workers, batch_size=2))
+                self.assertEqual([result.path for result in results], paths)
+                self.assertEqual([result.valid for result in results], [True, False, False, False])
+                self.assertEqual(results[1].error, "XML has not this tags: from in note")
+                self.assertTrue(results[3].error.startswith("FileNotFoundError"))
+                self.assertEqual(results[0].size, len(VALID))
+                self.assertGreater(results[0].seconds, 0)
@@ -0,0 +1,49 @@
+import unittest
+
+from benchmarks.generators import all_workloads
+from benchmarks.import_time import CORE_MODULES, measure_imports
+from benchmarks.runner import CASES, compare, run_benchmarks
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_workloads_are_valid(self):
+        for workload in all_workloads(scale=0.01):
+            xml_validator = XMLBaseValidator(workload.xml)
+            xml_validator.validate()
+            xsd_validator = XSDValidator(workload.xsd)
+            xsd_validator.validate()
+            self.assertTrue(
+                XMLWithXSDValidator(
+                    xml_validator.generate_xml_tree(), xsd_validator.generate_xsd_tree()
+                ).validate(),
+                workload.name,
+            )
+
+    def test_run_and_compare(self):
+        results = run_benchmarks(scale=0.01, repeat=1, memory=False, only="wide")
+        self.assertEqual(len(results["results"]), len(CASES))
+        for result in results["results"].values():
+            self.assertNotIn("error", result)
+            self.assertGreater(result["tokens_per_s"], 0)
+
+        self.assertEqual(compare(results, results), [])
+        baseline = dict(
+            results,
+            results={
+                name: dict(result, median_s=result["median_s"] / 10)
+                for name, result in results["results"].items()
+            },
+        )
+        self.assertEqual(len(compare(results, baseline)), len(CASES))
+        for setting in ({"scale": 1.0}, {"repeat": 5}):
+            with self.assertRaises(ValueError):
+                compare(results, dict(results, **setting))
+
+    def test_core_imports_without_pydantic(self):
+        result = measure_imports(CORE_MODULES, repeat=1)
+        self.assertEqual(result["forbidden"], [])
+        self.assertGreater(result["median_us"], 0)
@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from xml_parser_comp.cli import expand_paths, main
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+FILES = {
+    "a.xml": "<note><to>Tove</to><from>Jani</from></note>",
+    "b.xml": "<note><to>Tove</to><from>Jani</from></note>",
+    "sub/c.xml": "<note><to>Tove</to></note>",
+    "sub/d.txt": "not xml",
+}
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        for name, content in FILES.items():
+            path = os.path.join(self.root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write(content)
+        self.schema = os.path.join(self.root, "note.xsd")
+        with open(self.schema, "w") as file:
+            file.write(XSD_STRING)
+        self.output = os.path.join(self.root, "results.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *argv: str) -> tuple[int, str]:
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            code = main(list(argv))
+        return code, stderr.getvalue()
+
+    def results(self) -> list[dict]:
+        with open(self.output) as file:
+            return [json.loads(line) for line in file]
+
+    def test_expand_paths(self):
+        paths = list(expand_paths([self.root, os.path.join(self.root, "*.xml"), "missing.xml"]))
+        self.assertEqual(
+            [os.path.relpath(path, self.root) for path in paths[:3]],
+            ["a.xml", "b.xml", os.path.join("sub", "c.xml")],
+        )
+        self.assertEqual(sorted(paths[3:5]), [os.path.join(self.root, "a.xml"), os.path.join(self.root, "b.xml")])
+        self.assertEqual(paths[5], "missing.xml")
+
+    def test_validate(self):
+        for jobs in ("1", "2"):
+            code, stderr = self.run_cli(
+                "validate", "--schema", self.schema, "--jobs", jobs, "-o", self.output, self.root
+            )
+            self.assertEqual(code, 1)
+            results = self.results()
+            self.assertEqual([result["valid"] for result in results], [True, True, False])
+            self.assertEqual(results[2]["error"], "XML has not this tags: from in note")
+            self.assertEqual(results[0]["bytes"], len(FILES["a.xml"]))
+            self.assertIn("3 files (2 valid, 1 invalid)", stderr)
+            self.assertIn("files/s", stderr)
+
+    def test_validate_without_schema(self):
+        summary = os.path.join(self.root, "summary.json")
+        code, _ = self.run_cli(
+            "validate", "-o", self.output, "--summary", summary, os.path.join(self.root, "sub", "*.xml")
+        )
+        self.assertEqual(code, 0)
+        with open(summary) as file:
+            report = json.load(file)
+        self.assertEqual(report["files"], 1)
+        self.assertGreater(report["mb_per_s"], 0)
+        self.assertIsNotNone(report["p99_ms"])
+
+    def test_invalid_schema(self):
+        with open(self.schema, "w") as file:
+            file.write("<xs:schema><xs:element></xs:schema>")
+        code, stderr = self.run_cli("validate", "--schema", self.schema, self.root)
+        self.assertEqual(code, 2)
+        self.assertIn("Invalid schema", stderr)
+
+    def test_schema_without_elements(self):
+        with open(self.schema, "w") as file:
+            file.write('<xs:schema xmlns:xs="x"></xs:schema>')
+        code, stderr = self.run_cli("validate", "--schema", self.schema, self.root)
+        self.assertEqual(code, 2)
+        self.assertIn("Invalid schema", stderr)
+        self.assertIn("Schema has no element", stderr)
+
+    def test_schema_errors_exit_with_2(self):
+        for content, message in [
+            (b'<xs:schema xmlns:xs="x"><xs:sequence></xs:sequence></xs:schema>',
+             "xs:sequence should be a child of xs:complexType"),
+            (b'<xs:schema xmlns:xs="x"><xs:complexType></xs:complexType></xs:schema>',
+             "xs:complexType should be a child of xs:element"),
+            (b'<xs:schema xmlns:xs="x"><xs:element name="\xff"/></xs:schema>', "utf-8"),
+        ]:
+            with open(self.schema, "wb") as file:
+                file.write(content)
+            code, stderr = self.run_cli("validate", "--schema", self.schema, self.root)
+            self.assertEqual(code, 2)
+            self.assertIn("Invalid schema", stderr)
+            self.assertIn(message, stderr)
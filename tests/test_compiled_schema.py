@@ -0,0 +1,130 @@
+import unittest
+
+from xml_parser_comp.compiled_schema import (
+    START_STATE,
+    CompiledSchema,
+    Particle,
+    build_sequence_automaton,
+)
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.exceptions.xsd_error import XSDError
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+                <xs:element name="heading" type="xs:string"/>
+                <xs:element name="body">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="magia" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+def run(tags: list[str], automaton):
+    transitions, accepting, _ = automaton
+    state = START_STATE
+    for tag_id in tags:
+        step = transitions[state].get(tag_id)
+        if step is None:
+            return False
+        state = step[0]
+    return state in accepting
+
+
+class TestCompiledSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = XSDValidator(XSD_STRING).compile_schema()
+
+    def validate(self, xml_string, document=False):
+        xml_validator = XMLBaseValidator(xml_string)
+        xml_validator.validate()
+        if document:
+            xml_tree = xml_validator.generate_xml_document()
+        else:
+            xml_tree = xml_validator.generate_xml_tree()
+        return XMLWithXSDValidator(xml_tree, self.schema).validate()
+
+    def test_compile(self):
+        self.assertEqual(self.schema.root.name, "note")
+        self.assertEqual(self.schema.tag_names, ("note", "to", "from", "heading", "body", "magia"))
+        self.assertEqual(self.schema.elements[1].type, "xs:string")
+        self.assertTrue(self.schema.elements[1].is_leaf)
+        self.assertEqual(self.schema.root.missing[START_STATE], ("to", "from", "heading", "body"))
+
+    def test_validate(self):
+        xml_string = """
+        <note>
+            <to>Tove</to>
+            <from>Jani</from>
+            <heading>Reminder</heading>
+            <body>Don't forget me this weekend!<magia>hola</magia></body>
+        </note>
+        """
+        self.assertTrue(self.validate(xml_string))
+        self.assertTrue(self.validate(xml_string, document=True))
+
+    def test_validate_with_error(self):
+        errors = {
+            "<error></error>": "Tag error is not allowed in this context",
+            "<note><to></to><heading></heading></note>": "Tag heading is not allowed in this context",
+            "<note><to></to><from></from></note>": "XML has not this tags: heading, body in note",
+            "<note><to></to><from></from><heading></heading><body></body></note>":
+                "XML has not this tags: magia in body",
+        }
+        for xml_string, message in errors.items():
+            for document in (False, True):
+                with self.assertRaises(XMLParseError) as context:
+                    self.validate(xml_string, document)
+                self.assertEqual(str(context.exception), message)
+
+    def test_occurs(self):
+        names = ("a", "b")
+        automaton = build_sequence_automaton(
+            [Particle(0, 1, min_occurs=0, max_occurs=2), Particle(1, 2, min_occurs=1, max_occurs=None)],
+            names,
+        )
+        self.assertTrue(run([1], automaton))
+        self.assertTrue(run([0, 0, 1, 1, 1], automaton))
+        self.assertFalse(run([0, 0, 0, 1], automaton))
+        self.assertFalse(run([0], automaton))
+        self.assertFalse(run([1, 0], automaton))
+
+    def test_ambiguous_content_model(self):
+        with self.assertRaises(XSDError):
+            build_sequence_automaton(
+                [Particle(0, 1, min_occurs=0), Particle(0, 2)], ("a",)
+            )
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.schema.root = None
+        with self.assertRaises(AttributeError):
+            self.schema.root.name = "other"
+        with self.assertRaises(TypeError):
+            self.schema.root.transitions[START_STATE][0] = (0, 0)
+
+    def test_compile_without_models(self):
+        from_tree = CompiledSchema(XSDValidator(XSD_STRING).generate_xsd_tree())
+        self.assertEqual(self.schema.tag_names, from_tree.tag_names)
+        self.assertEqual(
+            [(element.name, element.type, element.transitions) for element in self.schema.elements],
+            [(element.name, element.type, element.transitions) for element in from_tree.elements],
+        )
+        with self.assertRaises(XSDError) as context:
+            XSDValidator(XSD_STRING.replace('"to" type="xs:string"', '"to" type="xs:date"')).compile_schema()
+        self.assertEqual(str(context.exception), "Type xs:date is not allowed")
@@ -0,0 +1,208 @@
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.incremental_validator import IncrementalValidator
+from xml_parser_comp.model.xml_tree import XMLTree
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+                <xs:element name="body">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="magia" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+XML_STRING = """
+<note>
+    <to>Tove</to>
+    <from>Jani</from>
+    <body>Don't forget me this weekend!<magia>hola</magia></body>
+</note>
+"""
+
+
+class TestIncrementalValidator(unittest.TestCase):
+
+    def setUp(self):
+        xml_validator = XMLBaseValidator(XML_STRING)
+        xml_validator.validate()
+        self.xml_tree = xml_validator.generate_xml_tree()
+        self.validator = IncrementalValidator(self.xml_tree, XSDValidator(XSD_STRING).compile_schema())
+
+    def test_validate(self):
+        self.assertTrue(self.validator.validate())
+        self.assertEqual(self.validator.visited, 5)
+        self.assertTrue(self.validator.validate())
+        self.assertEqual(self.validator.visited, 0)
+
+    def test_xsd_tree(self):
+        validator = IncrementalValidator(self.xml_tree, XSDValidator(XSD_STRING).generate_xsd_tree())
+        self.assertTrue(validator.validate())
+
+    def test_visits_only_the_edited_path(self):
+        self.validator.validate()
+        magia = self.xml_tree.children[2].children[0]
+        magia.text = "adios"
+        self.validator.mark_dirty(magia)
+        self.assertTrue(self.validator.validate())
+        self.assertEqual(self.validator.visited, 3)
+
+    def test_edits_with_errors(self):
+        self.validator.validate()
+        body = self.xml_tree.children[2]
+        body.children.append(XMLTree(tag="to"))
+        self.validator.mark_dirty(body)
+        with self.assertRaises(XMLParseError) as context:
+            self.validator.validate()
+        self.assertEqual(str(context.exception), "Tag to is not allowed in this context")
+
+        body.children.pop()
+        magia = body.children[0]
+        magia.tag = "other"
+        self.validator.mark_dirty(magia)
+        self.validator.mark_dirty(body)
+        with self.assertRaises(XMLParseError) as context:
+            self.validator.validate()
+        self.assertEqual(str(context.exception), "Tag other is not allowed in this context")
+        # still failing without new edits
+        with self.assertRaises(XMLParseError):
+            self.validator.validate()
+
+        magia.tag = "magia"
+        magia.children.append(XMLTree(tag="extra"))
+        self.validator.mark_dirty(magia)
+        with self.assertRaises(XMLParseError) as context:
+            self.validator.validate()
+        self.assertEqual(str(context.exception), "Tag extra is not allowed in this context")
+
+        magia.children.clear()
+        self.validator.mark_dirty(magia)
+        self.assertTrue(self.validator.validate())
+
+    def test_root_edit(self):
+        self.validator.validate()
+        self.xml_tree.children.pop()
+        self.validator.mark_dirty(self.xml_tree)
+        with self.assertRaises(XMLParseError) as context:
+            self.validator.validate()
+        self.assertEqual(str(context.exception), "XML has not this tags: body in note")
+
+    def test_renamed_child(self):
+        self.validator.validate()
+        child = self.xml_tree.children[0]
+        child.tag = "from"
+        self.validator.mark_dirty(child)
+        for validate in (self.validator.validate, XMLWithXSDValidator(self.xml_tree, self.validator.schema).validate):
+            with self.assertRaises(XMLParseError) as context:
+                validate()
+            self.assertEqual(str(context.exception), "Tag from is not allowed in this context")
+
+        child.tag = "to"
+        self.validator.mark_dirty(child)
+        self.assertTrue(self.validator.validate())
+        self.assertTrue(XMLWithXSDValidator(self.xml_tree, self.validator.schema).validate())
+
+    def test_removed_subtrees_are_released(self):
+        self.validator.validate()
+        self.assertEqual(len(self.validator.entries), 5)
+        body = self.xml_tree.children[2]
+        magia = body.children.pop()
+        self.validator.mark_dirty(body)
+        with self.assertRaises(XMLParseError):
+            self.validator.validate()
+        body.children.append(XMLTree(tag="magia"))
+        self.validator.mark_dirty(body)
+        self.assertTrue(self.validator.validate())
+        self.assertEqual(len(self.validator.entries), 5)
+        self.assertNotIn(id(magia), self.validator.entries)
+
+    def test_typed_values(self):
+        xsd_string = XSD_STRING.replace('name="from" type="xs:string"', 'name="from" type="xs:integer"')
+        xml_tree = XMLBaseValidator(XML_STRING.replace("Jani", "12")).parse()
+        validator = IncrementalValidator(xml_tree, XSDValidator(xsd_string).compile_schema())
+        self.assertTrue(validator.validate())
+
+        sender = xml_tree.children[1]
+        sender.text = "abc"
+        validator.mark_dirty(sender)
+        for validate in (validator.validate, validator.validate, XMLWithXSDValidator(xml_tree, validator.schema).validate):
+            with self.assertRaises(XMLParseError) as context:
+                validate()
+            self.assertEqual(str(context.exception), "Value 'abc' is not a valid xs:integer in from")
+
+        sender.text = "-3"
+        validator.mark_dirty(sender)
+        self.assertTrue(validator.validate())
+        self.assertEqual(validator.visited, 2)
+
+    def test_text_only_edit(self):
+        # a wide parent: a text edit does not check its children again
+        xsd_string = XSD_STRING.replace('name="from" type="xs:string"', 'name="from" type="xs:integer"')
+        xml_tree = XMLBaseValidator(XML_STRING.replace("Jani", "12")).parse()
+        validator = IncrementalValidator(xml_tree, XSDValidator(xsd_string).compile_schema())
+        validator.validate()
+        root_entry = validator.entry(xml_tree, validator.schema.root)
+        sender = xml_tree.children[1]
+
+        sender.text = "abc"
+        validator.mark_dirty(sender, text_only=True)
+        self.assertTrue(root_entry.checked)
+        for _ in range(2):
+            with self.assertRaises(XMLParseError) as context:
+                validator.validate()
+            self.assertEqual(str(context.exception), "Value 'abc' is not a valid xs:integer in from")
+            self.assertTrue(root_entry.checked)
+
+        sender.text = "7"
+        validator.mark_dirty(sender, text_only=True)
+        self.assertTrue(validator.validate())
+        self.assertEqual(validator.visited, 2)
+        self.assertTrue(root_entry.checked)
+
+    def test_values_after_a_structure_error(self):
+        xsd_string = """
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:element name="n">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="a" type="xs:integer"/>
+                        <xs:element name="b">
+                            <xs:complexType>
+                                <xs:sequence>
+                                    <xs:element name="c" type="xs:string"/>
+                                </xs:sequence>
+                            </xs:complexType>
+                        </xs:element>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+        </xs:schema>
+        """
+        xml_tree = XMLBaseValidator("<n><a>x</a><b><d>1</d></b></n>").parse()
+        validator = IncrementalValidator(xml_tree, XSDValidator(xsd_string).compile_schema())
+        with self.assertRaises(XMLParseError) as context:
+            validator.validate()
+        self.assertEqual(str(context.exception), "Tag d is not allowed in this context")
+
+        leaf = xml_tree.children[1].children[0]
+        leaf.tag = "c"
+        validator.mark_dirty(leaf)
+        for validate in (validator.validate, XMLWithXSDValidator(xml_tree, validator.schema).validate):
+            with self.assertRaises(XMLParseError) as context:
+                validate()
+            self.assertEqual(str(context.exception), "Value 'x' is not a valid xs:integer in a")
@@ -0,0 +1,92 @@
+import io
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XML_STRING = """
+<note>
+    <to>Tove</to>
+    <from>Jani</from>
+    <body>Don't forget me <magia>hola</magia></body>
+</note>
+"""
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+                <xs:element name="body">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="magia" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_phases_and_counters(self):
+        metrics = []
+        instrumentation = Instrumentation(callbacks=[lambda metric, value: metrics.append(metric)])
+
+        xml_validator = XMLBaseValidator(XML_STRING, instrumentation=instrumentation)
+        xml_validator.validate()
+        xml_tree = xml_validator.generate_xml_tree()
+        xsd_validator = XSDValidator(XSD_STRING, instrumentation=instrumentation)
+        xsd_validator.validate()
+        xsd_tree = xsd_validator.generate_xsd_tree()
+        XMLWithXSDValidator(xml_tree, xsd_tree, instrumentation=instrumentation).validate()
+
+        self.assertEqual(
+            set(instrumentation.timings),
+            {
+                "xml.tokenize", "xml.check_tags", "xml.build_tree",
+                "xsd.tokenize", "xsd.validate", "xsd.build_tree",
+                "schema.validate",
+            },
+        )
+        counters = instrumentation.counters
+        self.assertEqual(counters["xml.tokens"], 14)
+        self.assertEqual(counters["xml.nodes"], 5)
+        self.assertEqual(counters["xml.max_depth"], 3)
+        self.assertEqual(counters["xml.bytes"], len(XML_STRING))
+        self.assertEqual(counters["xsd.nodes"], 5)
+        self.assertEqual(counters["schema.nodes"], 5)
+        self.assertIn("xml.tokenize.seconds", metrics)
+        self.assertIn("xml.tokens", metrics)
+
+    def test_counters_from_file_and_on_error(self):
+        instrumentation = Instrumentation()
+        XMLBaseValidator.from_file(
+            io.StringIO(XML_STRING), chunk_size=8, instrumentation=instrumentation
+        ).validate(keep_tokens=False)
+        self.assertEqual(instrumentation.counters["xml.bytes"], len(XML_STRING))
+        self.assertIn("xml.validate", instrumentation.timings)
+
+        instrumentation.reset()
+        with self.assertRaises(XMLParseError):
+            XMLBaseValidator("<note></to>", instrumentation=instrumentation).parse()
+        self.assertEqual(instrumentation.counters["xml.tokens"], 2)
+        self.assertIn("xml.parse", instrumentation.timings)
+
+    def test_disabled_by_default(self):
+        xml_validator = XMLBaseValidator(XML_STRING)
+        self.assertIs(xml_validator.instrumentation, NULL_INSTRUMENTATION)
+        xml_validator.validate()
+        self.assertEqual(NULL_INSTRUMENTATION.report(), {"timings": {}, "counters": {}})
+        with self.assertRaises(TypeError):
+            xml_validator.instrumentation.add_callback(print)
+        self.assertEqual(NULL_INSTRUMENTATION.callbacks, [])
@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.xml_base_validator import XMLBaseValidator, iterparse
+
+XML_STRING = """
+<catalog>
+    <item><name>pen</name><price>1</price></item>
+    <item><name>ink</name><price>2</price></item>
+</catalog>
+"""
+
+
+class TestIterparse(unittest.TestCase):
+    def test_events_in_document_order(self):
+        events = [(event, element.tag) for event, element in iterparse(XML_STRING)]
+        self.assertEqual(events[:4], [("start", "catalog"), ("start", "item"), ("start", "name"), ("end", "name")])
+        self.assertEqual(events[-1], ("end", "catalog"))
+        self.assertEqual(len(events), 14)
+
+    def test_end_elements_are_complete(self):
+        ends = [element for event, element in iterparse(XML_STRING, events=("end",))]
+        self.assertEqual(ends[-1], XMLBaseValidator(XML_STRING).parse())
+        self.assertEqual([element.text for element in ends if element.tag == "name"], ["pen", "ink"])
+
+    def test_sources(self):
+        expected = [(event, element.tag) for event, element in iterparse(XML_STRING)]
+        self.assertEqual([(e, x.tag) for e, x in iterparse(XML_STRING.encode())], expected)
+        self.assertEqual([(e, x.tag) for e, x in iterparse(io.StringIO(XML_STRING))], expected)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.xml")
+            with open(path, "w") as file:
+                file.write(XML_STRING)
+            self.assertEqual([(e, x.tag) for e, x in iterparse(Path(path))], expected)
+
+    def test_clear_keeps_memory_flat(self):
+        xml_string = "<catalog>" + "<item><name>pen</name></item>" * 1000 + "</catalog>"
+        root = None
+        records = 0
+        for event, element in iterparse(xml_string):
+            if root is None:
+                root = element
+            elif event == "end" and element.tag == "item":
+                records += 1
+                root.clear()
+            self.assertLessEqual(len(root.children), 1)
+        self.assertEqual(records, 1000)
+        self.assertEqual(root.children, [])
+
+    def test_errors_while_reading(self):
+        events = []
+        with self.assertRaises(XMLParseError) as context:
+            for event, element in iterparse("<a><b></c></a>"):
+                events.append((event, element.tag))
+        self.assertEqual(str(context.exception), "b is not closed")
+        self.assertEqual(events, [("start", "a"), ("start", "b")])
+
+        for xml_string, message in [
+            ("<a></a><b></b>", "There should be only one root element"),
+            ("<a>", "Tag 'a' is not closed"),
+            ("</a>", "Tag 'a' is not opened"),
+        ]:
+            with self.assertRaises(XMLParseError) as context:
+                list(iterparse(xml_string))
+            self.assertEqual(str(context.exception), message)
+        with self.assertRaises(ValueError):
+            list(iterparse(XML_STRING, events=("start-ns",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
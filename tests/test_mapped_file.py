@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.xml_base_validator import XMLBaseValidator, iterparse
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XML_STRING = """
+<note>
+    <to>Tové</to>
+    <from>Jani</from>
+    <heading>Reminder</heading>
+    <body>Don't forget me this weekend!
+        <magia>hola</magia>
+        Haha
+    </body>
+</note>
+"""
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+class TestMappedFile(unittest.TestCase):
+
+    def write_file(self, content: str) -> str:
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".xml", delete=False) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_close(self):
+        xml_validator = XMLBaseValidator.from_path(self.write_file(XML_STRING))
+        mapping = xml_validator.mapping
+        with xml_validator:
+            self.assertEqual(xml_validator.parse(), XMLBaseValidator(XML_STRING).parse())
+        self.assertTrue(mapping.closed)
+        self.assertIsNone(xml_validator.xml_buffer)
+
+        events = iterparse(Path(self.write_file(XML_STRING)))
+        self.assertEqual(next(events)[0], "start")
+        events.close()
+
+    def test_xml_from_path(self):
+        xml_validator = XMLBaseValidator.from_path(self.write_file(XML_STRING))
+        self.addCleanup(xml_validator.close)
+        xml_validator.validate()
+        self.assertEqual(
+            [token.to_model() for token in xml_validator.xml_tokens],
+            XMLBaseValidator(XML_STRING).generate_tokens(),
+        )
+
+        document = xml_validator.generate_xml_document()
+        self.assertEqual(document.text(document.first_child(document.root)), "Tové")
+        self.assertEqual(document.to_xml_tree(), XMLBaseValidator(XML_STRING).parse())
+
+    def test_xml_from_bytes(self):
+        self.assertEqual(
+            XMLBaseValidator.from_bytes(XML_STRING.encode("utf-8")).parse(),
+            XMLBaseValidator(XML_STRING).parse(),
+        )
+        with self.assertRaises(XMLParseError):
+            XMLBaseValidator.from_bytes(b"<note><to></note>").parse()
+
+    def test_unicode_spaces(self):
+        for xml_string in ("<a>\u00a0<b>x</b>\u00a0</a>", "<a>\x1c\u2003<b>x</b> é\u00a0</a>"):
+            self.assertEqual(
+                XMLBaseValidator.from_bytes(xml_string.encode("utf-8")).parse(),
+                XMLBaseValidator(xml_string).parse(),
+            )
+
+    def test_empty_file(self):
+        with self.assertRaises(XMLParseError):
+            XMLBaseValidator.from_path(self.write_file("")).validate()
+
+    def test_xsd_from_path(self):
+        xsd_validator = XSDValidator.from_path(self.write_file(XSD_STRING))
+        self.assertEqual(xsd_validator.tags, XSDValidator(XSD_STRING).tags)
+        xsd_validator.validate()
+        self.assertEqual(
+            xsd_validator.generate_xsd_tree(), XSDValidator(XSD_STRING).generate_xsd_tree()
+        )
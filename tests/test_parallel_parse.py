@@ -0,0 +1,116 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.parallel_parse import (
+    Record,
+    iter_records,
+    parse_parallel,
+    split_records,
+    validate_parallel,
+)
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+ITEM = """
+                <xs:element name="item">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="name" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>"""
+
+XSD_STRING = f"""
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="catalog">
+        <xs:complexType>
+            <xs:sequence>{ITEM * 3}
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+XML_STRING = """
+<catalog>
+    first
+    <item><name>Tove</name></item>
+    <item><name>Jani</name></item>
+    second
+    <item><name>Hola</name></item>
+</catalog>
+"""
+
+
+def sequential(xml_string: str, schema=None):
+    xml_tree = XMLBaseValidator(xml_string).parse()
+    if schema is not None:
+        XMLWithXSDValidator(xml_tree, schema).validate()
+    return xml_tree
+
+
+class TestParallelParse(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = XSDValidator(XSD_STRING).compile_schema()
+
+    def test_split_records(self):
+        split = split_records(XML_STRING)
+        self.assertEqual(split.root, "catalog")
+        self.assertEqual(split.texts, ["first", "second"])
+        self.assertEqual(len(split.records), 3)
+        record = split.records[1]
+        self.assertEqual(record, Record(1, "item", record.start, record.end))
+        self.assertEqual(XML_STRING[record.start:record.end], "<item><name>Jani</name></item>")
+        self.assertEqual(split_records(XML_STRING.encode("utf-8")), split)
+
+    def test_parse_parallel(self):
+        expected = sequential(XML_STRING, self.schema)
+        for workers in (1, 2):
+            self.assertEqual(parse_parallel(XML_STRING, self.schema, workers, batch_size=1), expected)
+            self.assertEqual(parse_parallel(XML_STRING.encode("utf-8"), None, workers), expected)
+            self.assertTrue(validate_parallel(XML_STRING, self.schema, workers, batch_size=1))
+
+    def test_parse_parallel_from_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "catalog.xml"
+            path.write_text(XML_STRING, encoding="utf-8")
+            self.assertEqual(
+                parse_parallel(path, self.schema, workers=2, batch_size=1), sequential(XML_STRING)
+            )
+            self.assertTrue(validate_parallel(path, self.schema, workers=2))
+
+    def test_same_errors_as_sequential(self):
+        items = ["<item><name>a</name></item>"] * 3
+        documents = [
+            "<catalog><item><name>a</item></catalog>",
+            "<catalog>" + "".join(items) + "</catalog><catalog></catalog>",
+            "<catalog>" + "".join(items) + "</item>",
+            "<catalog><item><name>a</name></item>",
+            "<other></other>",
+            "<catalog><item></item><other></other></catalog>",
+            "<catalog><item><name>a</name></item><other></other></catalog>",
+            "<catalog><item><name>a</name></item></catalog>",
+            "<catalog><item><name>a</name></item><item><name>a</name><name>b</name></item></catalog>",
+        ]
+        for document in documents:
+            with self.assertRaises(XMLParseError) as context:
+                sequential(document, self.schema)
+            for workers in (1, 2):
+                with self.assertRaises(XMLParseError) as parallel_context:
+                    parse_parallel(document, self.schema, workers, batch_size=1)
+                self.assertEqual(str(parallel_context.exception), str(context.exception))
+                with self.assertRaises(XMLParseError) as parallel_context:
+                    validate_parallel(document, self.schema, workers, batch_size=1)
+                self.assertEqual(str(parallel_context.exception), str(context.exception))
+
+    def test_records_before_the_error(self):
+        document = "<catalog><item><name>a</name></item><item></item><item><name>c</name></item></catalog>"
+        records = iter_records(document, self.schema, workers=2, batch_size=1)
+        self.assertEqual(next(records).children[0].text, "a")
+        with self.assertRaises(XMLParseError) as context:
+            next(records)
+        self.assertEqual(str(context.exception), "XML has not this tags: name in item")
@@ -0,0 +1,86 @@
+import io
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.path_projection import PathMatcher, PathStep, parse_path
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+
+XML_STRING = """
+<note>
+    <to>Tove</to>
+    <from>Jani</from>
+    <body>Don't forget me this weekend!
+        <magia>hola</magia>
+        <p><magia>chau</magia></p>
+    </body>
+</note>
+"""
+
+
+def sources(xml_string: str) -> list[XMLBaseValidator]:
+    return [
+        XMLBaseValidator(xml_string),
+        XMLBaseValidator.from_bytes(xml_string.encode()),
+        XMLBaseValidator.from_file(io.StringIO(xml_string), chunk_size=7),
+    ]
+
+
+class TestParsePath(unittest.TestCase):
+    def test_steps(self):
+        self.assertEqual(parse_path("/note/body"), (PathStep("note"), PathStep("body")))
+        self.assertEqual(parse_path("//magia"), (PathStep("magia", True),))
+        self.assertEqual(parse_path("/note//*"), (PathStep("note"), PathStep("*", True)))
+
+    def test_invalid_paths(self):
+        for path in ["note/body", "/", "/note/", "/note///body", ""]:
+            with self.assertRaises(ValueError):
+                parse_path(path)
+
+
+class TestParsePaths(unittest.TestCase):
+    def select(self, paths: list[str]) -> list[list[tuple[str, str]]]:
+        results = []
+        for xml_validator in sources(XML_STRING):
+            xml_trees = xml_validator.parse_paths(paths)
+            results.append([(xml_tree.tag, xml_tree.text) for xml_tree in xml_trees])
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+        return results[0]
+
+    def test_child_path(self):
+        self.assertEqual(self.select(["/note/body/magia"]), [("magia", "hola")])
+        self.assertEqual(self.select(["/note/to", "/note/from"]), [("to", "Tove"), ("from", "Jani")])
+        self.assertEqual(self.select(["/body"]), [])
+
+    def test_wildcard_and_descendants(self):
+        self.assertEqual(self.select(["/note/*/magia"]), [("magia", "hola")])
+        self.assertEqual(self.select(["//magia"]), [("magia", "hola"), ("magia", "chau")])
+        self.assertEqual(self.select(["/note//p/magia"]), [("magia", "chau")])
+
+    def test_selected_subtrees_are_complete(self):
+        body = XMLBaseValidator(XML_STRING).parse().children[2]
+        self.assertEqual(XMLBaseValidator(XML_STRING).parse_paths(["//body"]), [body])
+        # a match inside a selected element is part of its tree
+        self.assertEqual(XMLBaseValidator(XML_STRING).parse_paths(["//body", "//magia"]), [body])
+
+    def test_matcher_is_reused(self):
+        matcher = PathMatcher(["//magia"])
+        for _ in range(2):
+            self.assertEqual(len(XMLBaseValidator(XML_STRING).parse_paths(matcher)), 2)
+        self.assertLess(len(matcher.state_sets), 4)
+
+    def test_skipped_parts_are_checked(self):
+        for xml_string, message in [
+            ("<a><b><c></b></a>", "c is not closed"),
+            ("<a></a><b></b>", "There should be only one root element"),
+            ("<a><b></b>", "Tag 'a' is not closed"),
+            ("</a>", "Tag 'a' is not opened"),
+        ]:
+            for xml_validator in sources(xml_string):
+                with self.assertRaises(XMLParseError) as context:
+                    xml_validator.parse_paths(["/a/x"])
+                self.assertEqual(str(context.exception), message)
+
+
+if __name__ == "__main__":
+    unittest.main()
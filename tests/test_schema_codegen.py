@@ -0,0 +1,119 @@
+import unittest
+
+from xml_parser_comp import schema_codegen
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.schema_codegen import GeneratedValidator, generate_validator, schema_hash
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="order">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="name" type="xs:string"/>
+                <xs:element name="quantity" type="xs:integer"/>
+                <xs:element name="line">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="price" type="xs:integer"/>
+                            <xs:element name="note"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+                <xs:element name="line">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="price" type="xs:integer"/>
+                            <xs:element name="note"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+LINE = "<line><price>2</price><note>x</note></line>"
+VALID = f"<order><name>pen</name><quantity>3</quantity>{LINE}{LINE}</order>"
+
+
+class TestGeneratedValidator(unittest.TestCase):
+    def setUp(self):
+        schema_codegen.clear_cache()
+
+    def interpreted_error(self, xml_string: str) -> str | None:
+        xml_tree = XMLBaseValidator(xml_string).parse()
+        try:
+            XMLWithXSDValidator(xml_tree, XSDValidator(XSD_STRING).generate_xsd_tree()).validate()
+        except XMLParseError as error:
+            return str(error)
+        return None
+
+    def test_validate(self):
+        validator = XSDValidator(XSD_STRING).generate_validator()
+        self.assertTrue(validator.validate(XMLBaseValidator(VALID).parse()))
+        self.assertIn("def validate(", validator.source)
+
+    def test_same_errors_as_the_interpreted_validator(self):
+        validator = XSDValidator(XSD_STRING).generate_validator()
+        for xml_string in [
+            "<note></note>",
+            "<order><name>pen</name></order>",
+            f"<order><name>pen</name><quantity>3</quantity>{LINE}</order>",
+            f"<order><name>pen</name><quantity>3</quantity>{LINE}{LINE}{LINE}</order>",
+            f"<order><name>pen</name><quantity>3</quantity>{LINE}<line><price>2</price></line></order>",
+            f"<order><name>pen</name><quantity>3</quantity><line></line>{LINE}</order>",
+            f"<order><name>pen</name><quantity>3</quantity>{LINE}<line><note>x</note><price>2</price></line></order>",
+            f"<order><name>pen<b>x</b></name><quantity>3</quantity>{LINE}{LINE}</order>",
+            f"<order><quantity>3</quantity><name>pen</name>{LINE}{LINE}</order>",
+            # the error inside the line is found before the missing one
+            f"<order><name>pen</name><quantity>3</quantity><line><price>2</price><x></x></line></order>",
+            f"<order><name>pen</name><quantity>three</quantity>{LINE}{LINE}</order>",
+        ]:
+            message = self.interpreted_error(xml_string)
+            self.assertIsNotNone(message, xml_string)
+            with self.assertRaises(XMLParseError) as context:
+                validator.validate(XMLBaseValidator(xml_string).parse())
+            self.assertEqual(str(context.exception), message, xml_string)
+
+    def test_converted_values(self):
+        validator = XSDValidator(XSD_STRING).generate_validator(convert_values=True)
+        values = validator.validate_values(XMLBaseValidator(VALID).parse())
+        self.assertEqual(values["xs:integer"].values, [3, 2, 2])
+        self.assertEqual(values["xs:string"].values, ["pen"])
+        self.assertEqual(XSDValidator(XSD_STRING).generate_validator().validate_values(XMLBaseValidator(VALID).parse()), {})
+
+    def test_cached_by_schema_hash(self):
+        validator = XSDValidator(XSD_STRING).generate_validator()
+        self.assertIs(XSDValidator(XSD_STRING).generate_validator(), validator)
+        self.assertIsNot(XSDValidator(XSD_STRING).generate_validator(convert_values=True), validator)
+        xsd_tree = XSDValidator(XSD_STRING).generate_xsd_tree()
+        self.assertEqual(schema_hash(xsd_tree), validator.key)
+        self.assertIs(generate_validator(xsd_tree), validator)
+
+    def test_repeated_and_deep_elements(self):
+        # records of a list are checked in a loop, deep schemas are split
+        # in functions instead of recursing
+        depth = 300
+        xsd_string = (
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+            + '<xs:element name="d"><xs:complexType><xs:sequence>' * depth
+            + "".join(f'<xs:element name="f{index}" type="xs:integer"/>' for index in range(20))
+            + "</xs:sequence></xs:complexType></xs:element>" * depth
+            + "</xs:schema>"
+        )
+        fields = "".join(f"<f{index}>{index}</f{index}>" for index in range(20))
+        xml_string = "<d>" * depth + fields + "</d>" * depth
+        validator = GeneratedValidator(XSDValidator(xsd_string).generate_xsd_tree(), convert_values=True)
+        values = validator.validate_values(XMLBaseValidator(xml_string).parse())
+        self.assertEqual(values["xs:integer"].values, list(range(20)))
+        with self.assertRaises(XMLParseError) as context:
+            validator.validate(XMLBaseValidator(xml_string.replace("<f7>7</f7>", "")).parse())
+        self.assertEqual(str(context.exception), "Tag f8 is not allowed in this context")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import pickle
+import sys
+import tempfile
+import types
+import unittest
+
+from xml_parser_comp.exceptions.xsd_error import XSDError
+from xml_parser_comp.schema_registry import CACHE_FORMAT_VERSION, SchemaRegistry, schema_hash
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="{name}">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+class TestSchemaRegistry(unittest.TestCase):
+
+    def test_cache_hit(self):
+        registry = SchemaRegistry()
+        schema = registry.get(XSD_STRING.format(name="note"))
+        self.assertIs(registry.get(XSD_STRING.format(name="note")), schema)
+        self.assertIs(registry.get(XSD_STRING.format(name="note").encode("utf-8")), schema)
+        self.assertEqual(schema.root.name, "note")
+
+        info = registry.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def test_lru_eviction(self):
+        registry = SchemaRegistry(maxsize=2)
+        registry.get(XSD_STRING.format(name="a"))
+        registry.get(XSD_STRING.format(name="b"))
+        registry.get(XSD_STRING.format(name="a"))
+        registry.get(XSD_STRING.format(name="c"))
+
+        info = registry.cache_info()
+        self.assertEqual((info.evictions, info.currsize), (1, 2))
+        registry.get(XSD_STRING.format(name="a"))
+        self.assertEqual(registry.cache_info().hits, 2)
+        registry.get(XSD_STRING.format(name="b"))
+        self.assertEqual(registry.cache_info().misses, 4)
+
+    def test_invalid_schema_is_not_cached(self):
+        registry = SchemaRegistry()
+        with self.assertRaises(XSDError):
+            registry.get("<xs:schema><xs:error></xs:error></xs:schema>")
+        self.assertEqual(registry.cache_info().currsize, 0)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            xsd_string = XSD_STRING.format(name="note")
+            schema = SchemaRegistry(cache_dir=cache_dir).get(xsd_string)
+            self.assertTrue(os.path.exists(os.path.join(cache_dir, f"{schema_hash(xsd_string)}.schema")))
+
+            registry = SchemaRegistry(cache_dir=cache_dir)
+            loaded = registry.get(xsd_string)
+            self.assertEqual(registry.cache_info().disk_hits, 1)
+            self.assertEqual(loaded.tag_names, schema.tag_names)
+            self.assertEqual(loaded.root.transitions, schema.root.transitions)
+
+    def test_corrupt_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            xsd_string = XSD_STRING.format(name="note")
+            with open(os.path.join(cache_dir, f"{schema_hash(xsd_string)}.schema"), "wb") as file:
+                file.write(b"not a schema")
+            registry = SchemaRegistry(cache_dir=cache_dir)
+            self.assertEqual(registry.get(xsd_string).root.name, "note")
+            self.assertEqual(registry.cache_info().disk_hits, 0)
+
+    def test_stale_disk_cache(self):
+        # a pickle of a class that was moved since, in a module that is gone
+        module = types.ModuleType("moved_schema_module")
+
+        class Schema:
+            pass
+
+        Schema.__module__ = module.__name__
+        Schema.__qualname__ = "Schema"
+        module.Schema = Schema
+        sys.modules[module.__name__] = module
+        data = pickle.dumps((CACHE_FORMAT_VERSION, Schema()))
+        del sys.modules[module.__name__]
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            xsd_string = XSD_STRING.format(name="note")
+            with open(os.path.join(cache_dir, f"{schema_hash(xsd_string)}.schema"), "wb") as file:
+                file.write(data)
+            registry = SchemaRegistry(cache_dir=cache_dir)
+            self.assertEqual(registry.get(xsd_string).root.name, "note")
+            self.assertEqual(registry.cache_info().disk_hits, 0)
+
+            registry = SchemaRegistry(cache_dir=cache_dir)
+            self.assertEqual(registry.get(xsd_string).root.name, "note")
+            self.assertEqual(registry.cache_info().disk_hits, 1)
@@ -0,0 +1,105 @@
+import io
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.streaming_validator import StreamingXSDValidator
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+                <xs:element name="heading" type="xs:string"/>
+                <xs:element name="body" type="xs:string"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+class TestStreamingXSDValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = XSDValidator(XSD_STRING).compile_schema()
+
+    def validate(self, xml_string):
+        tokens = XMLBaseValidator(xml_string).iter_tokens()
+        return StreamingXSDValidator(self.schema).validate(tokens)
+
+    def test_validate(self):
+        xml_string = """
+        <note>
+            <to>Tove</to>
+            <from>Jani</from>
+            <heading>Reminder</heading>
+            <body>Don't forget me this weekend!</body>
+        </note>
+        """
+        self.assertTrue(self.validate(xml_string))
+
+    def test_validate_with_error(self):
+        errors = {
+            "<error></error>": "Tag error is not allowed in this context",
+            "<note><to></to><body></body></note>": "Tag body is not allowed in this context",
+            "<note><to></to><from></from></note>": "XML has not this tags: heading, body in note",
+            "<note><to></from>": "to is not closed",
+            "</note>": "Tag 'note' is not opened",
+            "<note><to></to>": "Tag 'note' is not closed",
+            "": "There should be only one root element",
+        }
+        for xml_string, message in errors.items():
+            with self.assertRaises(XMLParseError) as context:
+                self.validate(xml_string)
+            self.assertEqual(str(context.exception), message)
+
+    def test_typed_values(self):
+        xsd_string = XSD_STRING.replace('name="from" type="xs:string"', 'name="from" type="xs:integer"')
+        schema = XSDValidator(xsd_string).compile_schema()
+        for xml_string, message in [
+            ("<note><to>a</to><from> 12 </from><heading>b</heading><body>c</body></note>", None),
+            ("<note><to>a</to><from>abc</from><heading>b</heading><body>c</body></note>",
+             "Value 'abc' is not a valid xs:integer in from"),
+            # the structure is checked before the values
+            ("<note><to>a</to><from>abc</from><heading>b</heading></note>", "XML has not this tags: body in note"),
+        ]:
+            for tokens in (
+                XMLBaseValidator(xml_string).iter_tokens(),
+                XMLBaseValidator.from_bytes(xml_string.encode("utf-8")).iter_tokens(),
+            ):
+                if message is None:
+                    self.assertTrue(StreamingXSDValidator(schema).validate(tokens))
+                    continue
+                with self.assertRaises(XMLParseError) as context:
+                    StreamingXSDValidator(schema).validate(tokens)
+                self.assertEqual(str(context.exception), message)
+            if message is not None:
+                with self.assertRaises(XMLParseError) as context:
+                    XMLWithXSDValidator(XMLBaseValidator(xml_string).parse(), schema).validate()
+                self.assertEqual(str(context.exception), message)
+
+    def test_reused_for_many_documents(self):
+        streaming_validator = StreamingXSDValidator(self.schema)
+        xml_string = "<note><to></to><from></from><heading></heading><body></body></note>"
+        for _ in range(2):
+            self.assertTrue(streaming_validator.validate(XMLBaseValidator(xml_string).iter_tokens()))
+        with self.assertRaises(XMLParseError):
+            streaming_validator.validate(XMLBaseValidator("<note><to>").iter_tokens())
+        streaming_validator.reset()
+        self.assertEqual((streaming_validator.stack, streaming_validator.states), ([], []))
+        self.assertTrue(streaming_validator.validate(XMLBaseValidator(xml_string).iter_tokens()))
+
+    def test_error_on_the_offending_tag(self):
+        xml_validator = XMLBaseValidator.from_file(
+            io.StringIO("<note><to></to><error>" + "<to></to>" * 1000), chunk_size=16
+        )
+        streaming_validator = StreamingXSDValidator(self.schema)
+        with self.assertRaises(XMLParseError):
+            streaming_validator.validate(xml_validator.iter_tokens())
+        self.assertEqual([entry[0].name for entry in streaming_validator.states], ["note"])
+        self.assertGreater(len(xml_validator.xml_file.read()), 0)
@@ -0,0 +1,133 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from xml_parser_comp.tree_format import (
+    FORMAT_VERSION,
+    HEADER,
+    MappedXMLDocument,
+    dump_tree,
+    load_xml,
+    load_xsd,
+    read_xml,
+    read_xsd,
+    write_tree,
+)
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XML_STRING = """
+<note>
+    <to>Tové</to>
+    <from>Jani</from>
+    <heading>Reminder</heading>
+    <body>Don't forget me this weekend!<magia>hola</magia>Haha</body>
+</note>
+"""
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+                <xs:element name="heading" type="xs:string"/>
+                <xs:element name="body">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="magia" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+class TestTreeFormat(unittest.TestCase):
+
+    def setUp(self):
+        xml_validator = XMLBaseValidator(XML_STRING)
+        xml_validator.validate()
+        self.xml_tree = xml_validator.generate_xml_tree()
+        self.xml_document = xml_validator.generate_xml_document()
+        self.xsd_tree = XSDValidator(XSD_STRING).generate_xsd_tree()
+
+    def test_xml_tree(self):
+        document = load_xml(dump_tree(self.xml_tree))
+        self.assertIsInstance(document, MappedXMLDocument)
+        self.assertEqual(len(document), 6)
+        self.assertEqual(document.tag(document.root), "note")
+        self.assertEqual(document.text(1), "Tové")
+        self.assertEqual(document.text(4), "Don't forget me this weekend! Haha")
+        self.assertEqual([document.tag(child) for child in document.children(4)], ["magia"])
+        self.assertEqual(document.to_xml_tree(), self.xml_tree)
+        self.assertEqual(document.to_xml_tree(4), self.xml_tree.children[3])
+
+    def test_xml_document(self):
+        self.assertEqual(dump_tree(self.xml_document), dump_tree(self.xml_tree))
+
+    def test_xsd_tree(self):
+        self.assertEqual(load_xsd(dump_tree(self.xsd_tree)), self.xsd_tree)
+
+    def test_validate_mapped_document(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "note.tree"
+            write_tree(self.xml_tree, path)
+            with read_xml(path) as document:
+                schema = XSDValidator(XSD_STRING).compile_schema()
+                self.assertTrue(XMLWithXSDValidator(document, schema).validate())
+                self.assertTrue(XMLWithXSDValidator(document, self.xsd_tree).validate())
+                self.assertEqual(document.to_xml_tree(), self.xml_tree)
+            self.assertIsNone(document.mapping)
+
+            path = Path(directory) / "note.xsd.tree"
+            write_tree(self.xsd_tree, path)
+            self.assertEqual(read_xsd(path), self.xsd_tree)
+
+    def test_wrong_files(self):
+        data = dump_tree(self.xml_tree)
+        with self.assertRaises(ValueError):
+            load_xml(b"<note></note>" * 3)
+        with self.assertRaises(ValueError):
+            load_xml(data[:-8])
+        with self.assertRaises(ValueError):
+            load_xsd(data)
+        newer = bytearray(data)
+        struct.pack_into("<H", newer, 4, FORMAT_VERSION + 1)
+        with self.assertRaises(ValueError) as context:
+            load_xml(bytes(newer))
+        self.assertEqual(str(context.exception), f"Unsupported tree format version {FORMAT_VERSION + 1}")
+        self.assertEqual(HEADER.size % 8, 0)
+
+    def test_ids_out_of_range(self):
+        data = dump_tree(self.xml_tree)
+        nodes, strings = 6, 6
+        start = HEADER.size + (strings + 1) * 8
+        column_size = (nodes * 4 + 7) & ~7
+        for column, node, value, message in [
+            (0, 3, 7, "Parent id out of range in tree file"),
+            (0, 3, 3, "Parent id out of range in tree file"),
+            (1, 0, 99, "Node id out of range in tree file"),
+            (2, 1, -5, "Node id out of range in tree file"),
+            (3, 2, strings, "Tag id out of range in tree file"),
+        ]:
+            corrupt = bytearray(data)
+            struct.pack_into("<i", corrupt, start + column * column_size + node * 4, value)
+            with self.assertRaises(ValueError) as context:
+                load_xml(bytes(corrupt)).to_xml_tree()
+            self.assertEqual(str(context.exception), message)
+
+        # the texts of nodes 1 and 2 swapped
+        offsets = start + 4 * column_size
+        first, second = struct.unpack_from("<qq", data, offsets + 8)
+        corrupt = bytearray(data)
+        struct.pack_into("<qq", corrupt, offsets + 8, second, first)
+        with self.assertRaises(ValueError) as context:
+            load_xml(bytes(corrupt))
+        self.assertEqual(str(context.exception), "Text offsets out of order in tree file")
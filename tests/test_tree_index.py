@@ -0,0 +1,112 @@
+import pickle
+import unittest
+
+from xml_parser_comp.model.xml_tree import NodeList, XMLTree
+from xml_parser_comp.tree_index import LAST, QueryStep, TreeIndex, parse_query
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+
+XML_STRING = """
+<catalog>
+    <item><name>pen</name><price>1</price></item>
+    <item><name>ink</name></item>
+    <shelf><item><name>pad</name></item></shelf>
+</catalog>
+"""
+
+
+def texts(nodes: list[XMLTree]) -> list[str]:
+    return [node.text for node in nodes]
+
+
+class TestParseQuery(unittest.TestCase):
+    def test_steps(self):
+        self.assertEqual(parse_query("item/name"), (False, (QueryStep("item"), QueryStep("name"))))
+        self.assertEqual(parse_query(".//name"), (False, (QueryStep("name", True),)))
+        self.assertEqual(parse_query("/catalog/item[2]"), (True, (QueryStep("catalog"), QueryStep("item", False, 2))))
+        self.assertEqual(parse_query("//*[last()]"), (True, (QueryStep("*", True, LAST),)))
+
+    def test_invalid_paths(self):
+        for path in ["", "/", "item/", "a///b", "item[0]", "item[x]", "item[1"]:
+            with self.assertRaises(ValueError):
+                parse_query(path)
+
+
+class TestTreeIndex(unittest.TestCase):
+    def setUp(self):
+        self.xml_tree = XMLBaseValidator(XML_STRING).parse()
+
+    def test_queries(self):
+        xml_tree = self.xml_tree
+        self.assertEqual(texts(xml_tree.find_all("item/name")), ["pen", "ink"])
+        self.assertEqual(texts(xml_tree.find_all(".//name")), ["pen", "ink", "pad"])
+        self.assertEqual(texts(xml_tree.find_all("//item/name")), ["pen", "ink", "pad"])
+        self.assertEqual(texts(xml_tree.find_all("/catalog/*/item/name")), ["pad"])
+        self.assertEqual([node.tag for node in xml_tree.find_all("*")], ["item", "item", "shelf"])
+        self.assertEqual(xml_tree.find_all("/item"), [])
+        self.assertEqual(xml_tree.find("."), xml_tree)
+        self.assertIsNone(xml_tree.find("item/price/name"))
+
+    def test_positions(self):
+        xml_tree = self.xml_tree
+        self.assertEqual(texts(xml_tree.find_all("/catalog/item[2]/name")), ["ink"])
+        self.assertEqual(texts(xml_tree.find_all("//item[1]/name")), ["pen", "pad"])
+        self.assertEqual(texts(xml_tree.find_all("item[last()]/*")), ["ink"])
+        self.assertEqual(xml_tree.find_all("item[3]"), [])
+
+    def test_same_results_as_a_walk(self):
+        for tag in ["catalog", "item", "name", "price", "shelf"]:
+            expected = [node for node in self.xml_tree.iter_nodes() if node.tag == tag]
+            self.assertEqual(self.xml_tree.find_all(f"//{tag}"), expected)
+
+    def test_subtree_queries_use_the_index(self):
+        index = self.xml_tree.tree_index()
+        shelf = self.xml_tree.children[2]
+        self.assertIs(shelf.tree_index(), index)
+        self.assertEqual(texts(shelf.find_all("item/name")), ["pad"])
+        self.assertEqual(texts(shelf.find_all("/shelf//name")), ["pad"])
+        name = shelf.find(".//name")
+        self.assertIs(index.parent(name), shelf.children[0])
+        self.assertIsNone(index.parent(self.xml_tree))
+        self.assertEqual(index.path(name), "/catalog/shelf/item/name")
+
+    def test_changes_invalidate_the_index(self):
+        index = self.xml_tree.tree_index()
+        self.assertIs(self.xml_tree.tree_index(), index)
+
+        self.xml_tree.children[2].children.append(XMLTree(tag="item", children=[XMLTree(tag="name", text="cap")]))
+        self.assertFalse(index.valid)
+        self.assertEqual(texts(self.xml_tree.find_all("//item/name")), ["pen", "ink", "pad", "cap"])
+
+        index = self.xml_tree.tree_index()
+        self.xml_tree.find("item/name").text = "pencil"
+        self.assertFalse(index.valid)
+        self.assertEqual(texts(self.xml_tree.find_all("item/name")), ["pencil", "ink"])
+
+        index = self.xml_tree.tree_index()
+        self.xml_tree.children = self.xml_tree.children[:1]
+        self.assertFalse(index.valid)
+        self.assertIsInstance(self.xml_tree.children, NodeList)
+        self.assertEqual(texts(self.xml_tree.find_all(".//name")), ["pencil"])
+
+    def test_index_is_not_copied(self):
+        index = TreeIndex(self.xml_tree)
+        self.assertEqual(len(index), 9)
+        copy = pickle.loads(pickle.dumps(self.xml_tree))
+        self.assertEqual(copy, self.xml_tree)
+        self.assertIsNone(copy.children.tree_index)
+        copy.children.clear()
+        self.assertTrue(index.valid)
+
+
+    def test_constructed_trees(self):
+        leaf = XMLTree.model_construct(tag="name", text="pen", children=[])
+        root = XMLTree.model_construct(tag="item", text="", children=[leaf])
+        leaf.text = "pencil"
+        self.assertEqual(texts(root.find_all("name")), ["pencil"])
+        self.assertIsInstance(root.children, NodeList)
+        root.children.append(XMLTree(tag="name", text="pen"))
+        self.assertEqual(texts(root.find_all("name")), ["pencil", "pen"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.incremental_validator import IncrementalValidator
+from xml_parser_comp.model.xml_tree import XMLTree
+from xml_parser_comp.tree_interner import InternReport, TreeInterner
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XML_STRING = """
+<catalog>
+    <item><kind>book</kind><price>10</price></item>
+    <item><kind>book</kind><price>10</price></item>
+    <item><kind>book</kind><price>12</price></item>
+</catalog>
+"""
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="catalog">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="item">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="kind" type="xs:string"/>
+                            <xs:element name="price" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+                <xs:element name="item">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="kind" type="xs:string"/>
+                            <xs:element name="price" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+                <xs:element name="item">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="kind" type="xs:string"/>
+                            <xs:element name="price" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+class TestTreeInterner(unittest.TestCase):
+
+    def setUp(self):
+        self.xml_validator = XMLBaseValidator(XML_STRING)
+        self.xml_validator.validate()
+
+    def test_same_tree(self):
+        interner = TreeInterner()
+        self.assertEqual(self.xml_validator.generate_xml_tree(interner), self.xml_validator.generate_xml_tree())
+
+    def test_shared_subtrees(self):
+        interner = TreeInterner()
+        xml_tree = self.xml_validator.generate_xml_tree(interner)
+        first, second, third = xml_tree.children
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertIs(first.children[0], third.children[0])
+        # catalog, 3 items with 2 children each
+        self.assertEqual(interner.report(), InternReport(total_nodes=10, unique_nodes=6, unique_texts=4))
+        self.assertEqual(interner.report().shared_nodes, 4)
+
+    def test_shared_between_documents(self):
+        interner = TreeInterner()
+        first = self.xml_validator.generate_xml_tree(interner)
+        second = self.xml_validator.generate_xml_tree(interner)
+        self.assertIs(first, second)
+        self.assertEqual(interner.report().unique_nodes, 6)
+        interner.clear()
+        self.assertEqual(interner.report(), InternReport(0, 0, 0))
+
+    def test_validation_of_shared_subtrees(self):
+        xml_tree = self.xml_validator.generate_xml_tree(TreeInterner())
+        validator = IncrementalValidator(xml_tree, XSDValidator(XSD_STRING).compile_schema())
+        self.assertTrue(validator.validate())
+        # the shared item and its children are checked once
+        self.assertEqual(validator.visited, 6)
+
+    def test_shared_node_under_elements_of_different_shapes(self):
+        xsd_string = """
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:element name="shop">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="item">
+                            <xs:complexType>
+                                <xs:sequence>
+                                    <xs:element name="kind" type="xs:string"/>
+                                </xs:sequence>
+                            </xs:complexType>
+                        </xs:element>
+                        <xs:element name="offer">
+                            <xs:complexType>
+                                <xs:sequence>
+                                    <xs:element name="kind" type="xs:integer"/>
+                                </xs:sequence>
+                            </xs:complexType>
+                        </xs:element>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+        </xs:schema>
+        """
+        xml_validator = XMLBaseValidator("<shop><item><kind>1</kind></item><offer><kind>1</kind></offer></shop>")
+        xml_validator.validate()
+        xml_tree = xml_validator.generate_xml_tree(TreeInterner())
+        kind = xml_tree.children[0].children[0]
+        self.assertIs(kind, xml_tree.children[1].children[0])
+
+        validator = IncrementalValidator(xml_tree, XSDValidator(xsd_string).compile_schema())
+        self.assertTrue(validator.validate())
+        self.assertEqual(len(validator.entries[id(kind)]), 2)
+        self.assertTrue(validator.validate())
+        self.assertEqual(validator.visited, 0)
+
+        # both parents are checked again
+        kind.children.append(XMLTree(tag="extra"))
+        validator.mark_dirty(kind)
+        with self.assertRaises(XMLParseError) as context:
+            validator.validate()
+        self.assertEqual(str(context.exception), "Tag extra is not allowed in this context")
+        kind.children.clear()
+        validator.mark_dirty(kind)
+        self.assertTrue(validator.validate())
+        self.assertEqual(validator.visited, 5)
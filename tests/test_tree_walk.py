@@ -0,0 +1,78 @@
+import contextlib
+import io
+import unittest
+
+from benchmarks.generators import deep
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.model.xml_tree import XMLTree
+from xml_parser_comp.model.xsd_tree import XSDTree
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+DEPTH = 3000
+
+
+class TestTreeWalk(unittest.TestCase):
+
+    def setUp(self):
+        self.xml_tree = XMLBaseValidator(
+            "<note><to>Tove</to><body>Hi<magia>hola</magia></body></note>"
+        ).parse()
+
+    def test_walk(self):
+        self.assertEqual(
+            [(node.tag, depth) for node, depth in self.xml_tree.walk()],
+            [("note", 0), ("to", 1), ("body", 1), ("magia", 2)],
+        )
+        self.assertEqual(
+            [node.tag for node in self.xml_tree.iter_nodes("post")],
+            ["to", "magia", "body", "note"],
+        )
+        with self.assertRaises(ValueError):
+            list(self.xml_tree.walk("in"))
+
+    def test_to_dict_and_from_dict(self):
+        self.assertEqual(self.xml_tree.to_dict(), self.xml_tree.model_dump())
+        self.assertEqual(XMLTree.from_dict(self.xml_tree.to_dict()), self.xml_tree)
+
+        xsd_tree = XSDTree(name="note", children=[XSDTree(name="to", type="xs:string")])
+        self.assertEqual(xsd_tree.to_dict(), xsd_tree.model_dump())
+        self.assertEqual(XSDTree.from_dict(xsd_tree.to_dict()), xsd_tree)
+
+    def test_deep_document(self):
+        workload = deep(DEPTH)
+        xml_validator = XMLBaseValidator(workload.xml)
+        xml_validator.validate()
+        xml_tree = xml_validator.generate_xml_tree()
+        xsd_validator = XSDValidator(workload.xsd)
+        xsd_validator.validate()
+        xsd_tree = xsd_validator.generate_xsd_tree()
+
+        self.assertEqual(len(list(xml_tree.iter_nodes("post"))), DEPTH)
+        self.assertTrue(XMLWithXSDValidator(xml_tree, xsd_tree).validate())
+        self.assertTrue(XMLWithXSDValidator(xml_tree, xsd_validator.compile_schema()).validate())
+        self.assertTrue(
+            XMLWithXSDValidator(xml_validator.generate_xml_document(), xsd_tree).validate()
+        )
+        copy = XMLTree.from_dict(xml_tree.to_dict())
+        self.assertEqual(
+            [(node.tag, node.text, depth) for node, depth in copy.walk()],
+            [(node.tag, node.text, depth) for node, depth in xml_tree.walk()],
+        )
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            xml_validator.print_xml_tree(xml_tree)
+        self.assertEqual(len(output.getvalue().splitlines()), DEPTH)
+
+    def test_error_in_deep_document(self):
+        workload = deep(DEPTH)
+        xml_string = workload.xml.replace("bottom", "<extra></extra>")
+        xml_validator = XMLBaseValidator(xml_string)
+        xml_validator.validate()
+        xml_tree = xml_validator.generate_xml_tree()
+        xsd_tree = XSDValidator(workload.xsd).generate_xsd_tree()
+        with self.assertRaises(XMLParseError) as context:
+            XMLWithXSDValidator(xml_tree, xsd_tree).validate()
+        self.assertEqual(str(context.exception), "Tag extra is not allowed in this context")
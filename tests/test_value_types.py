@@ -0,0 +1,111 @@
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.model.xsd_types import XSDElementTypeAttribute
+from xml_parser_comp.tree_format import dump_tree, load_xml
+from xml_parser_comp.value_types import VALUE_TYPES, IntegerType
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="order">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="name" type="xs:string"/>
+                <xs:element name="quantity" type="xs:integer"/>
+                <xs:element name="line">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="price" type="xs:integer"/>
+                            <xs:element name="note"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+def order(quantity: str, price: str) -> str:
+    return (
+        f"<order><name>pen</name><quantity>{quantity}</quantity>"
+        f"<line><price>{price}</price><note>x</note></line></order>"
+    )
+
+
+class TestIntegerType(unittest.TestCase):
+    def test_first_invalid(self):
+        integer = IntegerType()
+        self.assertIsNone(integer.first_invalid(["1", "-20", "+3", "007"]))
+        self.assertIsNone(integer.first_invalid([]))
+        for texts, index in [
+            (["1", "x"], 1),
+            (["", "1"], 0),
+            (["1", "-"], 1),
+            (["1\n2"], 0),
+            (["+-1"], 0),
+            (["1_000"], 0),
+            (["1.5"], 0),
+            (["٣"], 0),
+        ]:
+            self.assertEqual(integer.first_invalid(texts), index, texts)
+
+    def test_convert(self):
+        self.assertEqual(VALUE_TYPES["xs:integer"].convert(["1", "-20", "+3", "007"]), [1, -20, 3, 7])
+        self.assertEqual(VALUE_TYPES["xs:string"].convert(["a", "b"]), ["a", "b"])
+
+    def test_validate_type(self):
+        self.assertTrue(XMLWithXSDValidator.validate_type("12", XSDElementTypeAttribute.INTEGER))
+        self.assertFalse(XMLWithXSDValidator.validate_type("twelve", "xs:integer"))
+        self.assertTrue(XMLWithXSDValidator.validate_type("twelve", XSDElementTypeAttribute.STRING))
+
+
+class TestTypedValues(unittest.TestCase):
+    def targets(self, xml_string: str) -> list[XMLWithXSDValidator]:
+        """
+        The validators of every kind of tree and schema.
+        """
+        xsd_tree = XSDValidator(XSD_STRING).generate_xsd_tree()
+        schema = XSDValidator(XSD_STRING).compile_schema()
+        xml_tree = XMLBaseValidator(xml_string).parse()
+        xml_validator = XMLBaseValidator(xml_string)
+        xml_validator.validate()
+        document = xml_validator.generate_xml_document()
+        mapped = load_xml(dump_tree(xml_tree))
+        return [
+            XMLWithXSDValidator(xml, xsd, convert_values=True)
+            for xml in (xml_tree, document, mapped)
+            for xsd in (xsd_tree, schema)
+        ]
+
+    def test_converted_columns(self):
+        for validator in self.targets(order("3", "-250")):
+            self.assertTrue(validator.validate())
+            self.assertEqual(validator.values["xs:integer"].values, [3, -250])
+            self.assertEqual(validator.values["xs:string"].values, ["pen"])
+            self.assertEqual(len(validator.values["xs:integer"].nodes), 2)
+
+    def test_invalid_values(self):
+        for xml_string, message in [
+            (order("three", "1"), "Value 'three' is not a valid xs:integer in quantity"),
+            (order("3", "1.5"), "Value '1.5' is not a valid xs:integer in price"),
+            (order("", "1"), "Value '' is not a valid xs:integer in quantity"),
+        ]:
+            for validator in self.targets(xml_string):
+                with self.assertRaises(XMLParseError) as context:
+                    validator.validate()
+                self.assertEqual(str(context.exception), message)
+
+    def test_values_are_only_kept_when_converted(self):
+        xml_tree = XMLBaseValidator(order("3", "1")).parse()
+        validator = XMLWithXSDValidator(xml_tree, XSDValidator(XSD_STRING).compile_schema())
+        self.assertTrue(validator.validate())
+        self.assertEqual(validator.values, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -216,4 +216,47 @@ class TestXMLBaseValidator(unittest.TestCase):
         self.assertEqual(xml_tree.children[3].tag, "body")
         self.assertEqual(xml_tree.children[3].text, "Don't forget me this weekend!")
 
-    
\ No newline at end of file
+    
+    def test_parse(self):
+        xml_string = """
+        <note>
+            <to>Tove</to>
+            <from>Jani</from>
+            <heading>Reminder</heading>
+            <body>Don't forget me this weekend!
+                <magia>hola</magia>
+                Haha
+            </body>
+        </note>
+        """
+        xml_validator = XMLBaseValidator(xml_string)
+        xml_tree = xml_validator.parse()
+        self.assertEqual(xml_validator.xml_tokens, [])
+
+        xml_validator.validate()
+        self.assertEqual(xml_tree, xml_validator.generate_xml_tree())
+
+    def test_parse_with_exception(self):
+        for xml_string in [
+            "<note><to>Tove</to><body></note>",
+            "<note></note><error></error>",
+            "<note></error><to>Tove</to><note>",
+            "<note><to>Tove</to>",
+            "Tove",
+        ]:
+            with self.assertRaises(XMLParseError):
+                XMLBaseValidator(xml_string).parse()
+
+    def test_parse_stops_at_first_error(self):
+        class Source:
+            reads = 0
+
+            def read(self, size):
+                self.reads += 1
+                return "<note></note></error>" if self.reads == 1 else "<to>Tove</to>"
+
+        source = Source()
+        with self.assertRaises(XMLParseError) as context:
+            XMLBaseValidator.from_file(source).parse()
+        self.assertEqual(str(context.exception), "Tag 'error' is not opened")
+        self.assertEqual(source.reads, 1)
@@ -0,0 +1,98 @@
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.model.xml_document import NO_NODE
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+XML_STRING = """
+<note>
+    <to>Tove</to>
+    <from>Jani</from>
+    <heading>Reminder</heading>
+    <body>Don't forget me this weekend!
+        <magia>hola</magia>
+        Haha
+    </body>
+</note>
+"""
+
+XSD_STRING = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="note">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="to" type="xs:string"/>
+                <xs:element name="from" type="xs:string"/>
+                <xs:element name="heading" type="xs:string"/>
+                <xs:element name="body">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="magia" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+class TestXMLDocument(unittest.TestCase):
+
+    def generate_xml_document(self, xml_string):
+        xml_validator = XMLBaseValidator(xml_string)
+        xml_validator.validate()
+        return xml_validator.generate_xml_document()
+
+    def test_navigation(self):
+        document = self.generate_xml_document(XML_STRING)
+        self.assertEqual(len(document), 6)
+        self.assertEqual(document.tag(document.root), "note")
+        self.assertEqual(document.parent(document.root), NO_NODE)
+
+        children = list(document.children(document.root))
+        self.assertEqual([document.tag(child) for child in children], ["to", "from", "heading", "body"])
+        self.assertEqual([document.text(child) for child in children[:3]], ["Tove", "Jani", "Reminder"])
+        self.assertEqual(document.text(children[3]), "Don't forget me this weekend! Haha")
+
+        magia = document.first_child(children[3])
+        self.assertEqual(document.tag(magia), "magia")
+        self.assertEqual(document.parent(magia), children[3])
+        self.assertEqual(document.next_sibling(magia), NO_NODE)
+        self.assertEqual(document.tag_names, ["note", "to", "from", "heading", "body", "magia"])
+        self.assertEqual(document.view("parents").tolist(), [-1, 0, 0, 0, 0, 4])
+
+    def test_to_xml_tree(self):
+        xml_validator = XMLBaseValidator(XML_STRING)
+        xml_validator.validate()
+        document = xml_validator.generate_xml_document()
+        self.assertEqual(document.to_xml_tree(), xml_validator.generate_xml_tree())
+
+    def test_validate_with_xsd(self):
+        xsd_tree = XSDValidator(XSD_STRING).generate_xsd_tree()
+        document = self.generate_xml_document(XML_STRING)
+        self.assertTrue(XMLWithXSDValidator(document, xsd_tree).validate())
+
+        document = self.generate_xml_document("<note><to>Tove</to><from>Jani</from></note>")
+        with self.assertRaises(XMLParseError):
+            XMLWithXSDValidator(document, xsd_tree).validate()
+
+    def test_lazy_text(self):
+        xml_validator = XMLBaseValidator(XML_STRING, lazy_text=True)
+        xml_validator.validate()
+        text_tokens = [token for token in xml_validator.xml_tokens if token.type == "Text"]
+        self.assertEqual(
+            [XML_STRING[token.start:token.end].strip() for token in text_tokens[:3]],
+            ["Tove", "Jani", "Reminder"],
+        )
+        self.assertEqual(text_tokens[0].text, "Tove")
+
+        document = xml_validator.generate_xml_document()
+        self.assertIs(document.text_buffer, XML_STRING)
+        body = list(document.children(document.root))[3]
+        self.assertEqual(len(document.text_spans(body)), 2)
+        self.assertEqual(document.text(body), "Don't forget me this weekend! Haha")
+        self.assertEqual(document.to_xml_tree(), xml_validator.generate_xml_tree())
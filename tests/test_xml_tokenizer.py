@@ -0,0 +1,88 @@
+import io
+import unittest
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_tokenizer import XMLTokenizer
+
+XML_STRING = """
+<note>
+    <to>Tove</to>
+    <from>Jani</from>
+    <heading>Reminder</heading>
+    <body>Don't forget me this weekend!
+        <magia>hola</magia>
+        Haha
+    </body>
+</note>
+"""
+
+
+class TestXMLTokenizer(unittest.TestCase):
+
+    def test_feed_in_small_chunks(self):
+        expected = list(XMLBaseValidator(XML_STRING).iter_tokens())
+        for chunk_size in (1, 2, 3, 7, 64):
+            tokenizer = XMLTokenizer()
+            tokens = []
+            for start in range(0, len(XML_STRING), chunk_size):
+                tokenizer.feed(XML_STRING[start:start + chunk_size])
+                tokens.extend(tokenizer.read_tokens())
+            tokenizer.close()
+            tokens.extend(tokenizer.read_tokens())
+            self.assertEqual(tokens, expected)
+
+    def test_text_split_between_chunks(self):
+        tokenizer = XMLTokenizer()
+        tokenizer.feed("<to>To")
+        self.assertEqual([token.tag_name for token in tokenizer.read_tokens()], ["to"])
+        tokenizer.feed("ve</t")
+        self.assertEqual([token.text for token in tokenizer.read_tokens()], ["Tove"])
+        tokenizer.feed("o>")
+        tokenizer.close()
+        tokens = list(tokenizer.read_tokens())
+        self.assertEqual(len(tokens), 1)
+        self.assertTrue(tokens[0].is_closing_tag)
+        self.assertEqual(tokens[0].tag_name, "to")
+
+    def test_long_text_in_many_chunks(self):
+        # the pending text is kept as pieces until the '<' that ends it
+        tokenizer = XMLTokenizer()
+        tokenizer.feed("<to>")
+        for _ in range(1000):
+            tokenizer.feed("ab")
+        self.assertEqual(len(list(tokenizer.read_tokens())), 1)
+        self.assertEqual(len(tokenizer._pending), 1000)
+        tokenizer.feed("</to>")
+        tokenizer.close()
+        tokens = list(tokenizer.read_tokens())
+        self.assertEqual(tokens[0].text, "ab" * 1000)
+        self.assertEqual(tokens[1].tag_name, "to")
+
+    def test_read_from_file(self):
+        tokenizer = XMLTokenizer(io.StringIO(XML_STRING), chunk_size=5)
+        self.assertEqual(list(tokenizer), list(XMLBaseValidator(XML_STRING).iter_tokens()))
+
+    def test_feed_after_close(self):
+        tokenizer = XMLTokenizer()
+        tokenizer.close()
+        with self.assertRaises(XMLParseError):
+            tokenizer.feed("<note>")
+
+    def test_validate_from_file_without_keeping_tokens(self):
+        xml_validator = XMLBaseValidator.from_file(io.StringIO(XML_STRING), chunk_size=4)
+        xml_validator.validate(keep_tokens=False)
+        self.assertEqual(xml_validator.xml_tokens, [])
+
+        xml_validator = XMLBaseValidator.from_file(io.StringIO("<note><to></note>"), chunk_size=4)
+        with self.assertRaises(XMLParseError):
+            xml_validator.validate(keep_tokens=False)
+
+    def test_token_model_view(self):
+        tokens = list(XMLBaseValidator(XML_STRING).iter_tokens())
+        self.assertEqual(
+            [token.to_model() for token in tokens],
+            XMLBaseValidator(XML_STRING).generate_tokens(),
+        )
+        self.assertEqual(tokens[0].to_model().type, "Tag")
+        self.assertEqual(tokens[2].to_model().text, "Tove")
@@ -3,6 +3,7 @@ import unittest
 
 from xml_parser_comp.xsd_validator import XSDValidator
 from xml_parser_comp.exceptions.xsd_error import XSDError
+from xml_parser_comp.model.xsd_token import XSDToken
 
 
 class TestXSDValidator(unittest.TestCase):
@@ -41,6 +42,31 @@ class TestXSDValidator(unittest.TestCase):
             ],
         )
 
+    def test_tokens_are_models(self):
+        xsd_string = """
+        <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+            <xs:element name="note" type="xs:string"/>
+        </xs:schema>
+        """
+        xsd_validator = XSDValidator(xsd_string)
+        tokens = xsd_validator.generate_xsd_tokens()
+        self.assertTrue(all(isinstance(token, XSDToken) for token in tokens))
+        self.assertEqual([token.to_model() for token in xsd_validator.xsd_tokens], tokens)
+        self.assertEqual(xsd_validator.tokens, tokens)
+        self.assertIs(xsd_validator.tokens, xsd_validator.xsd_tokens)
+        self.assertEqual(tokens[1].attributes, {"name": "note", "type": "xs:string"})
+        self.assertTrue(tokens[1].is_opening_tag and tokens[1].is_closing_tag)
+        self.assertEqual(xsd_validator.generate_xsd_tree().name, "note")
+
+    def test_assigned_tokens_are_validated(self):
+        xsd_validator = XSDValidator('<xs:schema xmlns:xs="x"><xs:element name="note"/></xs:schema>')
+        xsd_validator.tokens = xsd_validator.tokens[:-1]
+        with self.assertRaises(XSDError):
+            xsd_validator.validate()
+        xsd_validator.tokens = XSDValidator('<xs:schema xmlns:xs="x"><xs:element name="to"/></xs:schema>').tokens
+        xsd_validator.validate()
+        self.assertEqual(xsd_validator.generate_xsd_tree().name, "to")
+
     def test_check_if_all_tags_are_closed(self):
         xsd_string = """
         <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
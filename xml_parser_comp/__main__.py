@@ -0,0 +1,5 @@
+import sys
+
+from xml_parser_comp.cli import main
+
+sys.exit(main())
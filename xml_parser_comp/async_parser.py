@@ -0,0 +1,141 @@
+import asyncio
+import codecs
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator
+
+from xml_parser_comp.compiled_schema import CompiledSchema
+from xml_parser_comp.model.fast_token import CLOSING_TAG, OPENING_TAG, FastXMLToken
+from xml_parser_comp.streaming_validator import StreamingValidator, StreamingXSDValidator
+from xml_parser_comp.xml_tokenizer import CHUNK_SIZE, XMLTokenizer, scan
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+
+# chunks of at least this many characters are tokenized in the executor
+OFFLOAD_SIZE = 256 * 1024
+
+
+async def read_chunks(source, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes | str]:
+    """
+    Chunks of an asyncio.StreamReader (or anything with an async read) or
+    of an async iterator of bytes.
+    """
+    if hasattr(source, "read"):
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+def _feed(tokenizer: XMLTokenizer, text: str) -> list[FastXMLToken]:
+    tokenizer.feed(text)
+    return list(tokenizer.read_tokens())
+
+
+async def atokenize(
+    source: AsyncIterable[bytes | str],
+    chunk_size: int = CHUNK_SIZE,
+    executor: Executor | None = None,
+    offload_size: int = OFFLOAD_SIZE,
+) -> AsyncIterator[FastXMLToken]:
+    """
+    Tokenize the stream chunk by chunk, the bytes are decoded as UTF-8.
+    The event loop is given back after every chunk, and big chunks are
+    tokenized in the executor when one is given. The executor only gets
+    the text to scan, the tokenizer stays here, so a ProcessPoolExecutor
+    works too.
+    """
+    loop = asyncio.get_running_loop()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    tokenizer = XMLTokenizer()
+    async for chunk in read_chunks(source, chunk_size):
+        text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        if executor is not None and len(text) >= offload_size:
+            buffer = tokenizer.feed_buffer(text)
+            tokens, pos = await loop.run_in_executor(executor, scan, buffer)
+            tokenizer.keep_tail(buffer[pos:])
+        else:
+            tokens = _feed(tokenizer, text)
+        for token in tokens:
+            yield token
+        await asyncio.sleep(0)
+
+    tokenizer.feed(decoder.decode(b"", final=True))
+    tokenizer.close()
+    for token in tokenizer.read_tokens():
+        yield token
+
+
+async def aparse(
+    source: AsyncIterable[bytes | str],
+    schema: CompiledSchema | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    executor: Executor | None = None,
+    offload_size: int = OFFLOAD_SIZE,
+) -> AsyncIterator[tuple[str, str]]:
+    """
+    Yields ("start", tag), ("text", text) and ("end", tag) events. The tags
+    are checked as they arrive, against the schema too when it is given,
+    and XMLParseError is raised on the first error.
+    """
+    validator = StreamingValidator() if schema is None else StreamingXSDValidator(schema)
+    async for token in atokenize(source, chunk_size, executor, offload_size):
+        kind = token.kind
+        if kind == OPENING_TAG:
+            validator.start(token.value)
+            yield "start", token.value
+        elif kind == CLOSING_TAG:
+            validator.end(token.value)
+            yield "end", token.value
+        elif validator.stack:
+            validator.text(token.value)
+            yield "text", token.value
+    validator.close()
+
+
+class AsyncXMLParser:
+    """
+    Builds the XMLTree of an async stream, like XMLBaseValidator.parse().
+    """
+
+    def __init__(
+        self,
+        schema: CompiledSchema | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        executor: Executor | None = None,
+        offload_size: int = OFFLOAD_SIZE,
+    ):
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.offload_size = offload_size
+
+    async def feed_async(self, source: AsyncIterable[bytes | str]) -> "XMLTree":
+        from xml_parser_comp.model.xml_tree import XMLTree
+
+        stack: list[XMLTree] = []
+        pieces: list[list[str]] = []
+        xml_tree = None
+        async for event, value in aparse(
+            source, self.schema, self.chunk_size, self.executor, self.offload_size
+        ):
+            if event == "start":
+                tag = XMLTree(tag=value)
+                if stack:
+                    stack[-1].children.append(tag)
+                else:
+                    xml_tree = tag
+                stack.append(tag)
+                pieces.append([])
+            elif event == "end":
+                tag = stack.pop()
+                text = pieces.pop()
+                if text:
+                    tag.text = " ".join(text)
+            else:
+                pieces[-1].append(value)
+        return xml_tree
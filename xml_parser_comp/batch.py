@@ -0,0 +1,184 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple
+
+from xml_parser_comp.compiled_schema import CompiledSchema
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.exceptions.xsd_error import XSDError
+from xml_parser_comp.mapped_file import close_mapping, map_file
+from xml_parser_comp.streaming_validator import StreamingXSDValidator
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xsd_validator import XSDValidator
+
+BATCH_SIZE = 64
+
+
+class ValidationResult(NamedTuple):
+    index: int
+    valid: bool
+    error: str | None = None
+
+
+class FileResult(NamedTuple):
+    path: str
+    valid: bool
+    error: str | None
+    size: int
+    seconds: float
+
+
+def compile_schema(schema: CompiledSchema | str | bytes | None) -> CompiledSchema | None:
+    if schema is None or isinstance(schema, CompiledSchema):
+        return schema
+    if isinstance(schema, str):
+        xsd_validator = XSDValidator(schema)
+    else:
+        xsd_validator = XSDValidator("", xsd_buffer=schema)
+    xsd_validator.validate()
+    return xsd_validator.compile_schema()
+
+
+def validate_document(
+    index: int, document: str | bytes, schema: CompiledSchema | None
+) -> ValidationResult:
+    if isinstance(document, str):
+        xml_validator = XMLBaseValidator(document)
+    else:
+        xml_validator = XMLBaseValidator.from_bytes(document)
+    try:
+        if schema is None:
+            xml_validator.validate(keep_tokens=False)
+        else:
+            StreamingXSDValidator(schema).validate(xml_validator.iter_tokens())
+    except (XMLParseError, XSDError) as error:
+        return ValidationResult(index, False, str(error))
+    except Exception as error:  # one broken document must not stop the batch
+        return ValidationResult(index, False, f"{type(error).__name__}: {error}")
+    return ValidationResult(index, True)
+
+
+def validate_file(path: str, schema: CompiledSchema | None) -> FileResult:
+    """
+    Validate the file mapped in memory, timing the read and the validation.
+    """
+    start = time.perf_counter()
+    try:
+        buffer = map_file(path)
+    except OSError as error:
+        return FileResult(path, False, f"{type(error).__name__}: {error}", 0, time.perf_counter() - start)
+    try:
+        result = validate_document(0, buffer, schema)
+        size = len(buffer)
+    finally:
+        close_mapping(buffer)
+    return FileResult(path, result.valid, result.error, size, time.perf_counter() - start)
+
+
+_worker_schema: CompiledSchema | None = None
+
+
+def _init_worker(schema: CompiledSchema | None):
+    global _worker_schema
+    _worker_schema = schema
+
+
+def _validate_batch(start: int, documents: list[str | bytes]) -> list[ValidationResult]:
+    return [
+        validate_document(start + offset, document, _worker_schema)
+        for offset, document in enumerate(documents)
+    ]
+
+
+def _validate_file_batch(start: int, paths: list[str]) -> list[FileResult]:
+    return [validate_file(path, _worker_schema) for path in paths]
+
+
+def _batches(documents: Iterable[str | bytes], batch_size: int) -> Iterator[tuple[int, list]]:
+    iterator = iter(documents)
+    start = 0
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield start, batch
+        start += len(batch)
+
+
+def validate_many(
+    documents: Iterable[str | bytes],
+    schema: CompiledSchema | str | bytes | None = None,
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+    ordered: bool = True,
+) -> Iterator[ValidationResult]:
+    """
+    Validate many documents against one schema in a pool of processes.
+    The schema is compiled once and sent once to every worker, the
+    documents are read lazily and sent in batches. Results are yielded in
+    the order of the documents, or as they are done with ordered=False.
+    A document with errors gives a result with valid=False and the message,
+    it does not stop the others.
+    """
+    schema = compile_schema(schema)
+    if (workers or os.cpu_count() or 1) == 1:
+        for index, document in enumerate(documents):
+            yield validate_document(index, document, schema)
+        return
+    yield from _run_pool(_validate_batch, documents, schema, workers, batch_size, ordered)
+
+
+def validate_files(
+    paths: Iterable[str],
+    schema: CompiledSchema | str | bytes | None = None,
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+    ordered: bool = True,
+) -> Iterator[FileResult]:
+    """
+    Like validate_many() for files, only the paths are sent to the workers
+    and every result has the size of the file and the seconds it took.
+    """
+    schema = compile_schema(schema)
+    if (workers or os.cpu_count() or 1) == 1:
+        for path in paths:
+            yield validate_file(path, schema)
+        return
+    yield from _run_pool(_validate_file_batch, paths, schema, workers, batch_size, ordered)
+
+
+def _run_pool(
+    task,
+    items: Iterable,
+    schema: CompiledSchema | None,
+    workers: int | None,
+    batch_size: int,
+    ordered: bool,
+) -> Iterator:
+    """
+    Run task(start, batch) in a pool of processes for the batches of items,
+    with at most two batches per worker waiting.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(schema,)) as executor:
+        batches = _batches(items, batch_size)
+        pending: deque[Future] = deque()
+        for start, batch in islice(batches, max_pending):
+            pending.append(executor.submit(task, start, batch))
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                yield from future.result()
+                for start, batch in islice(batches, 1):
+                    pending.append(executor.submit(task, start, batch))
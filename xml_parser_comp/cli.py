@@ -0,0 +1,149 @@
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import sys
+import time
+from array import array
+from typing import Iterable, Iterator, TextIO
+
+from xml_parser_comp.batch import BATCH_SIZE, FileResult, compile_schema, validate_files
+
+XML_PATTERN = "*.xml"
+
+
+def expand_paths(arguments: Iterable[str], pattern: str = XML_PATTERN) -> Iterator[str]:
+    """
+    Files of the arguments: files as they are, the files matching pattern
+    in directories (recursively) and globs. Paths are found lazily.
+    """
+    for argument in arguments:
+        if os.path.isdir(argument):
+            for directory, _, files in os.walk(argument):
+                for name in sorted(fnmatch.filter(files, pattern)):
+                    yield os.path.join(directory, name)
+        elif glob.has_magic(argument):
+            yield from glob.iglob(argument, recursive=True)
+        else:
+            yield argument
+
+
+def percentile(values: array, percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class Summary:
+    """
+    Counts of the results and the latency of every file.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.invalid = 0
+        self.size = 0
+        self.latencies = array("d")
+        self.start = time.perf_counter()
+
+    def add(self, result: FileResult):
+        self.files += 1
+        self.invalid += not result.valid
+        self.size += result.size
+        self.latencies.append(result.seconds)
+
+    def report(self) -> dict:
+        seconds = time.perf_counter() - self.start
+        return {
+            "files": self.files,
+            "valid": self.files - self.invalid,
+            "invalid": self.invalid,
+            "bytes": self.size,
+            "seconds": seconds,
+            "files_per_s": self.files / seconds if seconds else None,
+            "mb_per_s": self.size / seconds / 1e6 if seconds else None,
+            "p50_ms": percentile(self.latencies, 50) * 1000 if self.files else None,
+            "p99_ms": percentile(self.latencies, 99) * 1000 if self.files else None,
+        }
+
+
+def print_summary(report: dict, output: TextIO):
+    if not report["files"]:
+        print("No files validated", file=output)
+        return
+    print(
+        f"{report['files']} files ({report['valid']} valid, {report['invalid']} invalid) "
+        f"in {report['seconds']:.2f} s: {report['files_per_s']:.1f} files/s, "
+        f"{report['mb_per_s']:.2f} MB/s, latency p50 {report['p50_ms']:.2f} ms, "
+        f"p99 {report['p99_ms']:.2f} ms",
+        file=output,
+    )
+
+
+def validate_command(args: argparse.Namespace) -> int:
+    try:
+        schema = None
+        if args.schema is not None:
+            with open(args.schema, "rb") as file:
+                schema = compile_schema(file.read())
+    # any failure to read or compile it, e.g. a file that is not UTF-8
+    except Exception as error:
+        print(f"Invalid schema {args.schema}: {error}", file=sys.stderr)
+        return 2
+
+    output = sys.stdout if args.output in (None, "-") else open(args.output, "w")
+    summary = Summary()
+    try:
+        paths = expand_paths(args.paths, args.pattern)
+        for result in validate_files(paths, schema, args.jobs, args.batch_size, not args.unordered):
+            summary.add(result)
+            output.write(
+                json.dumps(
+                    {
+                        "path": result.path,
+                        "valid": result.valid,
+                        "error": result.error,
+                        "bytes": result.size,
+                        "seconds": result.seconds,
+                    }
+                )
+                + "\n"
+            )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    report = summary.report()
+    print_summary(report, sys.stderr)
+    if args.summary:
+        with open(args.summary, "w") as file:
+            json.dump(report, file, indent=2)
+    return 1 if summary.invalid else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="xml-parser-comp", description="XML parser component")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser(
+        "validate",
+        help="validate XML files, writing one JSON line per file",
+        description="Validate XML files against an optional XSD schema. One JSON line is written per "
+        "file, and a summary is printed to stderr. Exits with 1 when some file is not valid.",
+    )
+    validate.add_argument("paths", nargs="+", help="files, directories or globs")
+    validate.add_argument("--schema", help="XSD file, compiled once for all the files")
+    validate.add_argument("--jobs", "-j", type=int, help="worker processes, the number of CPUs by default")
+    validate.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="files sent to a worker at once")
+    validate.add_argument("--pattern", default=XML_PATTERN, help="files to validate in directories")
+    validate.add_argument("--output", "-o", help="write the JSON lines to this file instead of stdout")
+    validate.add_argument("--summary", help="also write the summary to this JSON file")
+    validate.add_argument("--unordered", action="store_true", help="write the results as they are done")
+    validate.set_defaults(handler=validate_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+from enum import Enum
+from types import MappingProxyType
+from typing import NamedTuple
+
+from xml_parser_comp.exceptions.xsd_error import XSDError
+
+UNKNOWN_TAG = -1
+START_STATE = 0
+
+
+class Particle(NamedTuple):
+    """
+    One child of a content model, max_occurs None means unbounded.
+    """
+
+    tag_id: int
+    element_id: int
+    min_occurs: int = 1
+    max_occurs: int | None = 1
+
+
+class _Immutable:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class CompiledElement(_Immutable):
+    """
+    An element of the schema with the automaton of its children. In the
+    state s, transitions[s] maps the tag id of the next child to the pair
+    (next state, element id of the child).
+    """
+
+    __slots__ = ("element_id", "name", "tag_id", "type", "transitions", "accepting", "missing")
+
+    def __init__(self, element_id, name, tag_id, type, transitions, accepting, missing):
+        transitions = tuple(MappingProxyType(dict(table)) for table in transitions)
+        for slot, value in zip(
+            self.__slots__,
+            (element_id, name, tag_id, type, transitions, accepting, missing),
+        ):
+            object.__setattr__(self, slot, value)
+
+    def __reduce__(self):
+        transitions = tuple(dict(table) for table in self.transitions)
+        return CompiledElement, (
+            self.element_id, self.name, self.tag_id, self.type, transitions, self.accepting, self.missing
+        )
+
+    @property
+    def is_leaf(self) -> bool:
+        return len(self.transitions) == 1 and not self.transitions[START_STATE]
+
+    def __repr__(self):
+        return f"CompiledElement(name={self.name!r}, type={self.type!r}, states={len(self.transitions)})"
+
+
+def build_sequence_automaton(particles: list[Particle], tag_names: tuple[str, ...]):
+    """
+    Deterministic automaton of a sequence. Every particle is expanded into
+    min_occurs required slots and the optional ones up to max_occurs (or one
+    repeating slot when unbounded). The state is the last slot read, plus one.
+    """
+    slots = []  # (tag_id, element_id, optional, repeat, particle index)
+    for position, particle in enumerate(particles):
+        required = particle.min_occurs
+        if particle.max_occurs is None:
+            count = max(required, 1)
+            for index in range(count):
+                slots.append(
+                    (particle.tag_id, particle.element_id, required == 0, index == count - 1, position)
+                )
+            continue
+        if particle.max_occurs < required:
+            raise XSDError(f"maxOccurs is smaller than minOccurs in {tag_names[particle.tag_id]}")
+        for index in range(particle.max_occurs):
+            slots.append((particle.tag_id, particle.element_id, index >= required, False, position))
+
+    transitions = []
+    accepting = []
+    missing = []
+    for state in range(len(slots) + 1):
+        table = {}
+        positions = {}
+        if state > 0 and slots[state - 1][3]:
+            tag_id, element_id, _, _, position = slots[state - 1]
+            table[tag_id] = (state, element_id)
+            positions[tag_id] = position
+        for index in range(state, len(slots)):
+            tag_id, element_id, optional, _, position = slots[index]
+            if tag_id not in table:
+                table[tag_id] = (index + 1, element_id)
+                positions[tag_id] = position
+            elif positions[tag_id] != position:
+                raise XSDError(f"Content model is ambiguous for {tag_names[tag_id]}")
+            if not optional:
+                break
+        transitions.append(MappingProxyType(table))
+
+        names = tuple(tag_names[slot[0]] for slot in slots[state:] if not slot[2])
+        missing.append(names)
+        if not names:
+            accepting.append(state)
+
+    return tuple(transitions), frozenset(accepting), tuple(missing)
+
+
+class CompiledSchema(_Immutable):
+    """
+    Schema compiled once from the XSDTree of XSDValidator.generate_xsd_tree().
+    Tag names are mapped to integer ids and every element gets the automaton
+    of its children, so the schema is not walked again for each document.
+    It is immutable and can be shared between threads.
+    """
+
+    __slots__ = ("tag_names", "tag_ids", "elements", "root")
+
+    def __init__(self, xsd_tree):
+        tag_names: list[str] = []
+        tag_ids: dict[str, int] = {}
+
+        def tag_id_of(name: str) -> int:
+            if name not in tag_ids:
+                tag_ids[name] = len(tag_names)
+                tag_names.append(name)
+            return tag_ids[name]
+
+        # element ids are given in pre order, the root is 0
+        nodes = []
+        stack = [xsd_tree]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            tag_id_of(node.name)
+            stack.extend(reversed(node.children))
+        element_ids = {id(node): element_id for element_id, node in enumerate(nodes)}
+
+        names = tuple(tag_names)
+        elements = []
+        for element_id, node in enumerate(nodes):
+            particles = [
+                Particle(tag_ids[child.name], element_ids[id(child)]) for child in node.children
+            ]
+            transitions, accepting, missing = build_sequence_automaton(particles, names)
+            type = node.type.value if isinstance(node.type, Enum) else node.type
+            elements.append(
+                CompiledElement(
+                    element_id, node.name, tag_ids[node.name], type, transitions, accepting, missing
+                )
+            )
+
+        object.__setattr__(self, "tag_names", names)
+        object.__setattr__(self, "tag_ids", MappingProxyType(tag_ids))
+        object.__setattr__(self, "elements", tuple(elements))
+        object.__setattr__(self, "root", elements[0])
+
+    def tag_id(self, tag_name: str) -> int:
+        return self.tag_ids.get(tag_name, UNKNOWN_TAG)
+
+    def __reduce__(self):
+        return _restore_schema, (self.tag_names, self.elements)
+
+    def __repr__(self):
+        return f"CompiledSchema(root={self.root.name!r}, elements={len(self.elements)})"
+
+
+def _restore_schema(tag_names: tuple[str, ...], elements: tuple[CompiledElement, ...]) -> CompiledSchema:
+    schema = object.__new__(CompiledSchema)
+    object.__setattr__(schema, "tag_names", tag_names)
+    object.__setattr__(schema, "tag_ids", MappingProxyType({name: index for index, name in enumerate(tag_names)}))
+    object.__setattr__(schema, "elements", elements)
+    object.__setattr__(schema, "root", elements[0])
+    return schema
@@ -0,0 +1,203 @@
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from xml_parser_comp.compiled_schema import START_STATE, UNKNOWN_TAG, CompiledElement, CompiledSchema
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.value_types import LeafValues, tree_texts
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+    from xml_parser_comp.model.xsd_tree import XSDTree
+
+
+class _Entry:
+    """
+    What is known of one node checked against one shape of element: if its
+    own children fit the element (checked), if the whole subtree does
+    (valid), the entries of its children when it was checked and those
+    that have to be visited again (dirty). A shared node has an entry by
+    shape, and the entry one parent entry for every place it is under.
+    """
+
+    __slots__ = ("node", "parents", "element", "shape", "checked", "valid", "children", "dirty")
+
+    def __init__(self, node: "XMLTree", element: CompiledElement, shape: int):
+        self.node = node
+        self.parents: list["_Entry"] = []
+        self.element = element
+        self.shape = shape
+        self.checked = False
+        self.valid = False
+        self.children: list["_Entry"] = []
+        self.dirty: dict[int, "_Entry"] | None = None
+
+
+def element_shapes(schema: CompiledSchema) -> list[int]:
+    """
+    Number of every element of the schema, equal for the elements with the
+    same name, type and content model, so a subtree valid for one of them
+    is valid for all.
+    """
+    shapes = [0] * len(schema.elements)
+    numbers: dict[tuple, int] = {}
+    # the children of an element are numbered after it
+    for element in reversed(schema.elements):
+        key = (
+            element.name,
+            element.type,
+            element.accepting,
+            tuple(
+                tuple((tag_id, step[0], shapes[step[1]]) for tag_id, step in transitions.items())
+                for transitions in element.transitions
+            ),
+        )
+        shapes[element.element_id] = numbers.setdefault(key, len(numbers))
+    return shapes
+
+
+class IncrementalValidator:
+    """
+    Validates an XMLTree against a schema and keeps the result of every
+    subtree, so after editing a few nodes only them and their ancestors are
+    visited again. Call mark_dirty(node) after changing the tag or the
+    children of node, mark_dirty(node, text_only=True) after changing only
+    its text, then validate() again. The values of the leaves are checked
+    by type like in XMLWithXSDValidator.
+    """
+
+    def __init__(self, xml_tree: "XMLTree", xsd_tree: "XSDTree | CompiledSchema"):
+        self.xml_tree = xml_tree
+        self.schema = xsd_tree if isinstance(xsd_tree, CompiledSchema) else CompiledSchema(xsd_tree)
+        self.shapes = element_shapes(self.schema)
+        # id(node) -> shape -> entry, the entry keeps the node so the id is
+        # not reused
+        self.entries: dict[int, dict[int, _Entry]] = {}
+        # nodes checked by the last validate()
+        self.visited = 0
+
+    def validate(self) -> bool:
+        schema = self.schema
+        elements = schema.elements
+        tag_ids = schema.tag_ids
+        root = self.xml_tree
+        if root.tag != schema.root.name:
+            raise XMLParseError(f"Tag {root.tag} is not allowed in this context")
+
+        self.visited = 0
+        # the values of the leaves visited, the others were checked before
+        values = LeafValues(tree_texts, attrgetter("tag"))
+        types = values.types
+        leaves = []
+        # explicit stack of (entry, children done)
+        stack = [(self.entry(root, schema.root), False)]
+        try:
+            while stack:
+                entry, done = stack.pop()
+                if done:
+                    entry.valid = True
+                    entry.dirty = None
+                    continue
+                if entry.valid:
+                    continue
+
+                self.visited += 1
+                if entry.element.type in types and not entry.node.children:
+                    values.leaves[entry.element.type].append(entry.node)
+                    leaves.append(entry.node)
+                if not entry.checked:
+                    node = entry.node
+                    element = entry.element
+                    transitions = element.transitions
+                    state = START_STATE
+                    element_ids = []
+                    for child in node.children:
+                        step = transitions[state].get(tag_ids.get(child.tag, UNKNOWN_TAG))
+                        if step is None:
+                            raise XMLParseError(f"Tag {child.tag} is not allowed in this context")
+                        state = step[0]
+                        element_ids.append(step[1])
+                    if state not in element.accepting:
+                        raise XMLParseError(
+                            f"XML has not this tags: {', '.join(element.missing[state])} in {node.tag}"
+                        )
+                    children = [self.entry(child, elements[element_id]) for child, element_id in zip(node.children, element_ids)]
+                    for child_entry in children:
+                        child_entry.parents.append(entry)
+                    self.release(entry)
+                    entry.children = children
+                    entry.checked = True
+                    entry.dirty = {id(child_entry): child_entry for child_entry in children if not child_entry.valid}
+
+                stack.append((entry, True))
+                if entry.dirty:
+                    stack.extend((child_entry, False) for child_entry in reversed(entry.dirty.values()))
+
+            values.check()
+        except Exception:
+            # the leaves visited are marked valid before their values are
+            # checked, they are visited again by the next validate()
+            for node in leaves:
+                self.mark_dirty(node, text_only=True)
+            raise
+        return True
+
+    def entry(self, node: "XMLTree", element: CompiledElement) -> _Entry:
+        shape = self.shapes[element.element_id]
+        entries = self.entries.setdefault(id(node), {})
+        entry = entries.get(shape)
+        if entry is None or entry.node is not node:
+            # a new entry, an old one may still be waiting on the stack
+            entry = entries[shape] = _Entry(node, element, shape)
+        return entry
+
+    def release(self, entry: _Entry):
+        """
+        Unlinks entry from the entries of its children when it was last
+        checked. Those left without parents are dropped with their subtrees,
+        so the nodes removed from the tree are not kept.
+        """
+        stack = [entry]
+        while stack:
+            entry = stack.pop()
+            children, entry.children = entry.children, []
+            for child_entry in children:
+                child_entry.parents.remove(entry)
+                if not child_entry.parents:
+                    entries = self.entries.get(id(child_entry.node), {})
+                    if entries.get(child_entry.shape) is child_entry:
+                        del entries[child_entry.shape]
+                        if not entries:
+                            del self.entries[id(child_entry.node)]
+                    stack.append(child_entry)
+
+    def mark_dirty(self, node: "XMLTree", text_only: bool = False):
+        """
+        node has to be checked again, and its ancestors visited on the way.
+        Its parents are checked again too, as the tag of node may have
+        changed. Nodes never validated need no mark, but the parent they
+        were added to does. With text_only only the text of node changed,
+        so just its value is checked again, not the children of its parents.
+        """
+        stack = []
+        for entry in self.entries.get(id(node), {}).values():
+            if entry.node is not node:
+                continue
+            if not text_only:
+                entry.checked = False
+                for parent_entry in entry.parents:
+                    parent_entry.checked = False
+            stack.append(entry)
+        # every path to the root, a shared node can have many
+        while stack:
+            entry = stack.pop()
+            entry.valid = False
+            for parent_entry in entry.parents:
+                if parent_entry.dirty is None:
+                    parent_entry.dirty = {}
+                parent_entry.dirty[id(entry)] = entry
+                # the ancestors of an invalid entry were already marked
+                if parent_entry.valid:
+                    stack.append(parent_entry)
+
+    def clear(self):
+        self.entries.clear()
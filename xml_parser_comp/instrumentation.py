@@ -0,0 +1,104 @@
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable
+
+MetricCallback = Callable[[str, float], None]
+
+
+class Instrumentation:
+    """
+    Collects metrics of the validators: seconds spent in each phase
+    (e.g. "xml.tokenize"), and counters like "xml.tokens", "xml.nodes",
+    "xml.max_depth" or "xml.bytes" (characters for str input). Every value
+    recorded is also given to the callbacks as callback(metric, value),
+    phases are given as "<phase>.seconds".
+    """
+
+    enabled = True
+
+    def __init__(self, callbacks: list[MetricCallback] | None = None):
+        self.timings: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.callbacks: list[MetricCallback] = list(callbacks or [])
+
+    def add_callback(self, callback: MetricCallback):
+        self.callbacks.append(callback)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(name, time.perf_counter() - start)
+
+    def record_time(self, name: str, seconds: float):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self._emit(f"{name}.seconds", seconds)
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+        self._emit(name, value)
+
+    def maximum(self, name: str, value: int):
+        if value > self.counters.get(name, 0):
+            self.counters[name] = value
+        self._emit(name, value)
+
+    def report(self) -> dict:
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def reset(self):
+        self.timings.clear()
+        self.counters.clear()
+
+    def _emit(self, metric: str, value: float):
+        for callback in self.callbacks:
+            callback(metric, value)
+
+
+class NullInstrumentation(Instrumentation):
+    """
+    Used when no instrumentation is given, it records nothing. The same
+    instance is shared by every validator, so it takes no callbacks.
+    """
+
+    enabled = False
+
+    def add_callback(self, callback: MetricCallback):
+        raise TypeError("Callbacks need an Instrumentation, the validator was made without one")
+
+    def phase(self, name: str):
+        return nullcontext()
+
+    def record_time(self, name: str, seconds: float):
+        pass
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+    def maximum(self, name: str, value: int):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+def instrumented_phase(name: str):
+    """
+    Time the whole method as the phase name, when the instrumentation of
+    the object is enabled.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.instrumentation.enabled:
+                return method(self, *args, **kwargs)
+            with self.instrumentation.phase(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
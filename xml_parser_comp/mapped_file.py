@@ -0,0 +1,35 @@
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+
+def map_file(path: str | os.PathLike) -> mmap.mmap | bytes:
+    """
+    Map the file read only in memory, the pages are read by the OS only
+    when they are used and stay in the page cache between runs. Close it
+    with close_mapping(), or use mapping().
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # empty files can not be mapped
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def close_mapping(buffer):
+    """
+    Close a buffer of map_file(), the memoryviews of it have to be released
+    before.
+    """
+    if isinstance(buffer, mmap.mmap):
+        buffer.close()
+
+
+@contextmanager
+def mapping(path: str | os.PathLike) -> Iterator[mmap.mmap | bytes]:
+    buffer = map_file(path)
+    try:
+        yield buffer
+    finally:
+        close_mapping(buffer)
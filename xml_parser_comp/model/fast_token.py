@@ -0,0 +1,118 @@
+"""
+Light tokens used inside the tokenizers and validators. They skip the
+pydantic validation of XMLToken and XSDToken, to_model() gives the
+pydantic view when it is needed.
+"""
+
+TEXT = 0
+OPENING_TAG = 1
+CLOSING_TAG = 2
+
+
+class FastXMLToken:
+    __slots__ = ("kind", "value")
+
+    def __init__(self, kind: int, value: str):
+        self.kind = kind
+        self.value = value
+
+    @property
+    def type(self) -> str:
+        return "Text" if self.kind == TEXT else "Tag"
+
+    @property
+    def is_opening_tag(self) -> bool:
+        return self.kind == OPENING_TAG
+
+    @property
+    def is_closing_tag(self) -> bool:
+        return self.kind == CLOSING_TAG
+
+    @property
+    def tag_name(self) -> str | None:
+        return None if self.kind == TEXT else self.value
+
+    @property
+    def text(self) -> str | None:
+        return self.value if self.kind == TEXT else None
+
+    def to_model(self):
+        from xml_parser_comp.model.xml_token import XMLToken
+
+        return XMLToken(
+            type=self.type,
+            is_opening_tag=self.is_opening_tag,
+            is_closing_tag=self.is_closing_tag,
+            tag_name=self.tag_name,
+            text=self.text,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, FastXMLToken):
+            return NotImplemented
+        return self.kind == other.kind and self.value == other.value
+
+    def __repr__(self):
+        return f"FastXMLToken(kind={self.kind}, value={self.value!r})"
+
+
+class SpanXMLToken(FastXMLToken):
+    """
+    Text token that only keeps the (start, end) span of the text in the
+    source, the normalized text is made when value or text is read. The
+    source can also be UTF-8 bytes or a mmap, then the span is in bytes.
+    """
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source, start: int, end: int):
+        self.kind = TEXT
+        self.source = source
+        self.start = start
+        self.end = end
+
+    @property
+    def value(self) -> str:
+        text = self.source[self.start:self.end]
+        if not isinstance(text, str):
+            text = text.decode("utf-8")
+        return text.strip().replace("\n", "")
+
+    def __repr__(self):
+        return f"SpanXMLToken(start={self.start}, end={self.end})"
+
+
+class FastXSDToken:
+    __slots__ = ("name", "attributes", "is_opening_tag", "is_closing_tag")
+
+    def __init__(self, name: str, attributes: dict, is_opening_tag: bool, is_closing_tag: bool):
+        self.name = name
+        self.attributes = attributes
+        self.is_opening_tag = is_opening_tag
+        self.is_closing_tag = is_closing_tag
+
+    def to_model(self):
+        from xml_parser_comp.model.xsd_token import XSDToken
+
+        return XSDToken(
+            name=self.name,
+            attributes=self.attributes,
+            is_opening_tag=self.is_opening_tag,
+            is_closing_tag=self.is_closing_tag,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, FastXSDToken):
+            return NotImplemented
+        return (
+            self.name == other.name
+            and self.attributes == other.attributes
+            and self.is_opening_tag == other.is_opening_tag
+            and self.is_closing_tag == other.is_closing_tag
+        )
+
+    def __repr__(self):
+        return (
+            f"FastXSDToken(name={self.name!r}, attributes={self.attributes!r}, "
+            f"is_opening_tag={self.is_opening_tag}, is_closing_tag={self.is_closing_tag})"
+        )
@@ -0,0 +1,65 @@
+from typing import Iterator
+
+PRE_ORDER = "pre"
+POST_ORDER = "post"
+
+
+class TreeWalk:
+    """
+    Traversal of the tree models with an explicit stack, so deep trees
+    do not reach the recursion limit. Used as a mixin of XMLTree and XSDTree.
+    """
+
+    def walk(self, order: str = PRE_ORDER) -> Iterator[tuple["TreeWalk", int]]:
+        """
+        Yields (node, depth) for every node of the tree, the root has depth 0.
+        """
+        if order == PRE_ORDER:
+            stack = [(self, 0)]
+            while stack:
+                node, depth = stack.pop()
+                yield node, depth
+                stack.extend((child, depth + 1) for child in reversed(node.children))
+        elif order == POST_ORDER:
+            stack = [(self, 0, False)]
+            while stack:
+                node, depth, expanded = stack.pop()
+                if expanded:
+                    yield node, depth
+                    continue
+                stack.append((node, depth, True))
+                stack.extend((child, depth + 1, False) for child in reversed(node.children))
+        else:
+            raise ValueError(f"order should be '{PRE_ORDER}' or '{POST_ORDER}'")
+
+    def iter_nodes(self, order: str = PRE_ORDER) -> Iterator["TreeWalk"]:
+        for node, _ in self.walk(order):
+            yield node
+
+    def to_dict(self) -> dict:
+        """
+        Same result as model_dump(), without recursion.
+        """
+        dumped = {}
+        for node in self.iter_nodes(POST_ORDER):
+            data = node.model_dump(exclude={"children"})
+            data["children"] = [dumped[id(child)] for child in node.children]
+            dumped[id(node)] = data
+        return dumped[id(self)]
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Same result as model_validate(data), without recursion.
+        """
+        root = cls.model_validate({key: value for key, value in data.items() if key != "children"})
+        stack = [(root, data)]
+        while stack:
+            node, node_data = stack.pop()
+            for child_data in node_data.get("children", []):
+                child = cls.model_validate(
+                    {key: value for key, value in child_data.items() if key != "children"}
+                )
+                node.children.append(child)
+                stack.append((child, child_data))
+        return root
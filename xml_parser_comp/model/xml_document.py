@@ -0,0 +1,205 @@
+from array import array
+from typing import Iterator
+
+NO_NODE = -1
+
+
+class XMLDocument:
+    """
+    Flat representation of an XML document. Every element is a node id and
+    the structure is kept in parallel arrays indexed by that id, instead of
+    one XMLTree object and one children list per element. The root is node 0.
+
+    The text of a node is made of pieces, text_starts and text_ends give the
+    range of its pieces and every piece is a span of text_buffer. When
+    normalize_text is set the buffer is the original source and the pieces
+    are only normalized and joined when text() is called. The source can
+    also be UTF-8 bytes or a mmap, the pieces are then decoded in text().
+    """
+
+    def __init__(self):
+        self.tag_names: list[str] = []
+        self.tag_name_ids: dict[str, int] = {}
+        self.parents = array("i")
+        self.first_children = array("i")
+        self.next_siblings = array("i")
+        self.tag_ids = array("i")
+        self.text_starts = array("q")
+        self.text_ends = array("q")
+        self.piece_starts = array("q")
+        self.piece_ends = array("q")
+        self.text_buffer = ""
+        self.normalize_text = False
+
+    def __len__(self) -> int:
+        return len(self.tag_ids)
+
+    @property
+    def root(self) -> int:
+        return 0 if len(self) else NO_NODE
+
+    def tag_id(self, tag_name: str) -> int:
+        return self.tag_name_ids.get(tag_name, NO_NODE)
+
+    def tag(self, node: int) -> str:
+        return self.tag_names[self.tag_ids[node]]
+
+    def text_spans(self, node: int) -> list[tuple[int, int]]:
+        return [
+            (self.piece_starts[piece], self.piece_ends[piece])
+            for piece in range(self.text_starts[node], self.text_ends[node])
+        ]
+
+    def text(self, node: int) -> str:
+        buffer = self.text_buffer
+        pieces = [buffer[start:end] for start, end in self.text_spans(node)]
+        if not isinstance(buffer, str):
+            pieces = [piece.decode("utf-8") for piece in pieces]
+        if self.normalize_text:
+            pieces = [piece.strip().replace("\n", "") for piece in pieces]
+        return " ".join(pieces)
+
+    def texts(self, nodes: list[int]) -> list[str]:
+        """
+        text() of many nodes, the texts of one piece are read straight
+        from the columns.
+        """
+        buffer = self.text_buffer
+        decode = not isinstance(buffer, str)
+        normalize = self.normalize_text
+        text_starts = self.text_starts
+        text_ends = self.text_ends
+        piece_starts = self.piece_starts
+        piece_ends = self.piece_ends
+        texts = []
+        for node in nodes:
+            piece = text_starts[node]
+            if text_ends[node] - piece != 1:
+                texts.append(self.text(node))
+                continue
+            text = buffer[piece_starts[piece]:piece_ends[piece]]
+            if decode:
+                text = text.decode("utf-8")
+            if normalize:
+                text = text.strip().replace("\n", "")
+            texts.append(text)
+        return texts
+
+    def parent(self, node: int) -> int:
+        return self.parents[node]
+
+    def first_child(self, node: int) -> int:
+        return self.first_children[node]
+
+    def next_sibling(self, node: int) -> int:
+        return self.next_siblings[node]
+
+    def children(self, node: int) -> Iterator[int]:
+        child = self.first_children[node]
+        while child != NO_NODE:
+            yield child
+            child = self.next_siblings[child]
+
+    def view(self, column: str) -> memoryview:
+        """
+        Zero copy view of one of the arrays, e.g. view("parents").
+        """
+        return memoryview(getattr(self, column))
+
+    def to_xml_tree(self, node: int = 0):
+        """
+        Build the XMLTree of the node, only when it is asked for.
+        """
+        from xml_parser_comp.model.xml_tree import XMLTree
+
+        xml_tree = XMLTree(tag=self.tag(node), text=self.text(node))
+        stack = [(node, xml_tree)]
+        while stack:
+            parent_node, parent_tree = stack.pop()
+            for child in self.children(parent_node):
+                child_tree = XMLTree(tag=self.tag(child), text=self.text(child))
+                parent_tree.children.append(child_tree)
+                stack.append((child, child_tree))
+        return xml_tree
+
+
+class XMLDocumentBuilder:
+    """
+    Builds an XMLDocument from start/text/end events. The text pieces of a
+    node are kept until the node is closed, so they are stored together.
+    Given the source, text spans are stored instead of copies of the text.
+    """
+
+    def __init__(self, source=None):
+        self.document = XMLDocument()
+        self.source = source
+        self._stack: list[int] = []
+        self._last_children = array("i")
+        self._pieces: list[list[str | tuple[int, int]]] = []
+        self._texts: list[str] = []
+        self._offset = 0
+
+    def start(self, tag_name: str) -> int:
+        document = self.document
+        tag_id = document.tag_name_ids.get(tag_name)
+        if tag_id is None:
+            tag_id = document.tag_name_ids[tag_name] = len(document.tag_names)
+            document.tag_names.append(tag_name)
+
+        node = len(document.tag_ids)
+        parent = self._stack[-1] if self._stack else NO_NODE
+        document.parents.append(parent)
+        document.first_children.append(NO_NODE)
+        document.next_siblings.append(NO_NODE)
+        document.tag_ids.append(tag_id)
+        document.text_starts.append(0)
+        document.text_ends.append(0)
+        self._last_children.append(NO_NODE)
+
+        if parent != NO_NODE:
+            last_child = self._last_children[parent]
+            if last_child == NO_NODE:
+                document.first_children[parent] = node
+            else:
+                document.next_siblings[last_child] = node
+            self._last_children[parent] = node
+
+        self._stack.append(node)
+        self._pieces.append([])
+        return node
+
+    def text(self, text: str):
+        if self._pieces:
+            self._pieces[-1].append(text)
+
+    def text_span(self, start: int, end: int):
+        if self._pieces:
+            self._pieces[-1].append((start, end))
+
+    def end(self) -> int:
+        document = self.document
+        node = self._stack.pop()
+        pieces = self._pieces.pop()
+        if pieces:
+            document.text_starts[node] = len(document.piece_starts)
+            for piece in pieces:
+                if isinstance(piece, tuple):
+                    start, end = piece
+                else:
+                    start = self._offset
+                    end = self._offset = start + len(piece)
+                    self._texts.append(piece)
+                document.piece_starts.append(start)
+                document.piece_ends.append(end)
+            document.text_ends[node] = len(document.piece_starts)
+        return node
+
+    def close(self) -> XMLDocument:
+        if self.source is not None:
+            self.document.text_buffer = self.source
+            self.document.normalize_text = True
+        else:
+            self.document.text_buffer = "".join(self._texts)
+        self._texts = []
+        self._last_children = array("i")
+        return self.document
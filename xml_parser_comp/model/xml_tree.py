@@ -1,12 +1,98 @@
+from typing import TYPE_CHECKING
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 
+from xml_parser_comp.model.tree_walk import TreeWalk
 
-class XMLTree(BaseModel):
+if TYPE_CHECKING:
+    from xml_parser_comp.tree_index import TreeIndex
+
+
+class NodeList(list):
+    """
+    Children of an XMLTree. It keeps the TreeIndex built over the tree, and
+    any change to the list invalidates it.
+    """
+
+    __slots__ = ("tree_index",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.tree_index: "TreeIndex | None" = None
+
+    def __reduce__(self):
+        # the index is not copied or pickled with the tree
+        return NodeList, (list(self),)
+
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+
+    def mutator(self, *args, **kwargs):
+        if self.tree_index is not None:
+            self.tree_index.invalidate()
+        return method(self, *args, **kwargs)
+
+    mutator.__name__ = name
+    return mutator
+
+
+for _name in (
+    "append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+):
+    setattr(NodeList, _name, _invalidating(_name))
+
+
+class XMLTree(TreeWalk, BaseModel):
     """
     XMLTree represents the structure of an XML document.
     """
 
     tag: str
     text: str = ""
-    children: list['XMLTree'] = []
+    children: list['XMLTree'] = Field(default_factory=NodeList)
+
+    @field_validator("children")
+    @classmethod
+    def node_list(cls, children: list['XMLTree']) -> NodeList:
+        return children if type(children) is NodeList else NodeList(children)
+
+    def __setattr__(self, name, value):
+        if name == "children" and type(value) is not NodeList:
+            value = NodeList(value)
+        # children is a plain list in trees made by model_construct()
+        index = getattr(self.children, "tree_index", None)
+        if index is not None:
+            index.invalidate()
+        super().__setattr__(name, value)
+
+    def clear(self):
+        """
+        Remove the text and the children, e.g. of the elements already
+        read with iterparse().
+        """
+        self.text = ""
+        self.children.clear()
+
+    def tree_index(self) -> "TreeIndex":
+        """
+        Index of the tree, built on the first query and again after a
+        change. A node of an indexed tree uses the index of the whole tree.
+        """
+        from xml_parser_comp.tree_index import TreeIndex
+
+        index = getattr(self.children, "tree_index", None)
+        if index is None or not index.valid:
+            index = TreeIndex(self)
+        return index
+
+    def find_all(self, path: str) -> list['XMLTree']:
+        """
+        Nodes selected by the path from this node, e.g. item/name,
+        .//name, /catalog/item[2] or //item[last()], see TreeIndex.
+        """
+        return self.tree_index().find_all(path, self)
+
+    def find(self, path: str) -> 'XMLTree | None':
+        return self.tree_index().find(path, self)
@@ -1,14 +1,10 @@
-from enum import Enum
 from pydantic import BaseModel
 
-class XSDElementTypeAttribute(Enum):
-    STRING = "xs:string"
-    INTEGER = "xs:integer"
-    COMPLEX_TYPE = "xs:complexType"
-    SEQUENCE = "xs:sequence"
+from xml_parser_comp.model.tree_walk import TreeWalk
+from xml_parser_comp.model.xsd_types import XSDElementTypeAttribute
 
 
-class XSDTree(BaseModel):
+class XSDTree(TreeWalk, BaseModel):
     name: str
     type: XSDElementTypeAttribute | None = None
     children: list["XSDTree"] = []
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class XSDElementTypeAttribute(Enum):
+    STRING = "xs:string"
+    INTEGER = "xs:integer"
+    COMPLEX_TYPE = "xs:complexType"
+    SEQUENCE = "xs:sequence"
+
+    # members are compared by identity, the hash of Enum is in Python and
+    # the validators hash a type per leaf
+    __hash__ = object.__hash__
@@ -0,0 +1,301 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+from xml_parser_comp.compiled_schema import START_STATE, UNKNOWN_TAG, CompiledSchema
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.mapped_file import map_file, mapping
+from xml_parser_comp.streaming_validator import StreamingValidator, StreamingXSDValidator
+from xml_parser_comp.xml_base_validator import XMLBaseValidator
+from xml_parser_comp.xml_tokenizer import BYTES_TAG_PATTERN, TAG_PATTERN, tokenize_string
+from xml_parser_comp.xml_with_xsd_validator import XMLWithXSDValidator
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+
+# characters (or bytes) of records sent to a worker in one task
+BATCH_SIZE = 1024 * 1024
+
+
+class Record(NamedTuple):
+    index: int
+    tag: str
+    start: int
+    end: int
+
+
+class RecordSplit(NamedTuple):
+    root: str
+    # texts directly inside the root, between the records
+    texts: list[str]
+    records: list[Record]
+
+
+def _root_texts(source: str | bytes, start: int, end: int) -> list[str]:
+    text = source[start:end]
+    if not isinstance(text, str):
+        text = text.decode("utf-8")
+    return [token.text for token in tokenize_string(text) if not token.is_opening_tag and not token.is_closing_tag]
+
+
+def split_records(source: str | bytes) -> RecordSplit:
+    """
+    Find the children of the root element with a scan of the tags only.
+    The tags are checked like in XMLBaseValidator.parse(), with the same
+    errors, so the records found are balanced.
+    """
+    pattern = TAG_PATTERN if isinstance(source, str) else BYTES_TAG_PATTERN
+    names: dict = {}
+
+    def name_of(raw) -> str:
+        name = names.get(raw)
+        if name is None:
+            name = names[raw] = raw if isinstance(raw, str) else raw.decode("utf-8")
+        return name
+
+    stack = []
+    root = None
+    texts: list[str] = []
+    records: list[Record] = []
+    record_start = text_start = 0
+    for match in pattern.finditer(source):
+        slash, raw_name = match.groups()
+        if not slash:
+            if not stack:
+                if root is not None:
+                    raise XMLParseError("There should be only one root element")
+                root = name_of(raw_name)
+                text_start = match.end()
+            elif len(stack) == 1:
+                texts.extend(_root_texts(source, text_start, match.start()))
+                record_start = match.start()
+            stack.append(raw_name)
+            continue
+
+        if not stack:
+            raise XMLParseError(f"Tag '{name_of(raw_name)}' is not opened")
+        if raw_name != stack[-1]:
+            raise XMLParseError(f"{name_of(stack[-1])} is not closed")
+        stack.pop()
+        if len(stack) == 1:
+            records.append(Record(len(records), name_of(raw_name), record_start, match.end()))
+            text_start = match.end()
+        elif not stack:
+            texts.extend(_root_texts(source, text_start, match.start()))
+
+    if stack:
+        raise XMLParseError(f"Tag '{name_of(stack[-1])}' is not closed")
+    if root is None:
+        raise XMLParseError("There should be only one root element")
+    return RecordSplit(root, texts, records)
+
+
+def parse_record(
+    source: str | bytes,
+    start: int,
+    end: int,
+    schema: CompiledSchema | None,
+    element_id: int,
+    keep_tree: bool = True,
+) -> "XMLTree | None":
+    """
+    Tree of the record, checked against the element of the schema. Without
+    keep_tree the tokens are only streamed through a validator.
+    """
+    data = source[start:end]
+    xml_validator = XMLBaseValidator(data) if isinstance(data, str) else XMLBaseValidator.from_bytes(data)
+    if not keep_tree:
+        if schema is None:
+            StreamingValidator().validate(xml_validator.iter_tokens())
+        else:
+            StreamingXSDValidator(schema, schema.elements[element_id]).validate(xml_validator.iter_tokens())
+        return None
+    xml_tree = xml_validator.parse()
+    if schema is not None:
+        XMLWithXSDValidator(xml_tree, schema).validate_compiled_tag(xml_tree, schema.elements[element_id])
+    return xml_tree
+
+
+_worker_schema: CompiledSchema | None = None
+_worker_buffer = None
+
+
+def _init_worker(schema: CompiledSchema | None, path: str | None):
+    # the pool lives as long as one parse, the mapping is freed with the
+    # worker process at its end
+    global _worker_schema, _worker_buffer
+    _worker_schema = schema
+    _worker_buffer = map_file(path) if path is not None else None
+
+
+def _parse_batch(
+    chunk: str | bytes | None, offset: int, records: list[tuple[int, int, int]], keep_trees: bool
+) -> tuple[list["XMLTree"], str | None]:
+    """
+    The trees of the records until the first error (none without
+    keep_trees), and the error. Without chunk the records are read from
+    the file of the worker.
+    """
+    source = _worker_buffer if chunk is None else chunk
+    trees = []
+    try:
+        for start, end, element_id in records:
+            xml_tree = parse_record(source, start - offset, end - offset, _worker_schema, element_id, keep_trees)
+            if keep_trees:
+                trees.append(xml_tree)
+    except XMLParseError as error:
+        return trees, str(error)
+    return trees, None
+
+
+def _root_steps(split: RecordSplit, schema: CompiledSchema | None) -> tuple[list[int], XMLParseError | None]:
+    """
+    Element of every record in the content model of the root, until the
+    first record not allowed, and the error at the end of the root if any.
+    """
+    if schema is None:
+        return [0] * len(split.records), None
+    if split.root != schema.root.name:
+        raise XMLParseError(f"Tag {split.root} is not allowed in this context")
+
+    transitions = schema.root.transitions
+    tag_ids = schema.tag_ids
+    state = START_STATE
+    element_ids = []
+    for record in split.records:
+        step = transitions[state].get(tag_ids.get(record.tag, UNKNOWN_TAG))
+        if step is None:
+            return element_ids, XMLParseError(f"Tag {record.tag} is not allowed in this context")
+        state = step[0]
+        element_ids.append(step[1])
+    if state not in schema.root.accepting:
+        return element_ids, XMLParseError(
+            f"XML has not this tags: {', '.join(schema.root.missing[state])} in {split.root}"
+        )
+    return element_ids, None
+
+
+def _batches(
+    records: list[Record], element_ids: list[int], batch_size: int
+) -> Iterator[tuple[int, int, list[tuple[int, int, int]]]]:
+    """
+    (start, end, records) of consecutive records of about batch_size.
+    """
+    batch: list[tuple[int, int, int]] = []
+    for record, element_id in zip(records, element_ids):
+        batch.append((record.start, record.end, element_id))
+        if record.end - batch[0][0] >= batch_size:
+            yield batch[0][0], batch[-1][1], batch
+            batch = []
+    if batch:
+        yield batch[0][0], batch[-1][1], batch
+
+
+def iter_records(
+    source: str | bytes | os.PathLike,
+    schema: CompiledSchema | None = None,
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+    split: RecordSplit | None = None,
+    keep_trees: bool = True,
+) -> Iterator["XMLTree"]:
+    """
+    Parse, and validate against the schema, the children of the root in a
+    pool of processes, yielding their trees in order. The errors are the
+    ones XMLBaseValidator.parse() and XMLWithXSDValidator.validate() would
+    raise, and they are raised after the records before them.
+    A path is mapped once in every worker, so only offsets are sent to
+    them, the mappings are closed when the parse ends. With
+    keep_trees=False nothing is yielded and the workers send back only the
+    errors.
+    """
+    if not isinstance(source, os.PathLike):
+        yield from _iter_records(source, None, schema, workers, batch_size, split, keep_trees)
+        return
+    with mapping(source) as buffer:
+        yield from _iter_records(buffer, os.fspath(source), schema, workers, batch_size, split, keep_trees)
+
+
+def _iter_records(
+    source: str | bytes,
+    path: str | None,
+    schema: CompiledSchema | None,
+    workers: int | None,
+    batch_size: int,
+    split: RecordSplit | None,
+    keep_trees: bool,
+) -> Iterator["XMLTree"]:
+    """
+    iter_records() of a source already read, path is the file the workers
+    map instead of receiving the chunks.
+    """
+    if split is None:
+        split = split_records(source)
+    element_ids, error = _root_steps(split, schema)
+    workers = workers or os.cpu_count() or 1
+
+    batches = _batches(split.records, element_ids, batch_size)
+    if workers == 1:
+        for start, end, records in batches:
+            for record_start, record_end, element_id in records:
+                xml_tree = parse_record(source, record_start, record_end, schema, element_id, keep_trees)
+                if keep_trees:
+                    yield xml_tree
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(schema, path)) as executor:
+
+            def submit(batch):
+                start, end, records = batch
+                chunk = None if path is not None else source[start:end]
+                return executor.submit(_parse_batch, chunk, 0 if chunk is None else start, records, keep_trees)
+
+            pending: deque[Future] = deque(submit(batch) for batch in islice(batches, workers * 2))
+            while pending:
+                trees, message = pending.popleft().result()
+                yield from trees
+                if message is not None:
+                    raise XMLParseError(message)
+                for batch in islice(batches, 1):
+                    pending.append(submit(batch))
+
+    if error is not None:
+        raise error
+
+
+def parse_parallel(
+    source: str | bytes | os.PathLike,
+    schema: CompiledSchema | None = None,
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> "XMLTree":
+    """
+    Same XMLTree as XMLBaseValidator.parse() for a document made of many
+    records under one root, see iter_records().
+    """
+    from xml_parser_comp.model.xml_tree import XMLTree
+
+    if not isinstance(source, os.PathLike):
+        split = split_records(source)
+        children = list(_iter_records(source, None, schema, workers, batch_size, split, True))
+        return XMLTree(tag=split.root, text=" ".join(split.texts), children=children)
+    # mapped once here, the records are read from the same mapping
+    with mapping(source) as buffer:
+        split = split_records(buffer)
+        children = list(_iter_records(buffer, os.fspath(source), schema, workers, batch_size, split, True))
+    return XMLTree(tag=split.root, text=" ".join(split.texts), children=children)
+
+
+def validate_parallel(
+    source: str | bytes | os.PathLike,
+    schema: CompiledSchema | None = None,
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> bool:
+    """
+    Like parse_parallel() without sending the trees back from the workers.
+    """
+    for _ in iter_records(source, schema, workers, batch_size, keep_trees=False):
+        pass
+    return True
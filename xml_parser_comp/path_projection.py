@@ -0,0 +1,141 @@
+from typing import Iterable, Iterator, NamedTuple
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.xml_tokenizer import BYTES_TAG_PATTERN, TAG_PATTERN
+
+START_STATE = 0
+# no path can match below an element in this state
+DEAD_STATE = -1
+ANY_NAME = "*"
+
+
+class PathStep(NamedTuple):
+    name: str
+    # // before the step, the element can be at any depth
+    descendant: bool = False
+
+
+def parse_path(path: str) -> tuple[PathStep, ...]:
+    """
+    Steps of an absolute path like /note/body/magia, a step can be * for
+    any element and // allows any elements in between.
+    """
+    if not path.startswith("/"):
+        raise ValueError(f"Path {path} should start with /")
+    steps = []
+    descendant = False
+    for name in path[1:].split("/"):
+        if not name:
+            if descendant:
+                raise ValueError(f"Path {path} is not valid")
+            descendant = True
+            continue
+        steps.append(PathStep(name, descendant))
+        descendant = False
+    if descendant or not steps:
+        raise ValueError(f"Path {path} is not valid")
+    return tuple(steps)
+
+
+class PathMatcher:
+    """
+    Paths compiled into an automaton run on the open tags. A state is a set
+    of (path, steps matched), numbered when it is first reached, and the
+    transitions are cached, so after a few records a tag costs one lookup.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = [parse_path(path) for path in paths]
+        start = frozenset((path, 0) for path in range(len(self.paths)))
+        self.state_sets: list[frozenset] = [start]
+        self.state_ids: dict[frozenset, int] = {start: START_STATE, frozenset(): DEAD_STATE}
+        # (state, tag name) -> (next state, matched)
+        self.transitions: dict[tuple[int, str], tuple[int, bool]] = {}
+
+    def step(self, state: int, tag_name: str) -> tuple[int, bool]:
+        """
+        State below an element opened in state, and if the element is
+        selected by one of the paths.
+        """
+        if state == DEAD_STATE:
+            return DEAD_STATE, False
+        key = (state, tag_name)
+        transition = self.transitions.get(key)
+        if transition is None:
+            transition = self.transitions[key] = self._step(state, tag_name)
+        return transition
+
+    def _step(self, state: int, tag_name: str) -> tuple[int, bool]:
+        paths = self.paths
+        next_set = set()
+        matched = False
+        for path, position in self.state_sets[state]:
+            step = paths[path][position]
+            if step.descendant:
+                next_set.add((path, position))
+            if step.name == ANY_NAME or step.name == tag_name:
+                if position + 1 == len(paths[path]):
+                    matched = True
+                else:
+                    next_set.add((path, position + 1))
+        next_set = frozenset(next_set)
+        next_state = self.state_ids.get(next_set)
+        if next_state is None:
+            next_state = self.state_ids[next_set] = len(self.state_sets)
+            self.state_sets.append(next_set)
+        return next_state, matched
+
+
+def select_spans(source: str | bytes, matcher: PathMatcher) -> Iterator[tuple[int, int]]:
+    """
+    (start, end) of the elements selected by the matcher in a string or
+    UTF-8 bytes, with a scan of the tags only. The tags are checked like in
+    XMLBaseValidator.parse(), with the same errors.
+    """
+    pattern = TAG_PATTERN if isinstance(source, str) else BYTES_TAG_PATTERN
+    names: dict = {}
+
+    def name_of(raw) -> str:
+        name = names.get(raw)
+        if name is None:
+            name = names[raw] = raw if isinstance(raw, str) else raw.decode("utf-8")
+        return name
+
+    stack = []
+    # matcher state of the open elements, until the selected one
+    states = [START_STATE]
+    root_found = False
+    # depth of the selected element being read
+    selected = 0
+    start = 0
+    for match in pattern.finditer(source):
+        slash, raw_name = match.groups()
+        if not slash:
+            if not stack:
+                if root_found:
+                    raise XMLParseError("There should be only one root element")
+                root_found = True
+            stack.append(raw_name)
+            if not selected:
+                state, matched = matcher.step(states[-1], name_of(raw_name))
+                states.append(state)
+                if matched:
+                    selected = len(stack)
+                    start = match.start()
+            continue
+
+        if not stack:
+            raise XMLParseError(f"Tag '{name_of(raw_name)}' is not opened")
+        if raw_name != stack[-1]:
+            raise XMLParseError(f"{name_of(stack[-1])} is not closed")
+        if selected == len(stack):
+            yield start, match.end()
+            selected = 0
+        stack.pop()
+        if not selected:
+            states.pop()
+
+    if stack:
+        raise XMLParseError(f"Tag '{name_of(stack[-1])}' is not closed")
+    if not root_found:
+        raise XMLParseError("There should be only one root element")
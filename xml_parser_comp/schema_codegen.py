@@ -0,0 +1,329 @@
+"""
+Validation functions generated for one schema, like fastjsonschema does for
+JSON schemas. The schema is turned into Python source with one straight-line
+block per element: the number of children is checked once, then the tag of
+every child, so no automaton or XSDTree node is looked up while validating.
+The source is compiled once and cached by the hash of the schema.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from enum import Enum
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.value_types import VALUE_TYPES, LeafValues, ValueColumn, tree_texts
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+    from xml_parser_comp.model.xsd_tree import XSDTree
+    from xml_parser_comp.xsd_validator import SchemaNode
+
+# elements checked inline in one generated function, the children left
+# when it is full get a function of their own
+FUNCTION_SIZE = 2000
+# levels of elements inlined in one generated function
+INLINE_DEPTH = 64
+# leaves of the same type checked in a loop instead of one by one
+RUN_SIZE = 8
+CACHE_SIZE = 32
+
+
+def _not_allowed(tag: str) -> XMLParseError:
+    return XMLParseError(f"Tag {tag} is not allowed in this context")
+
+
+def _missing(names, tag: str) -> XMLParseError:
+    return XMLParseError(f"XML has not this tags: {', '.join(names)} in {tag}")
+
+
+def _partial(node: "XMLTree", expected: tuple):
+    """
+    Raises the error of a node with a wrong number of children. Its subtree
+    is checked first, so the error is the one XMLWithXSDValidator raises.
+    expected holds (name, expected of the child) for every child.
+    """
+    # explicit stack of [xml tag, expected, index of the next child]
+    stack = [[node, expected, 0]]
+    while stack:
+        frame = stack[-1]
+        node, expected, index = frame
+        children = node.children
+        while index < len(children):
+            child = children[index]
+            if index >= len(expected):
+                raise _not_allowed(child.tag)
+            name, child_expected = expected[index]
+            index += 1
+            if child.tag != name:
+                raise _not_allowed(child.tag)
+            if child.children:
+                if not child_expected:
+                    raise _not_allowed(child.children[0].tag)
+                break
+            if child_expected:
+                raise _missing([name for name, _ in child_expected], child.tag)
+        else:
+            if len(children) < len(expected):
+                raise _missing([name for name, _ in expected[len(children):]], node.tag)
+            stack.pop()
+            continue
+
+        frame[2] = index
+        stack.append([child, child_expected, 0])
+
+
+def _type_name(type) -> str | None:
+    return type.value if isinstance(type, Enum) else type
+
+
+def schema_hash(xsd_tree: "XSDTree | SchemaNode", convert_values: bool = False) -> str:
+    digest = hashlib.sha256(b"convert" if convert_values else b"check")
+    stack = [xsd_tree]
+    while stack:
+        node = stack.pop()
+        digest.update(f"{node.name}\0{_type_name(node.type)}\0{len(node.children)}\n".encode("utf-8"))
+        stack.extend(reversed(node.children))
+    return digest.hexdigest()
+
+
+class _SourceWriter:
+    """
+    Source of the generated functions. Elements with the same name, type
+    and children share a shape and its code, e.g. the records of a list are
+    checked in a loop. A failed check calls _partial() to raise the right
+    error, so every child costs a single check.
+    """
+
+    def __init__(self, xsd_tree: "XSDTree | SchemaNode", types: tuple[str, ...]):
+        self.types = types
+        # (name, column, shapes of the children) -> shape
+        shapes: dict[tuple, int] = {}
+        self.names: list[str] = []
+        # index of the column of values of the leaves, or None
+        self.columns: list[int | None] = []
+        self.children: list[tuple[int, ...]] = []
+        # elements with the shape
+        self.counts: list[int] = []
+        # the expected children of every shape, for _partial()
+        self.expected: list[tuple] = []
+        # tag names of the runs of leaves checked in a loop
+        self.run_names: list[tuple[str, ...]] = []
+
+        node_shapes: dict[int, int] = {}
+        # shapes are found in post-order, explicit stack of (node, visited)
+        stack = [(xsd_tree, False)]
+        while stack:
+            node, visited = stack.pop()
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+                continue
+            type_name = _type_name(node.type)
+            column = types.index(type_name) if type_name in types and not node.children else None
+            children = tuple(node_shapes[id(child)] for child in node.children)
+            key = (node.name, column, children)
+            shape = shapes.get(key)
+            if shape is None:
+                shape = shapes[key] = len(self.names)
+                self.names.append(node.name)
+                self.columns.append(column)
+                self.children.append(children)
+                self.counts.append(0)
+                self.expected.append(tuple((self.names[child], self.expected[child]) for child in children))
+            self.counts[shape] += 1
+            node_shapes[id(node)] = shape
+        self.root = node_shapes[id(xsd_tree)]
+
+        self.params = "".join(f", v{index}" for index in range(len(types)))
+        self.lines: list[str] = []
+
+    def source(self) -> str:
+        pending = [self.root]
+        generated = {self.root}
+        while pending:
+            self.function(pending.pop(), pending, generated)
+        return "\n".join(self.lines) + "\n"
+
+    def function(self, root: int, pending: list[int], generated: set[int]):
+        add = self.lines.append
+        add(f"def {'validate' if root == self.root else f'_s{root}'}(node{self.params}):")
+        for index in range(len(self.types)):
+            add(f"    a{index} = v{index}.append")
+        if root == self.root:
+            add(f"    if node.tag != {self.names[root]!r}:")
+            add("        raise _not_allowed(node.tag)")
+            if not self.children[root]:
+                add("    if node.children:")
+                add("        raise _not_allowed(node.children[0].tag)")
+                if self.columns[root] is not None:
+                    add(f"    a{self.columns[root]}(node)")
+        budget = FUNCTION_SIZE
+
+        # explicit stack of [shape, level, index of the next child, indent],
+        # the node of a level is in the variable node or child{level - 1}
+        self.header("node", root, 0, 1)
+        stack = [[root, 0, 0, 1]] if self.children[root] else []
+        while stack:
+            frame = stack[-1]
+            shape, level, index, indent = frame
+            pad = "    " * indent
+            parent = "node" if level == 0 else f"child{level - 1}"
+            failed = f"_partial({parent}, _expected[{shape}])"
+            children = self.children[shape]
+            variable = f"child{level}"
+            while index < len(children):
+                child = children[index]
+                end = index + 1
+                if not self.children[child]:
+                    column = self.columns[child]
+                    while end < len(children) and not self.children[children[end]] and self.columns[children[end]] == column:
+                        end += 1
+                    if end - index >= RUN_SIZE:
+                        self.run(shape, index, end, level, indent, failed)
+                    else:
+                        end = index + 1
+                        add(f"{pad}{variable} = children{level}[{index}]")
+                        add(f"{pad}if {variable}.tag != {self.names[child]!r} or {variable}.children:")
+                        add(f"{pad}    {failed}")
+                        if column is not None:
+                            add(f"{pad}a{column}({variable})")
+                    budget -= 1
+                    index = end
+                    continue
+
+                while end < len(children) and children[end] == child:
+                    end += 1
+                body = indent
+                if end - index == 1:
+                    add(f"{pad}{variable} = children{level}[{index}]")
+                else:
+                    add(f"{pad}for {variable} in {self.slice(shape, index, end, level)}:")
+                    body += 1
+                add(f"{'    ' * body}if {variable}.tag != {self.names[child]!r}:")
+                add(f"{'    ' * body}    {failed}")
+                budget -= 1
+                # a shape used elsewhere too gets a function of its own
+                inline = self.counts[child] == end - index and budget > 0 and level + 1 < INLINE_DEPTH
+                index = end
+                if inline:
+                    self.header(variable, child, level + 1, body)
+                    break
+                add(f"{'    ' * body}_s{child}({variable}{self.params})")
+                if child not in generated:
+                    generated.add(child)
+                    pending.append(child)
+            else:
+                stack.pop()
+                continue
+
+            frame[2] = index
+            stack.append([child, level + 1, 0, body])
+        add("")
+
+    def slice(self, shape: int, start: int, end: int, level: int) -> str:
+        if end - start == len(self.children[shape]):
+            return f"children{level}"
+        return f"children{level}[{start}:{end}]"
+
+    def header(self, variable: str, shape: int, level: int, indent: int):
+        if not self.children[shape]:
+            return
+        add = self.lines.append
+        pad = "    " * indent
+        add(f"{pad}children{level} = {variable}.children")
+        add(f"{pad}if len(children{level}) != {len(self.children[shape])}:")
+        add(f"{pad}    _partial({variable}, _expected[{shape}])")
+
+    def run(self, shape: int, start: int, end: int, level: int, indent: int, failed: str):
+        """
+        Loop over a run of leaves with the same type instead of one check
+        per leaf, it keeps the source small for wide schemas.
+        """
+        add = self.lines.append
+        pad = "    " * indent
+        children = self.children[shape]
+        names = len(self.run_names)
+        self.run_names.append(tuple(self.names[child] for child in children[start:end]))
+        variable = f"child{level}"
+        run = self.slice(shape, start, end, level)
+        add(f"{pad}for {variable}, name in zip({run}, _names[{names}]):")
+        add(f"{pad}    if {variable}.tag != name or {variable}.children:")
+        add(f"{pad}        {failed}")
+        column = self.columns[children[start]]
+        if column is not None:
+            add(f"{pad}v{column}.extend({run})")
+
+
+class GeneratedValidator:
+    """
+    Validation of XMLTree documents against one schema with a function
+    generated from its XSDTree. It checks the same things as
+    XMLWithXSDValidator, with the same errors. The leaves of the types
+    that need it are collected while validating and checked by type, see
+    value_types.
+    """
+
+    def __init__(self, xsd_tree: "XSDTree | SchemaNode", convert_values: bool = False):
+        self.convert_values = convert_values
+        self.key = schema_hash(xsd_tree, convert_values)
+        self.types: tuple[str, ...] = tuple(
+            name for name, value_type in VALUE_TYPES.items() if convert_values or value_type.check_texts
+        )
+        writer = _SourceWriter(xsd_tree, self.types)
+        self.source = writer.source()
+        namespace = {
+            "_not_allowed": _not_allowed,
+            "_partial": _partial,
+            "_expected": writer.expected,
+            "_names": writer.run_names,
+        }
+        exec(compile(self.source, f"<schema {self.key[:12]}>", "exec"), namespace)
+        self.function: Callable = namespace["validate"]
+
+    def validate(self, xml_tree: "XMLTree") -> bool:
+        self.validate_values(xml_tree)
+        return True
+
+    def validate_values(self, xml_tree: "XMLTree") -> dict[str, ValueColumn]:
+        """
+        Validates and returns the converted values by type when the
+        validator was generated with convert_values.
+        """
+        columns = tuple([] for _ in self.types)
+        self.function(xml_tree, *columns)
+        values = LeafValues(tree_texts, attrgetter("tag"), self.convert_values)
+        for name, column in zip(self.types, columns):
+            if column:
+                values.leaves[name] = column
+        return values.check()
+
+
+_validators: OrderedDict[str, GeneratedValidator] = OrderedDict()
+_lock = threading.Lock()
+
+
+def generate_validator(xsd_tree: "XSDTree | SchemaNode", convert_values: bool = False) -> GeneratedValidator:
+    """
+    GeneratedValidator of the schema, the last CACHE_SIZE are kept by the
+    hash of the schema so the source is generated and compiled only once.
+    """
+    key = schema_hash(xsd_tree, convert_values)
+    with _lock:
+        validator = _validators.get(key)
+        if validator is not None:
+            _validators.move_to_end(key)
+            return validator
+
+    validator = GeneratedValidator(xsd_tree, convert_values)
+    with _lock:
+        _validators[key] = validator
+        while len(_validators) > CACHE_SIZE:
+            _validators.popitem(last=False)
+    return validator
+
+
+def clear_cache():
+    with _lock:
+        _validators.clear()
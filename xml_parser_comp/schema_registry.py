@@ -0,0 +1,133 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from xml_parser_comp.compiled_schema import CompiledSchema
+from xml_parser_comp.xsd_validator import XSDValidator
+
+CACHE_FORMAT_VERSION = 1
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    disk_hits: int
+    maxsize: int
+    currsize: int
+
+
+def schema_hash(xsd: str | bytes) -> str:
+    if isinstance(xsd, str):
+        xsd = xsd.encode("utf-8")
+    return hashlib.sha256(xsd).hexdigest()
+
+
+class SchemaRegistry:
+    """
+    Cache of validated and compiled schemas keyed by the hash of the XSD
+    content. At most maxsize schemas are kept in memory, the least recently
+    used is evicted first. With cache_dir the compiled schemas are also
+    written to disk, so new processes can load them instead of parsing.
+    The files are unpickled, so cache_dir has to be a trusted directory.
+    """
+
+    def __init__(self, maxsize: int = 32, cache_dir: str | os.PathLike | None = None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self._schemas: OrderedDict[str, CompiledSchema] = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, xsd: str | bytes) -> CompiledSchema:
+        key = schema_hash(xsd)
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._schemas.move_to_end(key)
+                self.hits += 1
+                return schema
+            self.misses += 1
+
+        schema = self._load(key)
+        if schema is None:
+            schema = self.compile(xsd)
+            self._store(key, schema)
+        else:
+            with self._lock:
+                self.disk_hits += 1
+
+        with self._lock:
+            self._schemas[key] = schema
+            self._schemas.move_to_end(key)
+            while len(self._schemas) > self.maxsize:
+                self._schemas.popitem(last=False)
+                self.evictions += 1
+        return schema
+
+    def compile(self, xsd: str | bytes) -> CompiledSchema:
+        if isinstance(xsd, str):
+            xsd_validator = XSDValidator(xsd)
+        else:
+            xsd_validator = XSDValidator("", xsd_buffer=xsd)
+        xsd_validator.validate()
+        return xsd_validator.compile_schema()
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, self.disk_hits, self.maxsize, len(self._schemas)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._schemas.clear()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.schema")
+
+    def _load(self, key: str) -> CompiledSchema | None:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                version, schema = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # broken, or of classes renamed or moved since, it is a miss
+            self._remove(path)
+            return None
+        if version != CACHE_FORMAT_VERSION or not isinstance(schema, CompiledSchema):
+            self._remove(path)
+            return None
+        return schema
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _store(self, key: str, schema: CompiledSchema):
+        if self.cache_dir is None:
+            return
+        # write to a temporary file first, so readers never see half a file
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                pickle.dump((CACHE_FORMAT_VERSION, schema), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self._path(key))
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
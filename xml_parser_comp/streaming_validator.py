@@ -0,0 +1,142 @@
+from typing import Iterable
+
+from xml_parser_comp.compiled_schema import START_STATE, UNKNOWN_TAG, CompiledElement, CompiledSchema
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.model.fast_token import CLOSING_TAG, OPENING_TAG, TEXT, FastXMLToken
+from xml_parser_comp.value_types import VALUE_TYPES
+
+
+class StreamingValidator:
+    """
+    Checks that the tags are balanced and that there is one root element
+    while the tokens arrive, keeping only the names of the open tags. A
+    successful close() resets it for the next document, reset() does it
+    after an error.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.stack: list[str] = []
+        self.root_found = False
+
+    def start(self, tag_name: str):
+        if not self.stack:
+            if self.root_found:
+                raise XMLParseError("There should be only one root element")
+            self.root_found = True
+        self.stack.append(tag_name)
+
+    def end(self, tag_name: str):
+        if not self.stack:
+            raise XMLParseError(f"Tag '{tag_name}' is not opened")
+        if tag_name != self.stack[-1]:
+            raise XMLParseError(f"{self.stack[-1]} is not closed")
+        self.stack.pop()
+
+    def text(self, text: str):
+        pass
+
+    def close(self) -> bool:
+        if self.stack:
+            raise XMLParseError(f"Tag '{self.stack[-1]}' is not closed")
+        if not self.root_found:
+            raise XMLParseError("There should be only one root element")
+        self.reset()
+        return True
+
+    def validate(self, tokens: Iterable[FastXMLToken]) -> bool:
+        for token in tokens:
+            kind = token.kind
+            if kind == OPENING_TAG:
+                self.start(token.value)
+            elif kind == CLOSING_TAG:
+                self.end(token.value)
+        return self.close()
+
+
+class StreamingXSDValidator(StreamingValidator):
+    """
+    Validates the tokens against a CompiledSchema as they arrive, without
+    building an XMLTree. Only a stack of (element, state) is kept, one entry
+    per open element, and the first error is raised on the tag that causes it.
+    The root element is checked against root, the root of the schema by
+    default. The text of the open leaves whose type is checked is kept
+    too; an invalid value is raised by close(), as XMLWithXSDValidator
+    checks the values once the structure is valid.
+    """
+
+    def __init__(self, schema: CompiledSchema, root: CompiledElement | None = None):
+        self.schema = schema
+        self.root = schema.root if root is None else root
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self.states: list[list] = []
+        # text pieces of every open element, None when it is not checked
+        self.pieces: list[list[str] | None] = []
+        self.value_error: XMLParseError | None = None
+
+    def start(self, tag_name: str):
+        super().start(tag_name)
+        if not self.states:
+            if tag_name != self.root.name:
+                raise XMLParseError(f"Tag {tag_name} is not allowed in this context")
+            self.states.append([self.root, START_STATE])
+            self.pieces.append(self._pieces(self.root))
+            return
+
+        entry = self.states[-1]
+        step = entry[0].transitions[entry[1]].get(self.schema.tag_ids.get(tag_name, UNKNOWN_TAG))
+        if step is None:
+            raise XMLParseError(f"Tag {tag_name} is not allowed in this context")
+        entry[1] = step[0]
+        element = self.schema.elements[step[1]]
+        self.states.append([element, START_STATE])
+        # only the leaves are checked
+        self.pieces[-1] = None
+        self.pieces.append(self._pieces(element))
+
+    @staticmethod
+    def _pieces(element: CompiledElement) -> list[str] | None:
+        value_type = VALUE_TYPES.get(element.type)
+        return [] if value_type is not None and value_type.check_texts else None
+
+    def text(self, text: str):
+        if self.pieces and self.pieces[-1] is not None:
+            self.pieces[-1].append(text)
+
+    def validate(self, tokens: Iterable[FastXMLToken]) -> bool:
+        pieces = self.pieces
+        for token in tokens:
+            kind = token.kind
+            if kind == OPENING_TAG:
+                self.start(token.value)
+            elif kind == CLOSING_TAG:
+                self.end(token.value)
+            # the text of span tokens is only made for the checked leaves
+            elif kind == TEXT and pieces and pieces[-1] is not None:
+                pieces[-1].append(token.value)
+        return self.close()
+
+    def end(self, tag_name: str):
+        super().end(tag_name)
+        element, state = self.states.pop()
+        if state not in element.accepting:
+            raise XMLParseError(
+                f"XML has not this tags: {', '.join(element.missing[state])} in {tag_name}"
+            )
+        pieces = self.pieces.pop()
+        if pieces is not None and self.value_error is None:
+            text = " ".join(pieces)
+            if VALUE_TYPES[element.type].first_invalid([text]) is not None:
+                self.value_error = XMLParseError(f"Value '{text}' is not a valid {element.type} in {tag_name}")
+
+    def close(self) -> bool:
+        value_error = self.value_error
+        super().close()
+        if value_error is not None:
+            raise value_error
+        return True
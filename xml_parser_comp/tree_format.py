@@ -0,0 +1,381 @@
+"""
+Binary format of the trees, all numbers are little endian:
+
+    header      magic, version, kind, node count, string count, text size
+    strings     int64 offsets (string count + 1) in the string blob
+    parents, first children, next siblings, name ids
+                int32 per node, padded to 8 bytes
+    values      XSD: int32 per node, -1 without type, else string id of the
+                type * 2, + 1 when it is a XSDElementTypeAttribute
+                XML: int64 offsets (node count + 1) in the text blob
+    string blob UTF-8 tag names (and types), padded to 8 bytes
+    text blob   UTF-8 texts of the nodes
+
+Nodes are numbered in pre-order, the root is node 0.
+"""
+import gc
+import operator
+import os
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING
+
+from xml_parser_comp.mapped_file import close_mapping, map_file, mapping
+from xml_parser_comp.model.xml_document import NO_NODE, XMLDocument
+from xml_parser_comp.model.xsd_types import XSDElementTypeAttribute
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+    from xml_parser_comp.model.xsd_tree import XSDTree
+
+
+MAGIC = b"XPCT"
+FORMAT_VERSION = 1
+XML_KIND = 0
+XSD_KIND = 1
+HEADER = struct.Struct("<4sHBxIIQ")
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _column(values, typecode: str) -> bytes:
+    column = array(typecode, values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    data = column.tobytes()
+    return data + bytes(_padded(len(data)) - len(data))
+
+
+def _number_nodes(tree: "XMLTree | XSDTree") -> tuple[list, list[int], list[int], list[int]]:
+    """
+    Nodes in pre-order with their parent, first child and next sibling.
+    """
+    nodes = []
+    parents = []
+    stack = [(tree, NO_NODE)]
+    while stack:
+        node, parent = stack.pop()
+        nodes.append(node)
+        parents.append(parent)
+        number = len(nodes) - 1
+        stack.extend((child, number) for child in reversed(node.children))
+
+    first_children = [NO_NODE] * len(nodes)
+    next_siblings = [NO_NODE] * len(nodes)
+    last_children = [NO_NODE] * len(nodes)
+    for node, parent in enumerate(parents):
+        if parent == NO_NODE:
+            continue
+        if last_children[parent] == NO_NODE:
+            first_children[parent] = node
+        else:
+            next_siblings[last_children[parent]] = node
+        last_children[parent] = node
+    return nodes, parents, first_children, next_siblings
+
+
+def _type_value(type: XSDElementTypeAttribute | str | None, strings: dict[str, int]) -> int:
+    if type is None:
+        return NO_NODE
+    if isinstance(type, XSDElementTypeAttribute):
+        return strings.setdefault(type.value, len(strings)) * 2 + 1
+    return strings.setdefault(type, len(strings)) * 2
+
+
+def dump_tree(tree: "XMLTree | XSDTree | XMLDocument") -> bytes:
+    from xml_parser_comp.model.xsd_tree import XSDTree
+
+    if isinstance(tree, XMLDocument):
+        tree = tree.to_xml_tree()
+    nodes, parents, first_children, next_siblings = _number_nodes(tree)
+    kind = XSD_KIND if isinstance(tree, XSDTree) else XML_KIND
+
+    strings: dict[str, int] = {}
+    names = [strings.setdefault(node.name if kind == XSD_KIND else node.tag, len(strings)) for node in nodes]
+    if kind == XSD_KIND:
+        values = [_type_value(node.type, strings) for node in nodes]
+        value_column = _column(values, "i")
+        text_blob = b""
+    else:
+        texts = [node.text.encode("utf-8") for node in nodes]
+        offsets = [0]
+        for text in texts:
+            offsets.append(offsets[-1] + len(text))
+        value_column = _column(offsets, "q")
+        text_blob = b"".join(texts)
+
+    encoded = [string.encode("utf-8") for string in strings]
+    string_offsets = [0]
+    for string in encoded:
+        string_offsets.append(string_offsets[-1] + len(string))
+    string_blob = b"".join(encoded)
+
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, FORMAT_VERSION, kind, len(nodes), len(strings), len(text_blob)),
+            _column(string_offsets, "q"),
+            _column(parents, "i"),
+            _column(first_children, "i"),
+            _column(next_siblings, "i"),
+            _column(names, "i"),
+            value_column,
+            string_blob + bytes(_padded(len(string_blob)) - len(string_blob)),
+            text_blob,
+        ]
+    )
+
+
+def write_tree(tree: "XMLTree | XSDTree | XMLDocument", path: str | os.PathLike):
+    with open(path, "wb") as file:
+        file.write(dump_tree(tree))
+
+
+class _Reader:
+    """
+    Zero copy views of the sections of a buffer in the tree format.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer)
+        # every view made, released by release()
+        self.views: list[memoryview] = [self.buffer]
+        try:
+            self.read()
+        except Exception:
+            self.release()
+            raise
+
+    def read(self):
+        if len(self.buffer) < HEADER.size:
+            raise ValueError("Not a tree file")
+        magic, version, kind, nodes, strings, text_size = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a tree file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported tree format version {version}")
+        self.kind = kind
+        self.nodes = nodes
+        self.offset = HEADER.size
+
+        string_offsets = self.column("q", strings + 1)
+        self.parents = self.column("i", nodes)
+        self.first_children = self.column("i", nodes)
+        self.next_siblings = self.column("i", nodes)
+        self.names = self.column("i", nodes)
+        self.values = self.column("i" if kind == XSD_KIND else "q", nodes if kind == XSD_KIND else nodes + 1)
+        string_blob = self.section(string_offsets[-1])
+        self.strings = [
+            str(string_blob[string_offsets[index]:string_offsets[index + 1]], "utf-8")
+            for index in range(strings)
+        ]
+        self.texts = self.section(text_size)
+        self.check()
+
+    def check(self):
+        """
+        The ids of the columns are checked once when the file is read, so a
+        corrupt file raises ValueError instead of an IndexError later. Each
+        check is one pass of min(), max() or all() over a column, there is
+        no Python loop by node.
+        """
+        nodes = self.nodes
+        if nodes == 0:
+            raise ValueError("Tree file has no nodes")
+        if min(self.names) < 0 or max(self.names) >= len(self.strings):
+            raise ValueError("Tag id out of range in tree file")
+        # nodes are numbered in pre-order, every parent comes before its children
+        parents = self.parents
+        if parents[0] != NO_NODE or (
+            nodes > 1 and (min(parents[1:]) < 0 or not all(map(operator.lt, parents[1:], range(1, nodes))))
+        ):
+            raise ValueError("Parent id out of range in tree file")
+        for column in (self.first_children, self.next_siblings):
+            if min(column) < NO_NODE or max(column) >= nodes:
+                raise ValueError("Node id out of range in tree file")
+        if self.kind == XSD_KIND:
+            if any(value != NO_NODE and not 0 <= value // 2 < len(self.strings) for value in self.values):
+                raise ValueError("Type id out of range in tree file")
+        else:
+            # every node is a span of the text blob, in order
+            offsets = self.values
+            if offsets[0] < 0 or offsets[-1] > len(self.texts):
+                raise ValueError("Text offset out of range in tree file")
+            if not all(map(operator.le, offsets[:-1], offsets[1:])):
+                raise ValueError("Text offsets out of order in tree file")
+
+    def section(self, size: int) -> memoryview:
+        view = self.buffer[self.offset:self.offset + size]
+        self.views.append(view)
+        if len(view) != size:
+            raise ValueError("Truncated tree file")
+        self.offset += _padded(size)
+        return view
+
+    def column(self, typecode: str, length: int):
+        view = self.section(length * array(typecode).itemsize)
+        if sys.byteorder == "little":
+            view = view.cast(typecode)
+            self.views.append(view)
+            return view
+        column = array(typecode, view.tobytes())
+        column.byteswap()
+        return column
+
+    def release(self):
+        """
+        Release the views, so a mmap under them can be closed.
+        """
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+
+
+class MappedXMLDocument(XMLDocument):
+    """
+    XMLDocument read from a buffer in the tree format, e.g. a mmap. The
+    columns are views of the buffer, the texts are decoded when read.
+    close() releases the views, and closes the mapping of read_xml().
+    """
+
+    def __init__(self, buffer, mapping=None):
+        reader = _Reader(buffer)
+        if reader.kind != XML_KIND:
+            reader.release()
+            raise ValueError("The tree file has no XML tree")
+        self.reader = reader
+        self.mapping = mapping
+        self.tag_names = reader.strings
+        self.tag_name_ids = {name: tag_id for tag_id, name in enumerate(reader.strings)}
+        self.parents = reader.parents
+        self.first_children = reader.first_children
+        self.next_siblings = reader.next_siblings
+        self.tag_ids = reader.names
+        self.text_offsets = reader.values
+        self.text_buffer = reader.texts
+        self.normalize_text = False
+
+    def close(self):
+        self.reader.release()
+        if self.mapping is not None:
+            close_mapping(self.mapping)
+            self.mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def text_spans(self, node: int) -> list[tuple[int, int]]:
+        start, end = self.text_offsets[node], self.text_offsets[node + 1]
+        return [(start, end)] if start != end else []
+
+    def text(self, node: int) -> str:
+        return str(self.text_buffer[self.text_offsets[node]:self.text_offsets[node + 1]], "utf-8")
+
+    def texts(self, nodes: list[int]) -> list[str]:
+        text_buffer = self.text_buffer
+        text_offsets = self.text_offsets
+        return [str(text_buffer[text_offsets[node]:text_offsets[node + 1]], "utf-8") for node in nodes]
+
+    def subtree_end(self, node: int) -> int:
+        """
+        Number after the last node of the subtree of node, the next sibling
+        of node or of its closest ancestor that has one.
+        """
+        while node != NO_NODE:
+            if self.next_siblings[node] != NO_NODE:
+                return self.next_siblings[node]
+            node = self.parents[node]
+        return len(self)
+
+    def to_xml_tree(self, node: int = 0) -> "XMLTree":
+        """
+        The nodes are numbered in pre-order, so the subtree of node is a
+        range of nodes and every parent is made before its children. The
+        data was checked when it was read, so the models are made without
+        validation, like model_construct() does but without its per field
+        loop. The garbage collector is paused meanwhile, the new nodes
+        make no cycles and it would only scan them again and again.
+        """
+        from xml_parser_comp.model.xml_tree import NodeList, XMLTree
+
+        new = XMLTree.__new__
+        set_attribute = object.__setattr__
+        append = list.append
+        tag_names = self.tag_names
+        end = self.subtree_end(node)
+
+        trees: list["XMLTree"] = []
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for tag_id, parent, text in zip(self.tag_ids[node:end], self.parents[node:end], self.texts(range(node, end))):
+                tree = new(XMLTree)
+                set_attribute(tree, "__dict__", {"tag": tag_names[tag_id], "text": text, "children": NodeList()})
+                set_attribute(tree, "__pydantic_fields_set__", {"tag", "text", "children"})
+                set_attribute(tree, "__pydantic_extra__", None)
+                set_attribute(tree, "__pydantic_private__", None)
+                if trees:
+                    append(trees[parent - node].children, tree)
+                trees.append(tree)
+        finally:
+            if collecting:
+                gc.enable()
+        return trees[0]
+
+
+def load_xml(buffer) -> MappedXMLDocument:
+    return MappedXMLDocument(buffer)
+
+
+def load_xsd(buffer) -> "XSDTree":
+    reader = _Reader(buffer)
+    try:
+        return _xsd_tree(reader)
+    finally:
+        reader.release()
+
+
+def _xsd_tree(reader: _Reader) -> "XSDTree":
+    from xml_parser_comp.model.xsd_tree import XSDTree
+
+    if reader.kind != XSD_KIND:
+        raise ValueError("The tree file has no XSD tree")
+    types = []
+    for value in reader.values:
+        if value == NO_NODE:
+            types.append(None)
+        elif value % 2:
+            types.append(XSDElementTypeAttribute(reader.strings[value // 2]))
+        else:
+            types.append(reader.strings[value // 2])
+    trees = [XSDTree(name=reader.strings[reader.names[node]]) for node in range(reader.nodes)]
+    # set after validation, like generate_xsd_tree() does for "sequence"
+    for tree, type in zip(trees, types):
+        tree.type = type
+    # parents are numbered before their children
+    for node in range(1, reader.nodes):
+        trees[reader.parents[node]].children.append(trees[node])
+    return trees[0]
+
+
+def read_xml(path: str | os.PathLike) -> MappedXMLDocument:
+    """
+    The document of a tree file mapped in memory, close() it (or use it
+    with with) once it is not needed anymore.
+    """
+    buffer = map_file(path)
+    try:
+        return MappedXMLDocument(buffer, buffer)
+    except Exception:
+        close_mapping(buffer)
+        raise
+
+
+def read_xsd(path: str | os.PathLike) -> "XSDTree":
+    with mapping(path) as buffer:
+        return load_xsd(buffer)
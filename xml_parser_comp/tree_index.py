@@ -0,0 +1,262 @@
+import re
+from bisect import bisect_left
+from typing import TYPE_CHECKING, NamedTuple
+
+from xml_parser_comp.model.xml_tree import NodeList
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+
+ANY_NAME = "*"
+# position of [last()]
+LAST = -1
+# path id of the parent of the root
+DOCUMENT_PATH = 0
+STEP_PATTERN = re.compile(r"(\*|[^\[\]/]+)(?:\[(\d+|last\(\))\])?")
+
+
+class QueryStep(NamedTuple):
+    name: str
+    # // before the step, the element can be at any depth
+    descendant: bool = False
+    # [n] (from 1) or [last()] among the elements of the step with the
+    # same parent
+    position: int | None = None
+
+
+def parse_query(path: str) -> tuple[bool, tuple[QueryStep, ...]]:
+    """
+    Steps of a path like item/name, .//name, /catalog/item[2]/name or
+    //item[last()]. A step can be * for any element. An absolute path
+    starts at the node queried, as if it was the root of the document.
+    """
+    if path == ".":
+        return False, ()
+    absolute = path.startswith("/")
+    parts = path[1:].split("/") if absolute else path.split("/")
+    if not absolute and parts[0] == ".":
+        parts = parts[1:]
+    steps = []
+    descendant = False
+    for part in parts:
+        if not part:
+            if descendant:
+                raise ValueError(f"Path {path} is not valid")
+            descendant = True
+            continue
+        match = STEP_PATTERN.fullmatch(part)
+        if match is None or match.group(2) == "0":
+            raise ValueError(f"Path {path} is not valid")
+        name, position = match.groups()
+        if position is not None:
+            position = LAST if position == "last()" else int(position)
+        steps.append(QueryStep(name, descendant, position))
+        descendant = False
+    if descendant or not steps:
+        raise ValueError(f"Path {path} is not valid")
+    return absolute, tuple(steps)
+
+
+class TreeIndex:
+    """
+    Index of an XMLTree: the nodes numbered in pre-order with their parent,
+    the end of their subtree, the nodes of every tag name and the id of the
+    path of tag names from the root. Queries use ranges of numbers instead
+    of walking the tree. The children lists of the nodes keep the index,
+    a change to any of them or to a node invalidates it.
+    """
+
+    def __init__(self, root: "XMLTree"):
+        self.root = root
+        self.valid = True
+        self.nodes: list["XMLTree"] = []
+        self.parents: list[int] = []
+        # (path id of the parent, tag name) -> path id
+        self.path_keys: dict[tuple[int, str], int] = {}
+        self.path_ids: list[int] = []
+        self.by_path: dict[int, list[int]] = {}
+        self.by_tag: dict[str, list[int]] = {}
+
+        stack = [(root, -1, DOCUMENT_PATH)]
+        while stack:
+            node, parent, parent_path = stack.pop()
+            number = len(self.nodes)
+            path_id = self.path_keys.setdefault((parent_path, node.tag), len(self.path_keys) + 1)
+            self.nodes.append(node)
+            self.parents.append(parent)
+            self.path_ids.append(path_id)
+            self.by_path.setdefault(path_id, []).append(number)
+            self.by_tag.setdefault(node.tag, []).append(number)
+            stack.extend((child, number, path_id) for child in reversed(node.children))
+
+        # the subtree of a node is the range of numbers [node, end)
+        self.ends = list(range(1, len(self.nodes) + 1))
+        for number in range(len(self.nodes) - 1, 0, -1):
+            parent = self.parents[number]
+            if self.ends[number] > self.ends[parent]:
+                self.ends[parent] = self.ends[number]
+
+        self.numbers: dict[int, int] = {}
+        for number, node in enumerate(self.nodes):
+            self.numbers.setdefault(id(node), number)
+            if type(node.children) is not NodeList:
+                # a node made by XMLTree.model_construct()
+                node.children = NodeList(node.children)
+            index = node.children.tree_index
+            if index is not None and index is not self:
+                # the node was in another tree, it would miss the changes
+                index.invalidate()
+            node.children.tree_index = self
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def invalidate(self):
+        if not self.valid:
+            return
+        self.valid = False
+        # the stale tables are kept by the nodes until the next index
+        self.nodes = []
+        self.numbers = {}
+        self.by_path = {}
+        self.by_tag = {}
+
+    def number(self, node: "XMLTree") -> int:
+        number = self.numbers.get(id(node))
+        if number is None or self.nodes[number] is not node:
+            raise ValueError(f"Node {node.tag} is not in the index")
+        return number
+
+    def parent(self, node: "XMLTree") -> "XMLTree | None":
+        parent = self.parents[self.number(node)]
+        return self.nodes[parent] if parent != -1 else None
+
+    def path(self, node: "XMLTree") -> str:
+        names = []
+        number = self.number(node)
+        while number != -1:
+            names.append(self.nodes[number].tag)
+            number = self.parents[number]
+        return "/" + "/".join(reversed(names))
+
+    def find_all(self, path: str, node: "XMLTree | None" = None) -> list["XMLTree"]:
+        """
+        Nodes selected by the path from node (the root by default), in
+        document order.
+        """
+        nodes = self.nodes
+        return [nodes[number] for number in self.select(path, node)]
+
+    def find(self, path: str, node: "XMLTree | None" = None) -> "XMLTree | None":
+        selected = self.select(path, node)
+        return self.nodes[selected[0]] if selected else None
+
+    def select(self, path: str, node: "XMLTree | None" = None) -> list[int]:
+        absolute, steps = parse_query(path)
+        ends = self.ends
+        number = 0 if node is None else self.number(node)
+        context, first = self._select_path(number, absolute, steps)
+        for step_number in range(first, len(steps)):
+            step = steps[step_number]
+            if not step.descendant and step.name != ANY_NAME and len(context) > 1:
+                selected = self._children_of(context, step)
+                if selected is not None:
+                    context = selected
+                    continue
+            document = absolute and step_number == 0
+            selected = []
+            # end of the last subtree searched, the contexts inside it
+            # would select the same nodes again
+            covered = -1
+            for number in context:
+                if step.descendant:
+                    if number < covered:
+                        continue
+                    covered = ends[number]
+                selected.extend(self._step(number, step, document))
+            context = sorted(set(selected)) if len(context) > 1 else selected
+        return context
+
+    def _select_path(self, number: int, absolute: bool, steps: tuple[QueryStep, ...]) -> tuple[list[int], int]:
+        """
+        Nodes selected by the first steps while they are only tag names,
+        found by the id of their path, and the number of steps done.
+        """
+        path_id = self.path_ids[number]
+        if absolute:
+            parent = self.parents[number]
+            path_id = self.path_ids[parent] if parent != -1 else DOCUMENT_PATH
+        done = 0
+        for step in steps:
+            if step.descendant or step.name == ANY_NAME or step.position is not None:
+                break
+            path_id = self.path_keys.get((path_id, step.name))
+            if path_id is None:
+                return [], len(steps)
+            done += 1
+        if not done:
+            return [number], 0
+        candidates = self.by_path[path_id]
+        start = number if absolute else number + 1
+        return candidates[bisect_left(candidates, start):bisect_left(candidates, self.ends[number])], done
+
+    def _children_of(self, context: list[int], step: QueryStep) -> list[int] | None:
+        """
+        Children with the tag of the step of many nodes at once, filtering
+        the nodes of the tag by parent. None when there are too many of
+        them for the size of the context.
+        """
+        candidates = self.by_tag.get(step.name, [])
+        if len(candidates) > len(context) * 16:
+            return None
+        parents = set(context)
+        selected = [child for child in candidates if self.parents[child] in parents]
+        if step.position is None:
+            return selected
+        return self._positions(selected, step.position)
+
+    def _step(self, number: int, step: QueryStep, document: bool) -> list[int]:
+        """
+        Nodes selected by one step from the node number, or from the parent
+        of the node when it is queried as a document.
+        """
+        ends = self.ends
+        if document:
+            start, end = number, ends[number] if step.descendant else number + 1
+        else:
+            start, end = number + 1, ends[number]
+
+        if step.descendant or document:
+            candidates = self.by_tag.get(step.name, []) if step.name != ANY_NAME else None
+            if candidates is None:
+                selected = list(range(start, end))
+            else:
+                selected = candidates[bisect_left(candidates, start):bisect_left(candidates, end)]
+        elif step.name != ANY_NAME:
+            # the children with this tag are the nodes of the subtree with
+            # the path of the node and the tag
+            path_id = self.path_keys.get((self.path_ids[number], step.name))
+            candidates = self.by_path.get(path_id, [])
+            selected = candidates[bisect_left(candidates, start):bisect_left(candidates, end)]
+        else:
+            selected = []
+            child = start
+            while child < end:
+                selected.append(child)
+                child = ends[child]
+
+        if step.position is None:
+            return selected
+        return self._positions(selected, step.position)
+
+    def _positions(self, selected: list[int], position: int) -> list[int]:
+        groups: dict[int, list[int]] = {}
+        for child in selected:
+            groups.setdefault(self.parents[child], []).append(child)
+        picked = []
+        for group in groups.values():
+            if position == LAST:
+                picked.append(group[-1])
+            elif position <= len(group):
+                picked.append(group[position - 1])
+        return sorted(picked)
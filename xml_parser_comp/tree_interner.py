@@ -0,0 +1,53 @@
+import sys
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+
+
+class InternReport(NamedTuple):
+    total_nodes: int
+    unique_nodes: int
+    unique_texts: int
+
+    @property
+    def shared_nodes(self) -> int:
+        return self.total_nodes - self.unique_nodes
+
+
+class TreeInterner:
+    """
+    Hash-consing of XMLTree nodes: tag names and texts are interned and
+    subtrees with the same tag, text and children are the same object.
+    An interner can be given to several generate_xml_tree() calls to share
+    the nodes between documents. The nodes are shared, so the trees made
+    with it must not be modified.
+    """
+
+    def __init__(self):
+        # (tag, text, ids of the children) -> node, the children are
+        # interned before their parent so their identity is enough
+        self.nodes: dict[tuple, "XMLTree"] = {}
+        self.texts: dict[str, str] = {}
+        self.total_nodes = 0
+
+    def text(self, text: str) -> str:
+        return self.texts.setdefault(text, text)
+
+    def node(self, tag: str, text: str, children: list["XMLTree"]) -> "XMLTree":
+        from xml_parser_comp.model.xml_tree import XMLTree
+
+        self.total_nodes += 1
+        key = (tag, text, *map(id, children))
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = XMLTree(tag=sys.intern(tag), text=self.text(text), children=children)
+        return node
+
+    def report(self) -> InternReport:
+        return InternReport(self.total_nodes, len(self.nodes), len(self.texts))
+
+    def clear(self):
+        self.nodes.clear()
+        self.texts.clear()
+        self.total_nodes = 0
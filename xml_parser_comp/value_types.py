@@ -0,0 +1,122 @@
+import re
+from collections import defaultdict
+from enum import Enum
+from operator import attrgetter
+from typing import Callable
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.model.xsd_types import XSDElementTypeAttribute
+
+INTEGER_PATTERN = re.compile(r"[+-]?[0-9]+")
+# the texts of a column joined by "\n", each followed by it
+INTEGER_COLUMN_PATTERN = re.compile(r"(?:[+-]?[0-9]+\n)*")
+
+
+class ValueType:
+    """
+    Checks and conversion of the texts of the leaves of one type, done on
+    the whole column of texts at once.
+    """
+
+    name: str = ""
+    # False when every text is valid, the texts are then read only to
+    # convert them
+    check_texts: bool = True
+
+    def first_invalid(self, texts: list[str]) -> int | None:
+        return None
+
+    def convert(self, texts: list[str]) -> list:
+        return texts
+
+
+class StringType(ValueType):
+    name = XSDElementTypeAttribute.STRING.value
+    check_texts = False
+
+
+class IntegerType(ValueType):
+    name = XSDElementTypeAttribute.INTEGER.value
+
+    def first_invalid(self, texts: list[str]) -> int | None:
+        joined = "\n".join(texts) + "\n"
+        # a "\n" inside a text would split it in two valid ones
+        if joined.count("\n") == len(texts) and INTEGER_COLUMN_PATTERN.fullmatch(joined) is not None:
+            return None
+        fullmatch = INTEGER_PATTERN.fullmatch
+        for index, text in enumerate(texts):
+            if fullmatch(text) is None:
+                return index
+        return None
+
+    def convert(self, texts: list[str]) -> list[int]:
+        return list(map(int, texts))
+
+
+VALUE_TYPES: dict[str, ValueType] = {value_type.name: value_type for value_type in (StringType(), IntegerType())}
+
+
+def tree_texts(nodes: list) -> list[str]:
+    return list(map(attrgetter("text"), nodes))
+
+
+class ValueColumn:
+    """
+    Leaves of one type in document order: the nodes (XMLTree nodes or node
+    numbers of an XMLDocument) and their converted values.
+    """
+
+    __slots__ = ("type", "nodes", "values")
+
+    def __init__(self, type: str, nodes: list, values: list):
+        self.type = type
+        self.nodes = nodes
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f"ValueColumn(type={self.type!r}, values={len(self.values)})"
+
+
+class LeafValues:
+    """
+    Leaves collected by type while the structure is validated, checked
+    and converted per type in check() instead of one node at a time.
+    """
+
+    def __init__(self, texts: Callable[[list], list[str]], tag: Callable[[object], str], convert: bool = False):
+        # type (a name or a XSDElementTypeAttribute) -> nodes
+        self.leaves: defaultdict[object, list] = defaultdict(list)
+        self.texts = texts
+        self.tag = tag
+        self.convert = convert
+        # the types whose leaves are collected, the others have nothing to
+        # check, e.g. xs:string when the values are not converted
+        self.types: set = set()
+        for value_type in VALUE_TYPES.values():
+            if convert or value_type.check_texts:
+                self.types.update((value_type.name, XSDElementTypeAttribute(value_type.name)))
+
+    def check(self) -> dict[str, ValueColumn]:
+        """
+        Raises an error for the first invalid value of a type. With convert,
+        returns the columns of converted values by type name.
+        """
+        nodes_by_type: dict[str, list] = {}
+        for type, nodes in self.leaves.items():
+            name = type.value if isinstance(type, Enum) else type
+            if name in VALUE_TYPES:
+                nodes_by_type.setdefault(name, []).extend(nodes)
+
+        columns = {}
+        for name, nodes in nodes_by_type.items():
+            value_type = VALUE_TYPES[name]
+            texts = self.texts(nodes)
+            index = value_type.first_invalid(texts)
+            if index is not None:
+                raise XMLParseError(f"Value '{texts[index]}' is not a valid {name} in {self.tag(nodes[index])}")
+            if self.convert:
+                columns[name] = ValueColumn(name, nodes, value_type.convert(texts))
+        return columns
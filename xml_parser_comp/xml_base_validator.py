@@ -1,52 +1,139 @@
-import re
+import os
+from typing import IO, TYPE_CHECKING, Iterable, Iterator
 
 from xml_parser_comp.exceptions.xml_error import XMLParseError
-from xml_parser_comp.model.xml_token import XMLToken
-from xml_parser_comp.model.xml_tree import XMLTree
+from xml_parser_comp.instrumentation import NULL_INSTRUMENTATION, Instrumentation, instrumented_phase
+from xml_parser_comp.model.fast_token import CLOSING_TAG, OPENING_TAG, FastXMLToken, SpanXMLToken
+from xml_parser_comp.model.xml_document import XMLDocument, XMLDocumentBuilder
+from xml_parser_comp.mapped_file import close_mapping, map_file
+from xml_parser_comp.path_projection import DEAD_STATE, START_STATE, PathMatcher, select_spans
+from xml_parser_comp.streaming_validator import StreamingValidator
+from xml_parser_comp.xml_tokenizer import (
+    CHUNK_SIZE,
+    XMLTokenizer,
+    tokenize_bytes,
+    tokenize_string,
+)
+
+if TYPE_CHECKING:
+    # the pydantic models are imported only when they are used
+    from xml_parser_comp.model.xml_token import XMLToken
+    from xml_parser_comp.model.xml_tree import XMLTree
+    from xml_parser_comp.tree_interner import TreeInterner
+
+START_EVENT = "start"
+END_EVENT = "end"
 
 
 class XMLBaseValidator:
-    def __init__(self, xml_string: str):
+    def __init__(
+        self,
+        xml_string: str,
+        lazy_text: bool = False,
+        instrumentation: Instrumentation | None = None,
+    ):
         self.xml_string: str = xml_string
-        self.xml_tokens: list[XMLToken] = []
-
-    def generate_tokens(self) -> list[XMLToken]:
-        matches = re.findall(r"<(/?)([^>]+)>|([^<]+)", self.xml_string)
-        result = []
-        for match in matches:
-            if match[0] or match[1]:  # This is a tag
-                is_opening_tag = match[0] == ""
-                is_closing_tag = match[0] == "/"
-                tag_name = match[1]
-                result.append(
-                    XMLToken(
-                        type="Tag",
-                        is_opening_tag=is_opening_tag,
-                        is_closing_tag=is_closing_tag,
-                        tag_name=tag_name,
-                        text=None,
-                    )
-                )
-            else:  # This is text
-                text = match[2].strip().replace("\n", "")
-                if text == "":
-                    continue
+        self.lazy_text: bool = lazy_text
+        self.instrumentation: Instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.xml_tokens: list["FastXMLToken | XMLToken"] = []
+        self.xml_file: IO[str] | None = None
+        self.xml_buffer = None
+        # the buffer of from_path(), closed by close()
+        self.mapping = None
+        self.chunk_size: int = CHUNK_SIZE
+
+    @classmethod
+    def from_file(
+        cls,
+        xml_file: IO[str],
+        chunk_size: int = CHUNK_SIZE,
+        instrumentation: Instrumentation | None = None,
+    ):
+        xml_validator = cls("", instrumentation=instrumentation)
+        xml_validator.xml_file = xml_file
+        xml_validator.chunk_size = chunk_size
+        return xml_validator
+
+    @classmethod
+    def from_bytes(cls, xml_buffer, instrumentation: Instrumentation | None = None):
+        """
+        Validator for UTF-8 bytes (or a mmap), the text is decoded only
+        when it is read.
+        """
+        xml_validator = cls("", lazy_text=True, instrumentation=instrumentation)
+        xml_validator.xml_buffer = xml_buffer
+        return xml_validator
+
+    @classmethod
+    def from_path(cls, path: str | os.PathLike, instrumentation: Instrumentation | None = None):
+        """
+        Validator for a file mapped in memory. Call close(), or use it with
+        with, once it and the documents with lazy texts made by it are not
+        needed anymore.
+        """
+        xml_validator = cls.from_bytes(map_file(path), instrumentation)
+        xml_validator.mapping = xml_validator.xml_buffer
+        return xml_validator
+
+    def close(self):
+        if self.mapping is not None:
+            close_mapping(self.mapping)
+            self.mapping = self.xml_buffer = None
+
+    def __enter__(self):
+        return self
 
-                result.append(
-                    XMLToken(
-                        type="Text",
-                        is_opening_tag=False,
-                        is_closing_tag=False,
-                        tag_name=None,
-                        text=text,
-                    )
-                )
-        return result
-
-    def check_if_all_tags_are_closed(self) -> bool:
-        stack: list[XMLToken] = []
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def iter_tokens(self) -> Iterator[FastXMLToken]:
+        tokenizer = None
+        if self.xml_buffer is not None:
+            tokens = tokenize_bytes(self.xml_buffer)
+        elif self.xml_file is not None:
+            tokenizer = XMLTokenizer(self.xml_file, self.chunk_size)
+            tokens = iter(tokenizer)
+        else:
+            tokens = tokenize_string(self.xml_string, spans=self.lazy_text)
+        if self.instrumentation.enabled:
+            return self._count_tokens(tokens, tokenizer)
+        return tokens
+
+    def _count_tokens(
+        self, tokens: Iterator[FastXMLToken], tokenizer: XMLTokenizer | None
+    ) -> Iterator[FastXMLToken]:
+        instrumentation = self.instrumentation
+        if tokenizer is None:
+            source = self.xml_string if self.xml_buffer is None else self.xml_buffer
+            instrumentation.count("xml.bytes", len(source))
+        count = nodes = depth = max_depth = 0
+        try:
+            for token in tokens:
+                count += 1
+                if token.kind == OPENING_TAG:
+                    nodes += 1
+                    depth += 1
+                    if depth > max_depth:
+                        max_depth = depth
+                elif token.kind == CLOSING_TAG:
+                    depth -= 1
+                yield token
+        finally:
+            if tokenizer is not None:
+                instrumentation.count("xml.bytes", tokenizer.size)
+            instrumentation.count("xml.tokens", count)
+            instrumentation.count("xml.nodes", nodes)
+            instrumentation.maximum("xml.max_depth", max_depth)
+
+    def generate_tokens(self) -> list["XMLToken"]:
+        return [token.to_model() for token in self.iter_tokens()]
+
+    def check_if_all_tags_are_closed(
+        self, tokens: Iterable["FastXMLToken | XMLToken"] | None = None
+    ) -> bool:
+        stack: list["FastXMLToken | XMLToken"] = []
         root_counter = 0
-        for tag in self.xml_tokens:
+        for tag in self.xml_tokens if tokens is None else tokens:
             if tag.is_opening_tag:
                 stack.append(tag)
                 if len(stack) == 1:
@@ -59,17 +146,35 @@ class XMLBaseValidator:
                 stack.pop()
 
         if stack:
-            raise XMLParseError(f"Tag '{stack[-1].name}' is not closed")
+            raise XMLParseError(f"Tag '{stack[-1].tag_name}' is not closed")
         if root_counter != 1:
             raise XMLParseError("There should be only one root element")
         return True
 
-    def validate(self):
-        self.xml_tokens = self.generate_tokens()
-        self.check_if_all_tags_are_closed()
+    def validate(self, keep_tokens: bool = True):
+        instrumentation = self.instrumentation
+        if not keep_tokens:
+            # check the tokens as they are read, nothing is kept in memory
+            with instrumentation.phase("xml.validate"):
+                self.check_if_all_tags_are_closed(self.iter_tokens())
+            return
+        with instrumentation.phase("xml.tokenize"):
+            self.xml_tokens = list(self.iter_tokens())
+        with instrumentation.phase("xml.check_tags"):
+            self.check_if_all_tags_are_closed()
+
+    @instrumented_phase("xml.build_tree")
+    def generate_xml_tree(self, interner: "TreeInterner | None" = None):
+        """
+        With an interner, identical subtrees are the same XMLTree object,
+        see interner.report() for the number of nodes shared.
+        """
+        if interner is not None:
+            return self._generate_interned_xml_tree(interner)
+        from xml_parser_comp.model.xml_tree import XMLTree
 
-    def generate_xml_tree(self):
         stack = []
+        pieces = []
         xml_tree = None
         for token in self.xml_tokens:
             if token.is_opening_tag:
@@ -80,20 +185,231 @@ class XMLBaseValidator:
                     tag = XMLTree(tag=token.tag_name)
                     stack[-1].children.append(tag)
                     stack.append(tag)
+                pieces.append([])
             elif token.is_closing_tag:
-                stack.pop()
+                tag = stack.pop()
+                text = pieces.pop()
+                if text:
+                    tag.text = " ".join(text)
+            else:
+                pieces[-1].append(token.text)
+
+        return xml_tree
+
+    def _generate_interned_xml_tree(self, interner: "TreeInterner") -> "XMLTree":
+        # the nodes are made when they are closed, after their children
+        stack: list[tuple[str, list[str], list["XMLTree"]]] = []
+        xml_tree = None
+        for token in self.xml_tokens:
+            if token.is_opening_tag:
+                stack.append((token.tag_name, [], []))
+            elif token.is_closing_tag:
+                tag_name, pieces, children = stack.pop()
+                tag = interner.node(tag_name, " ".join(pieces), children)
+                if stack:
+                    stack[-1][2].append(tag)
+                else:
+                    xml_tree = tag
             else:
-                stack[-1].text = (
-                    stack[-1].text + " " + token.text if stack[-1].text else token.text
-                )
+                stack[-1][1].append(token.text)
 
         return xml_tree
 
-    def print_xml_tree(self, xml_tree: XMLTree, level=0):
-        print("  " * level, f'Tag: {xml_tree.tag}', end="")
-        print(f', Text: {xml_tree.text}' if xml_tree.text else "")
-        for child in xml_tree.children:
-            self.print_xml_tree(child, level + 1)
+    @instrumented_phase("xml.build_document")
+    def generate_xml_document(self) -> XMLDocument:
+        source = None
+        if self.xml_buffer is not None:
+            source = self.xml_buffer
+        elif self.lazy_text:
+            source = self.xml_string
+        builder = XMLDocumentBuilder(source)
+        for token in self.xml_tokens:
+            if token.is_opening_tag:
+                builder.start(token.tag_name)
+            elif token.is_closing_tag:
+                builder.end()
+            elif isinstance(token, SpanXMLToken):
+                builder.text_span(token.start, token.end)
+            else:
+                builder.text(token.text)
+        return builder.close()
+
+    @instrumented_phase("xml.parse")
+    def parse(self) -> "XMLTree":
+        """
+        Validate and build the XMLTree in a single pass over the tokens.
+        It stops at the first structural error and the tokens are not kept.
+        """
+        return self._build_tree(self.iter_tokens())
+
+    def _build_tree(self, tokens: Iterable[FastXMLToken]) -> "XMLTree":
+        from xml_parser_comp.model.xml_tree import XMLTree
+
+        stack: list[XMLTree] = []
+        pieces: list[list[str]] = []
+        xml_tree = None
+        for token in tokens:
+            kind = token.kind
+            if kind == OPENING_TAG:
+                tag = XMLTree(tag=token.value)
+                if stack:
+                    stack[-1].children.append(tag)
+                elif xml_tree is None:
+                    xml_tree = tag
+                else:
+                    raise XMLParseError("There should be only one root element")
+                stack.append(tag)
+                pieces.append([])
+            elif kind == CLOSING_TAG:
+                if not stack:
+                    raise XMLParseError(f"Tag '{token.value}' is not opened")
+                if token.value != stack[-1].tag:
+                    raise XMLParseError(f"{stack[-1].tag} is not closed")
+                tag = stack.pop()
+                text = pieces.pop()
+                if text:
+                    tag.text = " ".join(text)
+            elif stack:
+                pieces[-1].append(token.value)
+
+        if stack:
+            raise XMLParseError(f"Tag '{stack[-1].tag}' is not closed")
+        if xml_tree is None:
+            raise XMLParseError("There should be only one root element")
+        return xml_tree
+
+    @instrumented_phase("xml.parse_paths")
+    def parse_paths(self, paths: "Iterable[str] | PathMatcher") -> list["XMLTree"]:
+        """
+        Trees of the elements selected by the paths, in document order, in a
+        single pass like parse(). The rest of the document is only checked
+        for balance, its texts are not even tokenized when the document is
+        in memory. An element inside a selected one is part of that tree and
+        is not returned again.
+        """
+        from xml_parser_comp.model.xml_tree import XMLTree
+
+        matcher = paths if isinstance(paths, PathMatcher) else PathMatcher(paths)
+        if self.xml_buffer is not None:
+            return [
+                self._build_tree(tokenize_bytes(self.xml_buffer, start, end))
+                for start, end in select_spans(self.xml_buffer, matcher)
+            ]
+        if self.xml_file is None:
+            return [
+                self._build_tree(tokenize_string(self.xml_string, self.lazy_text, start, end))
+                for start, end in select_spans(self.xml_string, matcher)
+            ]
+
+        # a file is read in chunks, the tokens are matched as they arrive
+        validator = StreamingValidator()
+        # matcher state of the open elements outside the selected trees
+        states = [START_STATE]
+        stack: list[XMLTree] = []
+        pieces: list[list[str]] = []
+        xml_trees = []
+        for token in self.iter_tokens():
+            kind = token.kind
+            if kind == OPENING_TAG:
+                tag_name = token.value
+                validator.start(tag_name)
+                if stack:
+                    tag = XMLTree(tag=tag_name)
+                    stack[-1].children.append(tag)
+                elif states[-1] == DEAD_STATE:
+                    states.append(DEAD_STATE)
+                    continue
+                else:
+                    state, matched = matcher.step(states[-1], tag_name)
+                    if not matched:
+                        states.append(state)
+                        continue
+                    tag = XMLTree(tag=tag_name)
+                    xml_trees.append(tag)
+                stack.append(tag)
+                pieces.append([])
+            elif kind == CLOSING_TAG:
+                validator.end(token.value)
+                if stack:
+                    tag = stack.pop()
+                    text = pieces.pop()
+                    if text:
+                        tag.text = " ".join(text)
+                else:
+                    states.pop()
+            elif stack:
+                pieces[-1].append(token.value)
+        validator.close()
+        return xml_trees
+
+    def iterparse(self, events: Iterable[str] = (START_EVENT, END_EVENT)) -> Iterator[tuple[str, "XMLTree"]]:
+        """
+        Pull parser, yields (event, element) while the tokens are read.
+        On "start" the element has only its tag, on "end" it has its text
+        and children. The tags are checked as they arrive. Elements already
+        processed can be cleared, e.g. the root after every record, so the
+        memory used does not grow with the document.
+        """
+        from xml_parser_comp.model.xml_tree import XMLTree
+
+        events = set(events)
+        if not events <= {START_EVENT, END_EVENT}:
+            raise ValueError(f"events should be '{START_EVENT}' or '{END_EVENT}'")
+        report_start = START_EVENT in events
+        report_end = END_EVENT in events
+
+        validator = StreamingValidator()
+        stack: list[XMLTree] = []
+        pieces: list[list[str]] = []
+        for token in self.iter_tokens():
+            kind = token.kind
+            if kind == OPENING_TAG:
+                validator.start(token.value)
+                tag = XMLTree(tag=token.value)
+                if stack:
+                    stack[-1].children.append(tag)
+                stack.append(tag)
+                pieces.append([])
+                if report_start:
+                    yield START_EVENT, tag
+            elif kind == CLOSING_TAG:
+                validator.end(token.value)
+                tag = stack.pop()
+                text = pieces.pop()
+                if text:
+                    tag.text = " ".join(text)
+                if report_end:
+                    yield END_EVENT, tag
+            elif stack:
+                pieces[-1].append(token.value)
+        validator.close()
+
+    def print_xml_tree(self, xml_tree: "XMLTree", level=0):
+        for node, depth in xml_tree.walk():
+            print("  " * (level + depth), f'Tag: {node.tag}', end="")
+            print(f', Text: {node.text}' if node.text else "")
+
+
+def iterparse(source, events: Iterable[str] = (START_EVENT, END_EVENT)) -> Iterator[tuple[str, "XMLTree"]]:
+    """
+    XMLBaseValidator.iterparse() of an XML string, a text file, UTF-8 bytes
+    (or a mmap) or the path of a file.
+    """
+    if isinstance(source, str):
+        xml_validator = XMLBaseValidator(source)
+    elif isinstance(source, os.PathLike):
+        return _iterparse_path(source, events)
+    elif hasattr(source, "read"):
+        xml_validator = XMLBaseValidator.from_file(source)
+    else:
+        xml_validator = XMLBaseValidator.from_bytes(source)
+    return xml_validator.iterparse(events)
+
+
+def _iterparse_path(path: os.PathLike, events: Iterable[str]) -> Iterator[tuple[str, "XMLTree"]]:
+    # the mapping is closed when the events are read or the generator closed
+    with XMLBaseValidator.from_path(path) as xml_validator:
+        yield from xml_validator.iterparse(events)
 
 
 if __name__ == "__main__":
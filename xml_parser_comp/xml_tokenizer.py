@@ -0,0 +1,191 @@
+import re
+from collections import deque
+from typing import IO, Iterator
+
+from xml_parser_comp.exceptions.xml_error import XMLParseError
+from xml_parser_comp.model.fast_token import (
+    CLOSING_TAG,
+    OPENING_TAG,
+    TEXT,
+    FastXMLToken,
+    SpanXMLToken,
+)
+
+TOKEN_PATTERN = re.compile(r"<(/?)([^>]+)>|([^<]+)")
+NON_SPACE_PATTERN = re.compile(r"\S")
+BYTES_TOKEN_PATTERN = re.compile(rb"<(/?)([^>]+)>|([^<]+)")
+# an ASCII byte that str.strip() keeps, bytes over 0x7f may be part of
+# Unicode spaces like U+00A0
+BYTES_NON_SPACE_PATTERN = re.compile(rb"[^\t\n\x0b\x0c\r\x1c-\x1f \x80-\xff]")
+BYTES_NON_ASCII_PATTERN = re.compile(rb"[\x80-\xff]")
+# only the tags, to find elements without making tokens
+TAG_PATTERN = re.compile(r"<(/?)([^>]+)>")
+BYTES_TAG_PATTERN = re.compile(rb"<(/?)([^>]+)>")
+CHUNK_SIZE = 64 * 1024
+
+
+def make_token(match: re.Match) -> FastXMLToken | None:
+    slash, tag_name, text = match.groups()
+    if tag_name is not None:  # This is a tag
+        return FastXMLToken(CLOSING_TAG if slash == "/" else OPENING_TAG, tag_name)
+
+    text = text.strip().replace("\n", "")
+    if text == "":
+        return None
+    return FastXMLToken(TEXT, text)
+
+
+def make_span_token(match: re.Match, source: str) -> FastXMLToken | None:
+    if match.lastindex != 3:  # This is a tag
+        slash = match.group(1)
+        return FastXMLToken(CLOSING_TAG if slash == "/" else OPENING_TAG, match.group(2))
+
+    start, end = match.span(3)
+    if NON_SPACE_PATTERN.search(source, start, end) is None:
+        return None
+    return SpanXMLToken(source, start, end)
+
+
+class XMLTokenizer:
+    """
+    Incremental tokenizer. Data is given in chunks with feed() and the
+    tokens found so far are taken with read_tokens(). Tags and text split
+    between chunks are kept as a list of pieces, they are joined and
+    scanned once the chunk that completes them arrives.
+    """
+
+    def __init__(self, source: IO[str] | None = None, chunk_size: int = CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.closed = False
+        self.size = 0
+        self._pending: list[str] = []
+        self._tokens: deque[FastXMLToken] = deque()
+
+    def feed(self, data: str):
+        if self.closed:
+            raise XMLParseError("Tokenizer is already closed")
+        if not data:
+            return
+        self.size += len(data)
+        pending = self._pending
+        pending.append(data)
+        # a pending tag ends with '>', a pending text with the next '<'
+        if len(pending) > 1 and data.find(">" if pending[0][0] == "<" else "<") == -1:
+            return
+        self._scan(final=False)
+
+    def close(self):
+        if not self.closed:
+            self._scan(final=True)
+            self.closed = True
+
+    def read_tokens(self) -> Iterator[FastXMLToken]:
+        while self._tokens:
+            yield self._tokens.popleft()
+
+    def _scan(self, final: bool):
+        buffer = "".join(self._pending)
+        tokens, pos = scan(buffer, final)
+        self._tokens.extend(tokens)
+        self._pending = [buffer[pos:]] if pos < len(buffer) else []
+
+    def feed_buffer(self, data: str) -> str:
+        """
+        Like feed() without the scan: the pending tail joined with data is
+        returned, to be given to scan() somewhere else, e.g. in a worker
+        process. The tail left by scan() is given back with keep_tail().
+        """
+        if self.closed:
+            raise XMLParseError("Tokenizer is already closed")
+        self.size += len(data)
+        buffer = "".join(self._pending) + data
+        self._pending = []
+        return buffer
+
+    def keep_tail(self, tail: str):
+        self._pending = [tail] if tail else []
+
+    def __iter__(self) -> Iterator[FastXMLToken]:
+        if self.source is None:
+            raise XMLParseError("Tokenizer has no source to read from")
+        while True:
+            chunk = self.source.read(self.chunk_size)
+            if not chunk:
+                break
+            self.feed(chunk)
+            yield from self.read_tokens()
+        self.close()
+        yield from self.read_tokens()
+
+
+def scan(buffer: str, final: bool = False) -> tuple[list[FastXMLToken], int]:
+    """
+    Tokens of buffer and the position where its incomplete tail starts,
+    a tag without its '>' or a text not ended by a '<'. With final the
+    tail is tokenized too. It keeps no state, so it can run in a process.
+    """
+    tokens = []
+    end = len(buffer)
+    pos = 0
+    while pos < end:
+        match = TOKEN_PATTERN.match(buffer, pos)
+        if match is None:
+            # a '<' without its '>', it may still come in the next chunk
+            if not final and buffer.find(">", pos) == -1:
+                break
+            pos += 1
+            continue
+        # text only ends when the next '<' arrives
+        if match.end() == end and match.group(3) is not None and not final:
+            break
+        token = make_token(match)
+        if token is not None:
+            tokens.append(token)
+        pos = match.end()
+    return tokens, pos
+
+
+def tokenize_string(
+    xml_string: str, spans: bool = False, start: int = 0, end: int | None = None
+) -> Iterator[FastXMLToken]:
+    """
+    Tokenize a string that is already in memory, or its part from start to
+    end. With spans the text tokens point into xml_string instead of holding
+    a copy of the text.
+    """
+    end = len(xml_string) if end is None else end
+    for match in TOKEN_PATTERN.finditer(xml_string, start, end):
+        if spans:
+            token = make_span_token(match, xml_string)
+        else:
+            token = make_token(match)
+        if token is not None:
+            yield token
+
+
+def tokenize_bytes(buffer, start: int = 0, end: int | None = None) -> Iterator[FastXMLToken]:
+    """
+    Tokenize UTF-8 bytes or a mmap (from start to end) without decoding it.
+    Tag names are decoded once per distinct name, text tokens are spans of
+    the buffer.
+    """
+    tag_names: dict[bytes, str] = {}
+    end = len(buffer) if end is None else end
+    for match in BYTES_TOKEN_PATTERN.finditer(buffer, start, end):
+        if match.lastindex != 3:  # This is a tag
+            raw_name = match.group(2)
+            tag_name = tag_names.get(raw_name)
+            if tag_name is None:
+                tag_name = tag_names[raw_name] = raw_name.decode("utf-8")
+            yield FastXMLToken(CLOSING_TAG if match.group(1) == b"/" else OPENING_TAG, tag_name)
+            continue
+
+        text_start, text_end = match.span(3)
+        if BYTES_NON_SPACE_PATTERN.search(buffer, text_start, text_end) is not None:
+            yield SpanXMLToken(buffer, text_start, text_end)
+        # only Unicode spaces are left to be stripped, as in tokenize_string()
+        elif BYTES_NON_ASCII_PATTERN.search(buffer, text_start, text_end) is not None:
+            token = SpanXMLToken(buffer, text_start, text_end)
+            if token.value:
+                yield token
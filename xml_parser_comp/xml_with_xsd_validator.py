@@ -1,45 +1,284 @@
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from xml_parser_comp.compiled_schema import START_STATE, UNKNOWN_TAG, CompiledElement, CompiledSchema
 from xml_parser_comp.exceptions.xml_error import XMLParseError
-from xml_parser_comp.model.xml_tree import XMLTree
-from xml_parser_comp.model.xsd_tree import XSDElementTypeAttribute, XSDTree
+from xml_parser_comp.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from xml_parser_comp.model.xml_document import NO_NODE, XMLDocument
+from xml_parser_comp.model.xsd_types import XSDElementTypeAttribute
+from xml_parser_comp.value_types import VALUE_TYPES, LeafValues, ValueColumn, tree_texts
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xml_tree import XMLTree
+    from xml_parser_comp.model.xsd_tree import XSDTree
 
 
 class XMLWithXSDValidator:
-    def __init__(self, xml_tree: XMLTree, xsd_tree: XSDTree):
-        self.xml_tree: XMLTree = xml_tree
-        self.xsd_tree: XSDTree = xsd_tree
+    def __init__(
+        self,
+        xml_tree: "XMLTree | XMLDocument",
+        xsd_tree: "XSDTree | CompiledSchema",
+        instrumentation: Instrumentation | None = None,
+        convert_values: bool = False,
+    ):
+        self.xml_tree: "XMLTree | XMLDocument" = xml_tree
+        self.xsd_tree: "XSDTree | CompiledSchema" = xsd_tree
+        self.instrumentation: Instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.convert_values: bool = convert_values
+        # type name -> converted values of the leaves, with convert_values
+        self.values: dict[str, ValueColumn] = {}
 
     def validate(self) -> bool:
-        return self.validate_tag(xml_tree, xsd_tree)
+        if not self.instrumentation.enabled:
+            return self.validate_tree()
+        with self.instrumentation.phase("schema.validate"):
+            result = self.validate_tree()
+        self.instrumentation.count("schema.nodes", self.count_nodes())
+        return result
+
+    def count_nodes(self) -> int:
+        if isinstance(self.xml_tree, XMLDocument):
+            return len(self.xml_tree)
+        nodes = 0
+        stack = [self.xml_tree]
+        while stack:
+            node = stack.pop()
+            nodes += 1
+            stack.extend(node.children)
+        return nodes
 
-    def validate_tag(self, xml_tag: XMLTree, xsd_tag: XSDTree) -> bool:
+    def validate_tree(self) -> bool:
+        if isinstance(self.xsd_tree, CompiledSchema):
+            return self.validate_compiled()
+        if isinstance(self.xml_tree, XMLDocument):
+            return self.validate_node(self.xml_tree, self.xml_tree.root, self.xsd_tree)
+        return self.validate_tag(self.xml_tree, self.xsd_tree)
+
+    def validate_tag(self, xml_tag: "XMLTree", xsd_tag: "XSDTree") -> bool:
         if xml_tag.tag != xsd_tag.name:
             raise XMLParseError(f"Tag {xml_tag.tag} is not allowed in this context")
 
-        if xsd_tag.type is not None:
-            pass
+        # the values are checked by type once the structure is valid
+        values = LeafValues(tree_texts, attrgetter("tag"), self.convert_values)
+        leaves = values.leaves
+        types = values.types
+        # explicit stack of [xml tag, xsd tag, index of the next child],
+        # children without children are checked without a frame
+        stack = [[xml_tag, xsd_tag, 0]]
+        while stack:
+            frame = stack[-1]
+            xml_node, xsd_node, index = frame
+
+            if index == 0 and xsd_node.type in types and not xml_node.children:
+                leaves[xsd_node.type].append(xml_node)
+
+            # for attribute in xml_node.attributes:
+            #     if attribute not in xsd_node.attributes:
+            #         raise XMLParseError(f"Attribute {attribute} is not allowed in this context")
+
+            children = xml_node.children
+            xsd_children = xsd_node.children
+            while index < len(children):
+                child = children[index]
+                if index >= len(xsd_children):
+                    raise XMLParseError(f"Tag {child.tag} is not allowed in this context")
+                xsd_child = xsd_children[index]
+                index += 1
+                if child.tag != xsd_child.name:
+                    raise XMLParseError(f"Tag {child.tag} is not allowed in this context")
+                if child.children:
+                    break
+                if xsd_child.children:
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join([tag.name for tag in xsd_child.children])} in {child.tag}"
+                    )
+                if xsd_child.type in types:
+                    leaves[xsd_child.type].append(child)
+            else:
+                if len(children) < len(xsd_children):
+                    extra_tags = xsd_children[len(children) :]
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join([tag.name for tag in extra_tags])} in {xml_node.tag}"
+                    )
+                stack.pop()
+                continue
+
+            frame[2] = index
+            stack.append([child, xsd_child, 0])
+
+        self.values = values.check()
+        return True
+
+    def validate_node(self, document: XMLDocument, node: int, xsd_tag: "XSDTree") -> bool:
+        tag = document.tag(node)
+        if tag != xsd_tag.name:
+            raise XMLParseError(f"Tag {tag} is not allowed in this context")
+
+        first_children = document.first_children
+        next_siblings = document.next_siblings
+        values = LeafValues(document.texts, document.tag, self.convert_values)
+        leaves = values.leaves
+        types = values.types
+        if first_children[node] == NO_NODE and xsd_tag.type in types:
+            leaves[xsd_tag.type].append(node)
+        # explicit stack of [node, xsd tag, next child, number of children seen]
+        stack = [[node, xsd_tag, first_children[node], 0]]
+        while stack:
+            frame = stack[-1]
+            node, xsd_node, child, index = frame
+            xsd_children = xsd_node.children
+            while child != NO_NODE:
+                if index >= len(xsd_children):
+                    raise XMLParseError(f"Tag {document.tag(child)} is not allowed in this context")
+                xsd_child = xsd_children[index]
+                index += 1
+                if document.tag(child) != xsd_child.name:
+                    raise XMLParseError(f"Tag {document.tag(child)} is not allowed in this context")
+                if first_children[child] != NO_NODE:
+                    break
+                if xsd_child.children:
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join([tag.name for tag in xsd_child.children])} in {document.tag(child)}"
+                    )
+                if xsd_child.type in types:
+                    leaves[xsd_child.type].append(child)
+                child = next_siblings[child]
+            else:
+                if index < len(xsd_children):
+                    extra_tags = xsd_children[index:]
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join([tag.name for tag in extra_tags])} in {document.tag(node)}"
+                    )
+                stack.pop()
+                continue
 
-        # for attribute in xml_tag.attributes:
-        #     if attribute not in xsd_tag.attributes:
-        #         raise XMLParseError(f"Attribute {attribute} is not allowed in this context")
+            frame[2] = next_siblings[child]
+            frame[3] = index
+            stack.append([child, xsd_child, first_children[child], 0])
 
-        for index in range(len(xml_tag.children)):
-            child = xml_tag.children[index]
-            try:
-                xsd_child = xsd_tag.children[index]
-            except IndexError:
-                raise XMLParseError(f"Tag {child.tag} is not allowed in this context")
-            self.validate_tag(child, xsd_child)
+        self.values = values.check()
+        return True
+
+    def validate_compiled(self) -> bool:
+        schema: CompiledSchema = self.xsd_tree
+        if isinstance(self.xml_tree, XMLDocument):
+            document = self.xml_tree
+            tag = document.tag(document.root)
         else:
-            if len(xml_tag.children) < len(xsd_tag.children):
-                extra_tags = xsd_tag.children[len(xml_tag.children) :]
-                raise XMLParseError(
-                    f"XML has not this tags: {', '.join([tag.name for tag in extra_tags])} in {xml_tag.tag}"
-                )
+            tag = self.xml_tree.tag
+        if tag != schema.root.name:
+            raise XMLParseError(f"Tag {tag} is not allowed in this context")
+
+        if isinstance(self.xml_tree, XMLDocument):
+            # document tag id -> schema tag id, made once per document
+            tag_ids = [schema.tag_id(tag_name) for tag_name in document.tag_names]
+            return self.validate_compiled_node(document, document.root, schema.root, tag_ids)
+        return self.validate_compiled_tag(self.xml_tree, schema.root)
 
+    def validate_compiled_tag(self, xml_tag: "XMLTree", element: CompiledElement) -> bool:
+        elements = self.xsd_tree.elements
+        tag_ids = self.xsd_tree.tag_ids
+        values = LeafValues(tree_texts, attrgetter("tag"), self.convert_values)
+        leaves = values.leaves
+        types = values.types
+        if not xml_tag.children and element.type in types:
+            leaves[element.type].append(xml_tag)
+        # explicit stack of [xml tag, element, state, index of the next child],
+        # children without children are checked without a frame
+        stack = [[xml_tag, element, START_STATE, 0]]
+        while stack:
+            frame = stack[-1]
+            xml_node, element, state, index = frame
+            children = xml_node.children
+            transitions = element.transitions
+            while index < len(children):
+                child = children[index]
+                index += 1
+                step = transitions[state].get(tag_ids.get(child.tag, UNKNOWN_TAG))
+                if step is None:
+                    raise XMLParseError(f"Tag {child.tag} is not allowed in this context")
+                state = step[0]
+                child_element = elements[step[1]]
+                if child.children:
+                    break
+                if START_STATE not in child_element.accepting:
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join(child_element.missing[START_STATE])} in {child.tag}"
+                    )
+                if child_element.type in types:
+                    leaves[child_element.type].append(child)
+            else:
+                if state not in element.accepting:
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join(element.missing[state])} in {xml_node.tag}"
+                    )
+                stack.pop()
+                continue
+
+            frame[2] = state
+            frame[3] = index
+            stack.append([child, child_element, START_STATE, 0])
+
+        self.values = values.check()
         return True
 
-    def validate_type(text: str, type: XSDElementTypeAttribute):
-        pass
+    def validate_compiled_node(
+        self, document: XMLDocument, node: int, element: CompiledElement, tag_ids: list[int]
+    ) -> bool:
+        elements = self.xsd_tree.elements
+        first_children = document.first_children
+        next_siblings = document.next_siblings
+        document_tag_ids = document.tag_ids
+        values = LeafValues(document.texts, document.tag, self.convert_values)
+        leaves = values.leaves
+        types = values.types
+        if first_children[node] == NO_NODE and element.type in types:
+            leaves[element.type].append(node)
+        # explicit stack of [node, element, state, next child]
+        stack = [[node, element, START_STATE, first_children[node]]]
+        while stack:
+            frame = stack[-1]
+            node, element, state, child = frame
+            transitions = element.transitions
+            while child != NO_NODE:
+                step = transitions[state].get(tag_ids[document_tag_ids[child]])
+                if step is None:
+                    raise XMLParseError(f"Tag {document.tag(child)} is not allowed in this context")
+                state = step[0]
+                child_element = elements[step[1]]
+                if first_children[child] != NO_NODE:
+                    break
+                if START_STATE not in child_element.accepting:
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join(child_element.missing[START_STATE])} in {document.tag(child)}"
+                    )
+                if child_element.type in types:
+                    leaves[child_element.type].append(child)
+                child = next_siblings[child]
+            else:
+                if state not in element.accepting:
+                    raise XMLParseError(
+                        f"XML has not this tags: {', '.join(element.missing[state])} in {document.tag(node)}"
+                    )
+                stack.pop()
+                continue
+
+            frame[2] = state
+            frame[3] = next_siblings[child]
+            stack.append([child, child_element, START_STATE, first_children[child]])
+
+        self.values = values.check()
+        return True
+
+    @staticmethod
+    def validate_type(text: str, type: XSDElementTypeAttribute | str) -> bool:
+        """
+        Check of a single value, the validators check the leaves of each
+        type together.
+        """
+        name = type.value if isinstance(type, XSDElementTypeAttribute) else type
+        value_type = VALUE_TYPES.get(name)
+        return value_type is None or value_type.first_invalid([text]) is None
 
 
 if __name__ == "__main__":
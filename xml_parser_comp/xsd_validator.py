@@ -1,15 +1,43 @@
+import os
 import re
+from typing import TYPE_CHECKING, Iterator
 
-
+from xml_parser_comp.compiled_schema import CompiledSchema
 from xml_parser_comp.exceptions.xsd_error import XSDError
-from xml_parser_comp.model.xsd_token import XSDToken
-from xml_parser_comp.model.xsd_tree import XSDTree
+from xml_parser_comp.instrumentation import NULL_INSTRUMENTATION, Instrumentation, instrumented_phase
+from xml_parser_comp.mapped_file import mapping
+from xml_parser_comp.model.fast_token import FastXSDToken
+from xml_parser_comp.model.xsd_types import XSDElementTypeAttribute
+
+if TYPE_CHECKING:
+    from xml_parser_comp.model.xsd_token import XSDToken
+    from xml_parser_comp.model.xsd_tree import XSDTree
+    from xml_parser_comp.schema_codegen import GeneratedValidator
+
+TYPES_ALLOWED = {type.value for type in XSDElementTypeAttribute}
+
+
+class SchemaNode:
+    """
+    Element of the schema given to CompiledSchema by compile_schema(), it
+    has the fields of XSDTree without the pydantic model.
+    """
+
+    __slots__ = ("name", "type", "children")
+
+    def __init__(self, name: str, type: str | None = None):
+        if type is not None and type not in TYPES_ALLOWED:
+            raise XSDError(f"Type {type} is not allowed")
+        self.name = name
+        self.type = type
+        self.children: list[SchemaNode] = []
+
 
 class XSDValidator():
     """
     Class to validate if a XSD file is valid or not
     """
-    def __init__(self, xsd_string):
+    def __init__(self, xsd_string, xsd_buffer=None, instrumentation: Instrumentation | None = None):
         self.tags_allowed = [
             "xs:schema",
             "xs:element",
@@ -24,12 +52,49 @@ class XSDValidator():
             'xs:attribute': ['name', 'type']
         }
         self.xsd_string = xsd_string
-        self.tags = self.get_all_tags()
-        self.tokens: list[XSDToken] = self.generate_xsd_tokens()
+        self.xsd_buffer = xsd_buffer
+        self.source_size = len(xsd_string if xsd_buffer is None else xsd_buffer)
+        self.instrumentation: Instrumentation = instrumentation or NULL_INSTRUMENTATION
+        with self.instrumentation.phase("xsd.tokenize"):
+            self.tags = self.get_all_tags()
+            # the slotted tokens, or the XSDToken models once tokens is used
+            self.xsd_tokens: list["FastXSDToken | XSDToken"] = list(self.iter_xsd_tokens())
+            self.token_models = False
+        if self.instrumentation.enabled:
+            self.count_tokens()
+
+    @classmethod
+    def from_path(cls, path: str | os.PathLike, instrumentation: Instrumentation | None = None):
+        with mapping(path) as xsd_buffer:
+            xsd_validator = cls("", xsd_buffer=xsd_buffer, instrumentation=instrumentation)
+            # the tokens are decoded, the mapping is not needed after them
+            xsd_validator.xsd_buffer = None
+        return xsd_validator
+
+    def count_tokens(self):
+        depth = max_depth = nodes = 0
+        for tag in self.xsd_tokens:
+            if tag.is_opening_tag:
+                depth += 1
+                max_depth = max(max_depth, depth)
+                if tag.name == "xs:element":
+                    nodes += 1
+            if tag.is_closing_tag:
+                depth -= 1
+        self.instrumentation.count("xsd.bytes", self.source_size)
+        self.instrumentation.count("xsd.tokens", len(self.xsd_tokens))
+        self.instrumentation.count("xsd.nodes", nodes)
+        self.instrumentation.maximum("xsd.max_depth", max_depth)
 
     def get_all_tags(self):
         xsd_tags = []
-        xsd_tags_init: list[str] = re.findall(r'<([^>]+)>', self.xsd_string)
+        if self.xsd_buffer is not None:
+            # only the tags are decoded, not the whole file
+            xsd_tags_init = [
+                tag.decode("utf-8") for tag in re.findall(rb'<([^>]+)>', self.xsd_buffer)
+            ]
+        else:
+            xsd_tags_init: list[str] = re.findall(r'<([^>]+)>', self.xsd_string)
         for tag in xsd_tags_init:
             if tag.startswith("!-") is False:
                 xsd_tags.append(tag)
@@ -39,9 +104,27 @@ class XSDValidator():
         attributes = re.findall(r'([\w:]+)="([^"]+)"', tag)
         return attributes 
 
-    def generate_xsd_tokens(self) -> list[XSDToken]:
-        xsd_tree = []
+    @property
+    def tokens(self) -> list["XSDToken"]:
+        """
+        The tokens as XSDToken models. They are made on the first access
+        and replace xsd_tokens, so the checks and tokens stay one list and
+        an assigned or edited list is the one validated.
+        """
+        if not self.token_models:
+            self.xsd_tokens = [token.to_model() for token in self.xsd_tokens]
+            self.token_models = True
+        return self.xsd_tokens
+
+    @tokens.setter
+    def tokens(self, tokens: list["XSDToken"]):
+        self.xsd_tokens = tokens
+        self.token_models = True
+
+    def generate_xsd_tokens(self) -> list["XSDToken"]:
+        return [token.to_model() for token in self.iter_xsd_tokens()]
 
+    def iter_xsd_tokens(self) -> Iterator[FastXSDToken]:
         for tag in self.tags:
             attributes = self.get_attributes(tag)
             # make attibutes a dictionary
@@ -60,15 +143,12 @@ class XSDValidator():
             tag_name = tag.split(' ')[0]
             tag_name = tag_name.replace('/', '')
             
-            _tag = XSDToken(name=tag_name, attributes=attributes, is_opening_tag=is_opening_tag, is_closing_tag=is_closing_tag)
-            xsd_tree.append(_tag)
-
-        return xsd_tree
+            yield FastXSDToken(tag_name, attributes, is_opening_tag, is_closing_tag)
 
     def check_if_all_tags_are_closed(self) -> bool:
         stack = []
         root_counter = 0
-        for tag in self.tokens:
+        for tag in self.xsd_tokens:
             if tag.is_opening_tag:
                 stack.append(tag)
                 if len(stack) == 1:
@@ -89,13 +169,13 @@ class XSDValidator():
         return True
     
     def check_if_tags_is_allowed(self):
-        for tag in self.tokens:
+        for tag in self.xsd_tokens:
             if tag.name not in self.tags_allowed:
                 raise XSDError(message=f"TagName {tag.name} is not allowed")
         return True
             
     def check_if_attributes_is_allowed(self):
-        for tag in self.tokens:
+        for tag in self.xsd_tokens:
             for attribute in tag.attributes:
                 if attribute not in self.atributes_allowed[tag.name]:
                     raise XSDError(message=f"Attribute {attribute} is not allowed")
@@ -104,30 +184,39 @@ class XSDValidator():
         return True
 
 
+    @instrumented_phase("xsd.validate")
     def validate(self):
         self.check_if_all_tags_are_closed()
         self.check_if_tags_is_allowed()
         self.check_if_attributes_is_allowed()
 
-    def generate_xsd_tree(self):
-        xsd_tree: XSDTree = None
+    @instrumented_phase("xsd.build_tree")
+    def generate_xsd_tree(self) -> "XSDTree":
+        from xml_parser_comp.model.xsd_tree import XSDTree
+
+        return self.build_tree(XSDTree)
+
+    def build_tree(self, node_class):
+        xsd_tree = None
         stack = []
-        for token in self.tokens:
+        for token in self.xsd_tokens:
             if token.is_opening_tag:
 
                 if token.name == "xs:complexType":
+                    if not stack or stack[-1] is None:
+                        raise XSDError("xs:complexType should be a child of xs:element")
                     stack.append(None)
 
-                elif token.name == "xs:sequence" and stack[-1] is None:
+                elif token.name == "xs:sequence" and stack and stack[-1] is None:
                     if stack[-2].type is not None:
                         raise XSDError("complexElement should not have a type")
                     stack[-2].type = "sequence"
                 
-                elif token.name == "xs:sequence" and stack[-1] is not None:
+                elif token.name == "xs:sequence":
                     raise XSDError("xs:sequence should be a child of xs:complexType")
 
                 elif token.name == "xs:element":
-                    tag = XSDTree(name=token.attributes.get("name"), type=token.attributes.get("type"))
+                    tag = node_class(name=token.attributes.get("name"), type=token.attributes.get("type"))
                     if not stack:
                         xsd_tree = tag
                         stack.append(tag)
@@ -141,9 +230,25 @@ class XSDValidator():
 
             if token.name == "xs:element" and token.is_closing_tag:
                 stack.pop()
-        
+
+        if xsd_tree is None:
+            raise XSDError("Schema has no element")
         return xsd_tree
 
+    @instrumented_phase("xsd.compile")
+    def compile_schema(self) -> CompiledSchema:
+        return CompiledSchema(self.build_tree(SchemaNode))
+
+    @instrumented_phase("xsd.generate")
+    def generate_validator(self, convert_values: bool = False) -> "GeneratedValidator":
+        """
+        Validation function generated for this schema, cached by the hash
+        of the schema, see schema_codegen.
+        """
+        from xml_parser_comp.schema_codegen import generate_validator
+
+        return generate_validator(self.build_tree(SchemaNode), convert_values)
+
 
 
 